@@ -0,0 +1,193 @@
+"""
+NumPy/pandas ile toplu (vektörel) toplantı genişletme.
+
+Analiz ve uzun dışa aktarımlar için tüm data['meetings'] listesi sütun
+dizilerine çevrilir (gün, başlangıç/bitiş dakikası, tarih ordinalleri,
+periyot, katılımcı bit maskesi) ve çok yıllık aralıktaki tüm tekrarlar
+Python döngüsü olmadan tek bir DataFrame olarak üretilir.
+Kurallar recurrence.compile_meeting ile aynıdır; satırlar recurrence.expand
+ile aynı sırada gelir. takvim export --format xlsx bu modülle genişletir.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from recurrence import (compile_meeting, holiday_ordinals, exception_ordinals, KIND_WEEKLY, KIND_ONCE,
+                        KIND_MONTHLY_LAST, KIND_MONTHLY_FIRST)
+
+# datetime64[D] gün sayısı ile date.toordinal() arasındaki fark (1970-01-01)
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+# 1970-01-01 Perşembe (weekday 3)
+_EPOCH_WEEKDAY = 3
+# (toplantı sırası, ordinal) çiftini tek int64 anahtara çevirmek için çarpan
+_PAIR_BASE = datetime.date.max.toordinal() + 1
+
+
+def _person_names(data):
+    names = []
+    for p in data.get('people', []):
+        name = p['name'] if isinstance(p, dict) else p
+        if name not in names:
+            names.append(name)
+    for m in data.get('meetings', []):
+        for name in m.get('attendees', []):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def meetings_to_columns(data):
+    """
+    Toplantı listesini sütun dizilerine çevirir.
+    Katılımcı maskesinde bit i, people[i] kişisini gösterir
+    (64 kişiyi aşarsa maske Python int'li object dizisi olur).
+    """
+    meetings = data.get('meetings', [])
+    people = _person_names(data)
+    bit_of = {name: 1 << i for i, name in enumerate(people)}
+    n = len(meetings)
+
+    cols = {
+        'kind': np.empty(n, dtype=object),
+        'weekday': np.zeros(n, dtype=np.int64),
+        'start_min': np.zeros(n, dtype=np.int64),
+        'end_min': np.zeros(n, dtype=np.int64),
+        'start_ord': np.zeros(n, dtype=np.int64),
+        'end_ord': np.zeros(n, dtype=np.int64),
+        'anchor': np.zeros(n, dtype=np.int64),
+        'period': np.ones(n, dtype=np.int64),
+    }
+    masks = []
+    for i, m in enumerate(meetings):
+        rule = compile_meeting(m)
+        cols['kind'][i] = rule.kind
+        cols['weekday'][i] = rule.weekday or 0
+        cols['start_min'][i] = rule.start_min or 0
+        cols['end_min'][i] = rule.end_min or 0
+        cols['start_ord'][i] = rule.start_ord
+        cols['end_ord'][i] = rule.end_ord
+        cols['anchor'][i] = rule.anchor or 0
+        cols['period'][i] = rule.period
+        mask = 0
+        for name in m.get('attendees', []):
+            mask |= bit_of[name]
+        masks.append(mask)
+
+    cols['attendee_mask'] = np.array(masks, dtype=np.uint64 if len(people) <= 64 else object)
+    cols['people'] = people
+    return cols
+
+
+def _expand_weekly(cols, idx, lo, hi):
+    """Haftalık ve tek seferlik kuralları aritmetik diziyle genişletir."""
+    anchor = cols['anchor'][idx]
+    step = 7 * cols['period'][idx]
+    once = cols['kind'][idx] == KIND_ONCE
+
+    first_allowed = np.maximum(cols['start_ord'][idx], lo)
+    last_allowed = np.minimum(cols['end_ord'][idx], hi)
+    # Tek seferlik: yalnızca anchor günü
+    first_allowed = np.where(once, np.maximum(first_allowed, anchor), first_allowed)
+    last_allowed = np.where(once, np.minimum(last_allowed, anchor), last_allowed)
+
+    gap = np.maximum(first_allowed - anchor, 0)
+    first = anchor + (-(-gap // step)) * step
+    counts = np.where(first <= last_allowed, (last_allowed - first) // step + 1, 0)
+
+    total = int(counts.sum())
+    rows = np.repeat(idx, counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    offsets = np.arange(total, dtype=np.int64) - starts
+    ordinals = np.repeat(first, counts) + offsets * np.repeat(step, counts)
+    return rows, ordinals
+
+
+def _expand_monthly(cols, idx, lo, hi):
+    """Aylık kuralları (ayın ilk / son <gün>ü) ay x toplantı yayınımıyla genişletir."""
+    first_month = np.datetime64(datetime.date.fromordinal(lo), 'M')
+    last_month = np.datetime64(datetime.date.fromordinal(hi), 'M')
+    months = np.arange(first_month, last_month + 1)
+
+    first_days = months.astype('datetime64[D]').astype(np.int64)
+    last_days = (months + 1).astype('datetime64[D]').astype(np.int64) - 1
+    first_wd = (first_days + _EPOCH_WEEKDAY) % 7
+    last_wd = (last_days + _EPOCH_WEEKDAY) % 7
+
+    weekday = cols['weekday'][idx][:, None]
+    is_last = (cols['kind'][idx] == KIND_MONTHLY_LAST)[:, None]
+    ordinals = np.where(
+        is_last,
+        last_days[None, :] - (last_wd[None, :] - weekday) % 7,
+        first_days[None, :] + (weekday - first_wd[None, :]) % 7,
+    ) + _EPOCH_ORDINAL
+
+    low = np.maximum(cols['start_ord'][idx], lo)[:, None]
+    high = np.minimum(cols['end_ord'][idx], hi)[:, None]
+    valid = (ordinals >= low) & (ordinals <= high)
+    rows = np.broadcast_to(idx[:, None], ordinals.shape)[valid]
+    return rows, ordinals[valid]
+
+
+def expand_frame(data, start, end, skip_holidays=True, columns=None):
+    """
+    start ve end (dahil) arasındaki tüm tekrarları DataFrame olarak döndürür.
+    Sütunlar: meeting_idx, date, ordinal, weekday, start_min, end_min, attendee_mask
+    """
+    cols = columns if columns is not None else meetings_to_columns(data)
+    lo, hi = start.toordinal(), end.toordinal()
+    kind = cols['kind']
+
+    weekly_idx = np.flatnonzero((kind == KIND_WEEKLY) | (kind == KIND_ONCE))
+    monthly_idx = np.flatnonzero((kind == KIND_MONTHLY_LAST) | (kind == KIND_MONTHLY_FIRST))
+
+    parts = [_expand_weekly(cols, weekly_idx, lo, hi)]
+    if len(monthly_idx) and lo <= hi:
+        parts.append(_expand_monthly(cols, monthly_idx, lo, hi))
+
+    rows = np.concatenate([p[0] for p in parts]).astype(np.int64)
+    ordinals = np.concatenate([p[1] for p in parts]).astype(np.int64)
+
+    if skip_holidays:
+        holidays = np.fromiter(holiday_ordinals(data), dtype=np.int64)
+        keep = ~np.isin(ordinals, holidays)
+        rows, ordinals = rows[keep], ordinals[keep]
+
+    # İptal edilen tekrarlar (data['exceptions']) toplantı kimliğiyle eşleşir
+    cancelled = exception_ordinals(data)
+    dropped = [i * _PAIR_BASE + o for i, m in enumerate(data.get('meetings', []))
+               for o in cancelled.get(m.get('id'), ())] if cancelled else []
+    if dropped:
+        keep = ~np.isin(rows * _PAIR_BASE + ordinals, np.array(dropped, dtype=np.int64))
+        rows, ordinals = rows[keep], ordinals[keep]
+
+    # recurrence.expand ile aynı sıra: (tarih, başlangıç), eşitlikte toplantı sırası
+    order = np.lexsort((rows, cols['start_min'][rows], ordinals))
+    rows, ordinals = rows[order], ordinals[order]
+
+    return pd.DataFrame({
+        'meeting_idx': rows,
+        'date': (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]'),
+        'ordinal': ordinals,
+        'weekday': (ordinals + _EPOCH_WEEKDAY - _EPOCH_ORDINAL) % 7,
+        'start_min': cols['start_min'][rows],
+        'end_min': cols['end_min'][rows],
+        'attendee_mask': cols['attendee_mask'][rows],
+    })
+
+
+def expand_years(data, start, years, skip_holidays=True):
+    """start tarihinden itibaren N yıllık tüm tekrarları döndürür."""
+    # Aynı gün N yıl sonrası (29 Şubat için ay başından say), hariç
+    end = datetime.date(start.year + years, start.month, 1) + datetime.timedelta(days=start.day - 2)
+    return expand_frame(data, start, end, skip_holidays=skip_holidays)
+
+
+def filter_person(frame, columns, person):
+    """Kişinin katıldığı satırları maske üzerinden seçer."""
+    if person not in columns['people']:
+        return frame.iloc[0:0]
+    bit = 1 << columns['people'].index(person)
+    if frame['attendee_mask'].dtype == object:
+        return frame[[(mask & bit) != 0 for mask in frame['attendee_mask']]]
+    return frame[(frame['attendee_mask'].to_numpy() & np.uint64(bit)) != 0]
@@ -0,0 +1,68 @@
+"""
+ICS dışa aktarımının ölçümü.
+
+ics_export (seri başına tek VEVENT, RRULE + EXDATE, akış halinde yazım) ile
+tekrar başına bir ics.Event nesnesi oluşturan eski yöntemi karşılaştırır.
+ics paketi kurulu değilse yalnızca ics_export ölçülür.
+
+Kullanım: python benchmarks/bench_ics.py [gün_sayısı]
+"""
+import os
+import sys
+import json
+import time
+import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from ics_export import ics_bytes
+from recurrence import expand
+
+
+def per_occurrence(data, start, end):
+    """Eski yöntem: her tekrar için ayrı ics.Event, tümü birden serileştirilir."""
+    from ics import Calendar, Event
+    c = Calendar()
+    for occ in expand(data, start, end):
+        m = occ.meeting
+        e = Event()
+        e.uid = f"{m['id']}-{occ.date.strftime('%Y%m%d')}@takvim"
+        e.name = m['title']
+        e.begin = datetime.datetime.combine(occ.date, datetime.time(occ.start_min // 60, occ.start_min % 60))
+        e.end = datetime.datetime.combine(occ.date, datetime.time(occ.end_min // 60, occ.end_min % 60))
+        e.description = f"Toplantı: {m['title']}\nKatılımcılar: {', '.join(m.get('attendees', []))}"
+        c.events.add(e)
+    return c.serialize().encode('utf-8')
+
+
+def timed(func, repeat=5):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    with open(os.path.join(ROOT, 'calendar_data.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    start = datetime.date(2026, 1, 1)
+    end = start + datetime.timedelta(days=days - 1)
+
+    print(f"{'Yöntem':<28}{'süre (ms)':>12}{'boyut (KB)':>12}")
+    elapsed, body = timed(lambda: ics_bytes(data, start, end))
+    print(f"{'ics_export (RRULE)':<28}{elapsed * 1000:>12.1f}{len(body) / 1024:>12.1f}")
+    try:
+        elapsed, body = timed(lambda: per_occurrence(data, start, end), repeat=1)
+    except ImportError:
+        print("ics paketi kurulu değil; eski yöntem atlandı")
+        return
+    print(f"{'ics.Event (tekrar başına)':<28}{elapsed * 1000:>12.1f}{len(body) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Gün yerleşimi (layout.layout_day) performans ölçümü.
+
+Eski draw_weekly_view algoritması (sütun taraması + her sütunun tüm kullanım
+listesini dolaşan genişleme) ile karşılaştırır ve sonuçların aynı olduğunu
+doğrular. 50+ iç içe toplantılı patolojik günler dahil.
+
+Kullanım: python benchmarks/bench_layout.py
+"""
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from layout import layout_day, Placement
+
+
+def legacy_layout(intervals):
+    """draw_weekly_view'daki eski algoritma (karşılaştırma için)."""
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    placements = [None] * len(intervals)
+
+    groups = []
+    current_group = []
+    group_end = None
+    for i in order:
+        if current_group and intervals[i][0] < group_end:
+            current_group.append(i)
+            group_end = max(group_end, intervals[i][1])
+        else:
+            if current_group:
+                groups.append(current_group)
+            current_group = [i]
+            group_end = intervals[i][1]
+    if current_group:
+        groups.append(current_group)
+
+    for group in groups:
+        columns = []
+        meeting_cols = {}
+        for i in group:
+            placed = False
+            for c, col_end in enumerate(columns):
+                if intervals[i][0] >= col_end:
+                    columns[c] = intervals[i][1]
+                    meeting_cols[i] = c
+                    placed = True
+                    break
+            if not placed:
+                columns.append(intervals[i][1])
+                meeting_cols[i] = len(columns) - 1
+
+        total_cols = len(columns)
+        col_usage = {c: [] for c in range(total_cols)}
+        for i in group:
+            col_usage[meeting_cols[i]].append(intervals[i])
+
+        for i in group:
+            start, end = intervals[i]
+            span = 1
+            for check_col in range(meeting_cols[i] + 1, total_cols):
+                if any(max(start, u_start) < min(end, u_end) for u_start, u_end in col_usage[check_col]):
+                    break
+                span += 1
+            placements[i] = Placement(meeting_cols[i], span, total_cols)
+    return placements
+
+
+def make_day(n, seed, day_start=8 * 60, day_end=17 * 60 + 30):
+    """n toplantılık, yoğun çakışmalı bir gün üretir (15 dk ızgara)."""
+    rnd = random.Random(seed)
+    intervals = []
+    for _ in range(n):
+        start = day_start + 15 * rnd.randrange((day_end - day_start) // 15 - 1)
+        length = 15 * rnd.randint(1, 12)
+        intervals.append((start, min(start + length, day_end)))
+    return intervals
+
+
+def make_staircase(n, day_start=8 * 60):
+    """Her toplantı bir öncekiyle çakışan merdiven (tek büyük grup)."""
+    return [(day_start + i * 5, day_start + i * 5 + 120) for i in range(n)]
+
+
+def timed(func, intervals, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(intervals)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    cases = [
+        ("tipik gün (8)", make_day(8, 1)),
+        ("yoğun gün (50)", make_day(50, 2)),
+        ("merdiven (50)", make_staircase(50)),
+        ("yoğun gün (200)", make_day(200, 3)),
+        ("merdiven (200)", make_staircase(200)),
+        ("yoğun gün (1000)", make_day(1000, 4)),
+    ]
+    print(f"{'Durum':<20}{'layout_day (ms)':>18}{'eski (ms)':>14}{'hızlanma':>12}")
+    for name, intervals in cases:
+        assert layout_day(intervals) == legacy_layout(intervals), name
+        repeat = 20 if len(intervals) <= 200 else 3
+        new_ms = timed(layout_day, intervals, repeat)
+        old_ms = timed(legacy_layout, intervals, repeat)
+        print(f"{name:<20}{new_ms:>18.3f}{old_ms:>14.3f}{old_ms / new_ms:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Haftalık sayfa çizim motorlarının karşılaştırması.
+
+matplotlib (PdfPages / PNG) ile vector_render (doğrudan PDF / SVG) arasında
+sayfa başına süreyi ölçer.
+
+Kullanım: python benchmarks/bench_render.py [hafta_sayısı]
+"""
+import os
+import sys
+import io
+import json
+import time
+import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from generate_calendar_image import generate_calendar_pdf, get_weekly_calendar_figure
+
+
+def timed(func):
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def main():
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with open(os.path.join(ROOT, 'calendar_data.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    start = datetime.date(2026, 3, 2)
+
+    print(f"{'Çıktı':<26}{'matplotlib (ms/sayfa)':>24}{'vector (ms/sayfa)':>20}{'hızlanma':>12}")
+
+    results = {}
+    for backend in ("matplotlib", "vector"):
+        results[backend] = timed(lambda: generate_calendar_pdf(data=data, start_date=start, weeks=weeks, jobs=1,
+                                                               output_file=io.BytesIO(), backend=backend)) / weeks
+    print(f"{f'PDF ({weeks} hafta)':<26}{results['matplotlib'] * 1000:>24.1f}{results['vector'] * 1000:>20.1f}"
+          f"{results['matplotlib'] / results['vector']:>11.1f}x")
+
+    def matplotlib_svg():
+        import matplotlib.pyplot as plt
+        fig = get_weekly_calendar_figure(data, start)
+        fig.savefig(io.BytesIO(), format='svg')
+        plt.close(fig)
+
+    mpl = timed(matplotlib_svg)
+    vec = timed(lambda: get_weekly_calendar_figure(data, start, backend="vector"))
+    print(f"{'SVG (1 hafta)':<26}{mpl * 1000:>24.1f}{vec * 1000:>20.1f}{mpl / vec:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
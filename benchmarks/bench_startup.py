@@ -0,0 +1,58 @@
+"""
+Pano açılış süresi raporu.
+
+dashboard.py'yi her ölçüm için yeni bir süreçte Streamlit AppTest ile çalıştırır
+ve giriş ekranının (ve giriş sonrası varsayılan Web Takvimi sayfasının) ilk çizim süresini,
+hangi ağır modüllerin yüklendiğini raporlar. "eager" satırı ağır modülleri
+önceden içe aktararak eski (hepsi en üstte içe aktarılan) davranışı taklit eder.
+
+Kullanım: python benchmarks/bench_startup.py [tekrar]
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+HEAVY_MODULES = ["matplotlib.pyplot", "matplotlib.backends.backend_pdf", "ics", "streamlit_calendar"]
+
+_CHILD = r'''
+import sys, time, json, importlib
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_streamlit = time.perf_counter() - t0
+mode, page = sys.argv[1], sys.argv[2]
+if mode == "eager":
+    for name in HEAVY: importlib.import_module(name)
+at = AppTest.from_file("dashboard.py", default_timeout=120)
+if page != "login":
+    at.session_state["logged_in"] = True
+t1 = time.perf_counter()
+at.run()
+t_run = time.perf_counter() - t1
+print(json.dumps({"total": time.perf_counter() - t0, "script": t_run, "streamlit": t_streamlit,
+                  "exception": bool(at.exception), "heavy": [m for m in HEAVY if m in sys.modules]}))
+'''
+
+
+def measure(mode, page):
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + _CHILD
+    out = subprocess.run([sys.executable, "-c", code, mode, page], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'Sayfa':<14}{'mod':<8}{'toplam (s)':>12}{'betik (s)':>12}  yüklenen ağır modüller")
+    for page in ("login", "Web Takvimi"):
+        for mode in ("eager", "lazy"):
+            runs = [measure(mode, page) for _ in range(repeat)]
+            best = min(runs, key=lambda r: r["total"])
+            heavy = ", ".join(best["heavy"]) or "-"
+            flag = "  (HATA)" if best["exception"] else ""
+            print(f"{page:<14}{mode:<8}{best['total']:>12.2f}{best['script']:>12.2f}  {heavy}{flag}")
+
+
+if __name__ == "__main__":
+    main()
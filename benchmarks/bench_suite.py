@@ -0,0 +1,281 @@
+"""
+Performans ölçüm takımı ve gerileme bütçeleri.
+
+benchmarks/synthetic.py ile tohumlu sentetik takvimler üretir (birkaç ölçekte)
+ve sıcak yolları ölçer: should_show_meeting, get_mixed_color, tekrar
+genişletme, 5 yıllık toplu genişletme (batch_expand), pano olay listesi, draw_weekly_view, draw_monthly_view, yıl
+özeti, generate_calendar_pdf (her iki motor), load_data ve save_data.
+
+Sonuçlar JSON olarak yazılır ve benchmarks/budgets.json ile karşılaştırılır;
+bütçesini aşan her ölçüm listelenir ve çıkış kodu 1 olur.
+
+Kullanım: python benchmarks/bench_suite.py [--scales small,medium] [--repeat 3]
+          [--output sonuc.json] [--budget benchmarks/budgets.json] [--update-budget 3.0]
+"""
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import datetime
+import tempfile
+import contextlib
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+matplotlib.use('Agg')
+
+from synthetic import generate_calendar
+
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'budgets.json')
+
+# Ölçek: (kişi, toplantı)
+SCALES = {
+    "small": (5, 50),
+    "medium": (20, 500),
+    "large": (60, 3000),
+}
+SEED = 42
+YEAR = 2026
+WEEK = datetime.date(YEAR, 3, 2)  # Pazartesi
+# Milisaniyenin altındaki ölçümler gürültülü; bütçe bundan küçük yazılmaz
+MIN_BUDGET_MS = 2.0
+
+
+def _week_starts():
+    return [WEEK + datetime.timedelta(weeks=i) for i in range(52)]
+
+
+def case_should_show_meeting(data, workdir):
+    from generate_calendar_image import should_show_meeting
+    weeks = _week_starts()
+    meetings = data['meetings']
+    return lambda: sum(should_show_meeting(m, w) for w in weeks for m in meetings)
+
+
+def case_get_mixed_color(data, workdir):
+    from week_model import get_mixed_color
+    colors = data['settings']['colors']
+    groups = [m['attendees'] for m in data['meetings']]
+    return lambda: [get_mixed_color(a, colors) for a in groups]
+
+
+def case_expand_year(data, workdir):
+    from recurrence import expand
+    start, end = datetime.date(YEAR, 1, 1), datetime.date(YEAR, 12, 31)
+    return lambda: expand(data, start, end)
+
+
+def case_batch_expand(data, workdir):
+    """5 yıllık tüm tekrarlar tek DataFrame'de (takvim export --format xlsx yolu)."""
+    from batch_expand import expand_years
+    return lambda: expand_years(data, datetime.date(YEAR, 1, 1), 5)
+
+
+def case_dashboard_events(data, workdir):
+    """Pano ay görünümü: 6 haftalık ızgaranın olay listesi (hazır indeksle)."""
+    from calendar_feed import build_events, visible_range, VIEW_MONTH
+    from occurrence_index import OccurrenceIndex
+    index = OccurrenceIndex()
+    index.sync(data)
+    start, end = visible_range(VIEW_MONTH, WEEK)
+    return lambda: build_events(data, index, start, end)
+
+
+def case_index_sync(data, workdir):
+    from occurrence_index import OccurrenceIndex
+    return lambda: OccurrenceIndex().sync(data)
+
+
+def case_draw_weekly_view(data, workdir):
+    import matplotlib.pyplot as plt
+    from generate_calendar_image import draw_weekly_view
+
+    def run():
+        fig, ax = plt.subplots(figsize=(16, 9))
+        draw_weekly_view(ax, data, WEEK)
+        fig.canvas.draw()
+        plt.close(fig)
+    return run
+
+
+def case_draw_monthly_view(data, workdir):
+    import matplotlib.pyplot as plt
+    from generate_calendar_image import draw_monthly_view
+
+    def run():
+        fig, ax = plt.subplots(figsize=(16, 9))
+        draw_monthly_view(ax, data, WEEK.year, WEEK.month)
+        fig.canvas.draw()
+        plt.close(fig)
+    return run
+
+
+def case_overview_year(data, workdir):
+    """12 mini aylık yıl özeti (vektör PDF); haftalık tek sayfa çizimiyle karşılaştırılabilir."""
+    from vector_render import render_overview_pdf
+    return lambda: render_overview_pdf(data, [(YEAR, None)], io.BytesIO())
+
+
+def _pdf_case(backend, weeks):
+    def case(data, workdir):
+        from generate_calendar_image import generate_calendar_pdf
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_calendar_pdf(output_file=io.BytesIO(), data=data, start_date=WEEK, weeks=weeks,
+                                      jobs=1, backend=backend)
+        return run
+    return case
+
+
+def _write_doc(data, workdir):
+    json_file = os.path.join(workdir, 'calendar_data.json')
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    return json_file
+
+
+def case_load_data(data, workdir):
+    """Soğuk okuma (işlem içi önbellek her seferinde boşaltılır)."""
+    import storage
+    json_file = _write_doc(data, workdir)
+
+    def run():
+        storage._LOAD_CACHE.clear()
+        storage.load_data(json_file)
+    return run
+
+
+def case_save_data(data, workdir):
+    """Tek toplantı değiştirip kaydetme (yedek + indeks güncellemesi dahil)."""
+    import storage
+    json_file = _write_doc(data, workdir)
+    backup_dir = os.path.join(workdir, 'backups')
+    state = {'doc': storage.load_data(json_file), 'n': 0}
+
+    def run():
+        doc = state['doc']
+        state['n'] += 1
+        # Toplantılar yerinde değiştirilmez (copy_model paylaşır), yenisiyle değiştirilir
+        doc['meetings'][0] = dict(doc['meetings'][0], title=f"Kayıt ölçümü {state['n']}")
+        doc['doc_version'] = storage.save_data(doc, json_file, backup_dir)
+    return run
+
+
+# (ad, kurulum, ölçekler) — kurulum ölçülecek çağrıyı döndürür
+CASES = [
+    ("should_show_meeting", case_should_show_meeting, ("small", "medium", "large")),
+    ("get_mixed_color", case_get_mixed_color, ("small", "medium", "large")),
+    ("expand_year", case_expand_year, ("small", "medium", "large")),
+    ("batch_expand", case_batch_expand, ("small", "medium", "large")),
+    ("index_sync", case_index_sync, ("small", "medium", "large")),
+    ("dashboard_events", case_dashboard_events, ("small", "medium", "large")),
+    ("draw_weekly_view", case_draw_weekly_view, ("small", "medium")),
+    ("draw_monthly_view", case_draw_monthly_view, ("small", "medium", "large")),
+    ("overview_year", case_overview_year, ("small", "medium", "large")),
+    ("pdf_matplotlib_2w", _pdf_case("matplotlib", 2), ("small", "medium")),
+    ("pdf_vector_4w", _pdf_case("vector", 4), ("small", "medium", "large")),
+    ("load_data", case_load_data, ("small", "medium", "large")),
+    ("save_data", case_save_data, ("small", "medium", "large")),
+]
+
+
+def timed(func, repeat):
+    """En iyi süre (ms); ilk çağrı ısınma içindir ve sayılmaz."""
+    func()
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_suite(scales, repeat, only=None):
+    """{"durum/ölçek": ms} sözlüğü."""
+    import feed_server
+    results = {}
+    for scale in scales:
+        people, meetings = SCALES[scale]
+        data = generate_calendar(people, meetings, seed=SEED, year=YEAR)
+        for name, setup, case_scales in CASES:
+            if scale not in case_scales or (only and name not in only):
+                continue
+            with tempfile.TemporaryDirectory() as workdir:
+                key = f"{name}/{scale}"
+                results[key] = round(timed(setup(data, workdir), repeat), 3)
+                print(f"{key:<32}{results[key]:>12.2f} ms", flush=True)
+                # Arka plandaki akış yayını sonraki ölçümlere karışmasın
+                feed_server.wait_for_publish()
+    return results
+
+
+def check_budgets(results, budgets):
+    """Bütçesini aşan ölçümler: [(anahtar, ölçülen, bütçe)]."""
+    return [(key, ms, budgets[key]) for key, ms in sorted(results.items())
+            if key in budgets and ms > budgets[key]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="takvim performans ölçüm takımı")
+    parser.add_argument("--scales", default=",".join(SCALES), help="Virgülle ayrılmış ölçekler")
+    parser.add_argument("--cases", default="", help="Yalnızca bu durumlar (virgülle ayrılmış)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--budget", default=BUDGET_FILE)
+    parser.add_argument("--update-budget", type=float, metavar="KAT",
+                        help="Bütçe dosyasını ölçülen süre x KAT ile yeniden yaz")
+    args = parser.parse_args(argv)
+
+    # Ölçümler her zaman JSON motoruyla ve bu makinedeki ayarlardan bağımsız yapılır
+    os.environ["TAKVIM_STORAGE"] = "json"
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"Bilinmeyen ölçek: {', '.join(unknown)}")
+    only = {c.strip() for c in args.cases.split(",") if c.strip()}
+
+    results = run_suite(scales, args.repeat, only)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"seed": SEED, "scales": {s: SCALES[s] for s in scales}, "results": results}, f, indent=2)
+
+    if args.update_budget:
+        budgets = {}
+        if os.path.exists(args.budget):
+            with open(args.budget, 'r', encoding='utf-8') as f:
+                budgets = json.load(f)
+        budgets.update({key: round(max(ms * args.update_budget, MIN_BUDGET_MS), 1) for key, ms in results.items()})
+        with open(args.budget, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(budgets.items())), f, indent=2)
+            f.write("\n")
+        print(f"Bütçeler güncellendi: {args.budget}")
+        return 0
+
+    if not os.path.exists(args.budget):
+        print(f"Bütçe dosyası yok: {args.budget}")
+        return 0
+    with open(args.budget, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+    missing = sorted(set(results) - set(budgets))
+    if missing:
+        print(f"Bütçesi olmayan ölçümler: {', '.join(missing)}")
+    regressions = check_budgets(results, budgets)
+    if regressions:
+        print("\nPERFORMANS GERİLEMESİ — bütçe aşıldı:")
+        for key, ms, budget in regressions:
+            print(f"  {key:<32}{ms:>10.2f} ms > {budget:.2f} ms (x{ms / budget:.2f})")
+        return 1
+    print(f"\nTüm ölçümler bütçe içinde ({len(results)} ölçüm).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Ölçümler için tohumlu (tekrarlanabilir) sentetik takvim verisi üretici.
+
+calendar_data.json biçiminde (şema 2, toplantı kimlikleri dahil) belge üretir:
+N kişi, M toplantı (gerçekçi sıklık karışımı), tatil yoğunluğu ve çakışma
+yoğunluğu ayarlanabilir. Aynı tohum her zaman aynı belgeyi verir.
+
+Kullanım: python benchmarks/synthetic.py [kişi] [toplantı] [tohum] > veri.json
+"""
+import os
+import sys
+import json
+import random
+import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from storage import SCHEMA_KEY, SCHEMA_VERSION, VERSION_KEY
+
+DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+
+# Sıklık karışımı (ağırlık)
+FREQUENCY_MIX = (
+    ("Her Hafta", 45),
+    ("İki Haftada Bir", 20),
+    ("Tek Seferlik", 20),
+    ("Aylık", 5),
+    ("Aylık (Son Pazartesi)", 10),
+)
+
+# Çakışma yoğunluğu bu oranda toplantıyı yoğun saatlere toplar
+BUSY_SLOTS = ("09:00", "10:00", "14:00")
+DURATIONS = ((30, 30), (60, 40), (90, 15), (120, 15))  # (dakika, ağırlık)
+
+FIRST_NAMES = ["Ayşe", "Mehmet", "Zeynep", "Ali", "Elif", "Mustafa", "Fatma", "Emre", "Deniz", "Can",
+               "Selin", "Burak", "Ece", "Kerem", "Merve", "Oğuz", "Gizem", "Serkan", "Derya", "Tolga"]
+
+TITLES = ["Durum Toplantısı", "Planlama", "Sprint Değerlendirme", "Bütçe Gözden Geçirme", "Müşteri Görüşmesi",
+          "Mimari Kurul", "Eğitim", "Birebir", "Yönetim Kurulu", "Satış Takibi", "Ürün Demo", "Retrospektif"]
+
+
+def _color(rng):
+    r, g, b = (rng.randint(170, 250) for _ in range(3))
+    return {"bg": f"#{r:02X}{g:02X}{b:02X}", "border": f"#{r // 2:02X}{g // 2:02X}{b // 2:02X}"}
+
+
+def _people(rng, count):
+    people = []
+    for i in range(count):
+        base = FIRST_NAMES[i % len(FIRST_NAMES)]
+        name = base if i < len(FIRST_NAMES) else f"{base} {i // len(FIRST_NAMES) + 1}"
+        people.append({"name": name, "fullname": f"{name} Soyad",
+                       "email": f"kisi{i + 1}@example.com" if rng.random() < 0.8 else ""})
+    return people
+
+
+def _weighted(rng, pairs):
+    return rng.choices([p[0] for p in pairs], weights=[p[1] for p in pairs])[0]
+
+
+def _time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def generate_calendar(people=10, meetings=100, seed=0, year=2026, holiday_density=0.03, overlap_density=0.3,
+                      max_attendees=6):
+    """
+    Sentetik takvim belgesi.
+    holiday_density: Yılın hafta içi günlerinin tatil olan oranı
+    overlap_density: Yoğun saatlere (BUSY_SLOTS) yerleştirilen toplantıların oranı
+    """
+    rng = random.Random(seed)
+    person_list = _people(rng, people)
+    names = [p['name'] for p in person_list]
+
+    colors = {"All Team": {"bg": "#FFCCCC", "border": "#FF0000", "label": "Tüm Ekip"},
+              "Mixed": {"bg": "#E0E0E0", "border": "#666666", "label": "Karma / Diğer"}}
+    for name in names:
+        colors[name] = dict(_color(rng), label=name)
+
+    year_start, year_end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    weekdays = [year_start + datetime.timedelta(days=i) for i in range((year_end - year_start).days + 1)]
+    weekdays = [d for d in weekdays if d.weekday() < 5]
+    holidays = {d.isoformat(): f"Tatil {i + 1}"
+                for i, d in enumerate(sorted(rng.sample(weekdays, int(len(weekdays) * holiday_density))))}
+
+    meeting_list = []
+    for _ in range(meetings):
+        frequency = _weighted(rng, FREQUENCY_MIX)
+        if rng.random() < overlap_density:
+            start_min = int(BUSY_SLOTS[rng.randrange(len(BUSY_SLOTS))][:2]) * 60
+        else:
+            start_min = rng.randrange(8 * 4, 16 * 4) * 15
+        end_min = min(start_min + _weighted(rng, DURATIONS), 18 * 60)
+        attendees = rng.sample(names, rng.randint(1, min(max_attendees, len(names))))
+
+        if frequency == "Tek Seferlik":
+            date = rng.choice(weekdays)
+            day, start_date, end_date = DAYS[date.weekday()], date, date
+        else:
+            day = "Pazartesi" if frequency == "Aylık (Son Pazartesi)" else rng.choice(DAYS)
+            start_date = year_start + datetime.timedelta(days=rng.randrange(0, 120))
+            end_date = year_end - datetime.timedelta(days=rng.randrange(0, 60))
+
+        meeting_list.append({
+            "title": f"{rng.choice(TITLES)} {len(meeting_list) + 1}",
+            "attendees": attendees,
+            "day": day,
+            "start_time": _time(start_min),
+            "end_time": _time(end_min),
+            "frequency": frequency,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "id": f"{rng.getrandbits(48):012x}",
+        })
+
+    return {
+        "holidays": holidays,
+        "settings": {"work_start": "08:00", "work_end": "17:30",
+                     "lunch_break": {"start": "12:30", "end": "13:30"}, "days": DAYS, "colors": colors},
+        "people": person_list,
+        "meetings": meeting_list,
+        "exceptions": [],
+        SCHEMA_KEY: SCHEMA_VERSION,
+        VERSION_KEY: 1,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    json.dump(generate_calendar(*args), sys.stdout, ensure_ascii=False, indent=2)
@@ -0,0 +1,307 @@
+"""
+CSV/Excel dosyalarından toplu içe aktarma (toplantılar, kişiler, tatiller).
+
+Satırlar akış halinde okunur (CSV: csv.reader, Excel: openpyxl read-only
+modu); dosya belleğe tablo olarak alınmaz. Her sayfanın/dosyanın türü başlık
+satırından anlaşılır:
+
+    Toplantılar: Başlık, Gün, Başlangıç, Bitiş, Sıklık, Katılımcılar,
+                 Başlangıç Tarihi, Bitiş Tarihi
+    Kişiler:     Ad, Ad Soyad, E-posta
+    Tatiller:    Tarih, Tatil
+
+Tüm satırlar toplu doğrulanır, hatalar satır numarasıyla raporlanır ve
+sonuç çağıranın tek bir save_data çağrısıyla yazılır.
+"""
+import io
+import csv
+import datetime
+from collections import namedtuple
+
+from meeting_table import DAYS, FREQUENCIES, row_to_meeting
+
+KIND_MEETINGS = "meetings"
+KIND_PEOPLE = "people"
+KIND_HOLIDAYS = "holidays"
+
+# Sütun adı -> eş anlamlılar (karşılaştırma büyük/küçük harf, ı/i ve _/boşluk duyarsız)
+HEADERS = {
+    KIND_MEETINGS: {
+        "Başlık": ("title", "toplantı"),
+        "Gün": ("day",),
+        "Başlangıç": ("start", "start_time", "başlangıç saati"),
+        "Bitiş": ("end", "end_time", "bitiş saati"),
+        "Sıklık": ("frequency", "tekrar"),
+        "Katılımcılar": ("attendees", "katılımcı"),
+        "Başlangıç Tarihi": ("start_date",),
+        "Bitiş Tarihi": ("end_date",),
+    },
+    KIND_PEOPLE: {
+        "Ad": ("name", "isim", "kısa ad"),
+        "Ad Soyad": ("fullname", "tam ad"),
+        "E-posta": ("email", "e-mail", "eposta"),
+    },
+    KIND_HOLIDAYS: {
+        "Tarih": ("date",),
+        "Tatil": ("holiday", "açıklama", "ad"),
+    },
+}
+# Türü belirleyen zorunlu sütun (kontrol sırası önemli: tatil sayfasında da "Ad" olabilir)
+KIND_MARKERS = ((KIND_MEETINGS, "Başlık"), (KIND_HOLIDAYS, "Tarih"), (KIND_PEOPLE, "Ad"))
+
+FREQUENCY_ALIASES = {
+    "haftalık": "Her Hafta",
+    "2 haftada bir": "İki Haftada Bir",
+    "tek": "Tek Seferlik",
+    "son pazartesi": "Aylık (Son Pazartesi)",
+}
+
+# Excel'de yalnızca bu kadar satırlık boş blok görülürse sayfa bitmiş sayılır
+MAX_BLANK_ROWS = 50
+
+RowError = namedtuple('RowError', ['source', 'row', 'messages'])
+ImportResult = namedtuple('ImportResult', ['meetings', 'people', 'holidays', 'skipped', 'errors'])
+
+
+def _norm(text):
+    return str(text).strip().casefold().replace('ı', 'i').replace('i̇', 'i').replace('_', ' ')
+
+
+_DAY_LOOKUP = {_norm(d): d for d in DAYS}
+_FREQUENCY_LOOKUP = {_norm(f): f for f in FREQUENCIES}
+_FREQUENCY_LOOKUP.update({_norm(k): v for k, v in FREQUENCY_ALIASES.items()})
+
+
+def _map_header(header_row):
+    """Başlık satırından (tür, {sütun sırası: standart ad}); tanınmazsa (None, {})."""
+    cells = [_norm(h) if h is not None else "" for h in header_row]
+    for kind, marker in KIND_MARKERS:
+        columns = {}
+        for name, aliases in HEADERS[kind].items():
+            wanted = {_norm(name)} | {_norm(a) for a in aliases}
+            for i, cell in enumerate(cells):
+                if cell in wanted and i not in columns:
+                    columns[i] = name
+                    break
+        if marker in columns.values():
+            return kind, columns
+    return None, {}
+
+
+# --- Hücre Değerleri ---
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _time(value):
+    """Saat hücresi (9:00, 09.00, datetime.time/datetime, Excel gün kesri) -> HH:MM."""
+    if isinstance(value, (datetime.time, datetime.datetime)):
+        return value.strftime("%H:%M")
+    if isinstance(value, (int, float)) and 0 <= value < 1:
+        minutes = round(value * 24 * 60)
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+    text = _text(value).replace(".", ":")
+    parts = text.split(":")
+    if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+        return f"{int(parts[0]):02d}:{parts[1][:2]}"
+    return text
+
+
+def _date(value):
+    """datetime, "YYYY-AA-GG" veya "GG.AA.YYYY" -> date; boşsa None, okunamazsa metin."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = _text(value)
+    if not text:
+        return None
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y"):
+        try:
+            return datetime.datetime.strptime(text[:10], fmt).date()
+        except ValueError:
+            continue
+    return text
+
+
+# --- Okuma (akış) ---
+
+def _csv_text(stream):
+    """Bayt akışını metne çevirir: UTF-8 (BOM'lu olabilir), değilse Türkçe Windows kodlaması."""
+    sample = stream.read(64 * 1024)
+    stream.seek(0)
+    try:
+        sample.decode('utf-8')
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError as e:
+        # Örneğin sonunda yarım kalan çok baytlı karakter hata sayılmaz
+        encoding = 'utf-8-sig' if e.start >= len(sample) - 3 else 'cp1254'
+    return io.TextIOWrapper(stream, encoding=encoding, newline='')
+
+
+def _csv_rows(stream):
+    text = _csv_text(stream)
+    sample = text.read(8192)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    try:
+        yield from csv.reader(text, dialect)
+    finally:
+        text.detach()  # Çağıranın akışı kapatılmaz
+
+
+def _xlsx_sheets(stream):
+    from openpyxl import load_workbook
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            yield sheet.title, sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_records(filename, stream):
+    """
+    Dosyadaki kayıtları (kaynak, satır no, tür, {standart sütun: değer}) olarak
+    akış halinde üretir. Tanınmayan başlıklı sayfalar RowError ile bildirilir.
+    """
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        sheets = ((f"{filename} / {title}", rows) for title, rows in _xlsx_sheets(stream))
+    else:
+        sheets = [(filename, _csv_rows(stream))]
+
+    for source, rows in sheets:
+        kind, columns, blank = None, {}, 0
+        for row_no, row in enumerate(rows, start=1):
+            if not any(_text(v) for v in row):
+                blank += 1
+                if blank >= MAX_BLANK_ROWS and kind is not None:
+                    break  # Excel'in biçimlenmiş ama boş satırları
+                continue
+            blank = 0
+            if kind is None:
+                kind, columns = _map_header(row)
+                if kind is None:
+                    yield source, row_no, None, RowError(source, row_no, ["Başlık satırı tanınmadı"])
+                    break
+                continue
+            yield source, row_no, kind, {name: row[i] for i, name in columns.items() if i < len(row)}
+
+
+# --- Doğrulama ---
+
+def _meeting_row(record):
+    """İçe aktarma satırını meeting_table satır biçimine çevirir (gün/sıklık eşleştirilir)."""
+    day, frequency = _text(record.get("Gün")), _text(record.get("Sıklık")) or "Her Hafta"
+    start_date = _date(record.get("Başlangıç Tarihi")) or datetime.date.today()
+    end_date = _date(record.get("Bitiş Tarihi"))
+    if end_date is None and isinstance(start_date, datetime.date):
+        end_date = datetime.date(start_date.year, 12, 31)
+    attendees = _text(record.get("Katılımcılar")).replace(";", ",")
+    return {
+        "Başlık": _text(record.get("Başlık")),
+        "Gün": _DAY_LOOKUP.get(_norm(day), day),
+        "Başlangıç": _time(record.get("Başlangıç")),
+        "Bitiş": _time(record.get("Bitiş")),
+        "Sıklık": _FREQUENCY_LOOKUP.get(_norm(frequency), frequency),
+        "Katılımcılar": attendees,
+        "Başlangıç Tarihi": start_date,
+        "Bitiş Tarihi": end_date,
+    }
+
+
+def _content(meeting):
+    """Kimlik dışındaki içerik (aynı toplantının tekrar içe aktarılmasını tanımak için)."""
+    return tuple(sorted((k, str(v)) for k, v in meeting.items() if k != 'id'))
+
+
+def import_files(data, files, skip_invalid=False):
+    """
+    files: [(dosya adı, ikili akış)]. Kayıtları data'ya ekler (yerinde) ve
+    ImportResult döndürür. Hatalı satır varsa ve skip_invalid değilse data
+    değiştirilmez. Mevcut kişiler, aynı içerikli toplantılar ve aynı tatiller
+    atlanır (skipped).
+    """
+    from storage import new_meeting_id
+
+    people = []
+    meetings = []   # (kaynak, satır, satır sözlüğü)
+    holidays = {}
+    errors = []
+    skipped = 0
+
+    known_people = {p['name'] if isinstance(p, dict) else p for p in data.get('people', [])}
+    for filename, stream in files:
+        for source, row_no, kind, record in iter_records(filename, stream):
+            if kind is None:
+                errors.append(record)
+            elif kind == KIND_PEOPLE:
+                name = _text(record.get("Ad"))
+                if not name:
+                    errors.append(RowError(source, row_no, ["Ad boş olamaz"]))
+                elif name in known_people:
+                    skipped += 1
+                else:
+                    known_people.add(name)
+                    person = {"name": name, "fullname": _text(record.get("Ad Soyad")) or name,
+                              "email": _text(record.get("E-posta"))}
+                    people.append(person)
+            elif kind == KIND_HOLIDAYS:
+                date, name = _date(record.get("Tarih")), _text(record.get("Tatil")) or "Resmi Tatil"
+                if not isinstance(date, datetime.date):
+                    errors.append(RowError(source, row_no, [f"Tarih hatalı: {date}"]))
+                elif data.get('holidays', {}).get(date.isoformat()) == name:
+                    skipped += 1
+                else:
+                    holidays[date.isoformat()] = name
+            else:
+                meetings.append((source, row_no, _meeting_row(record)))
+
+    # Katılımcılar, aynı içe aktarmadaki kişiler dahil tüm kişilere göre doğrulanır
+    existing = {_content(m) for m in data.get('meetings', [])}
+    new_meetings = []
+    for source, row_no, row in meetings:
+        meeting, row_errors = row_to_meeting(row, {}, known_people)
+        if row_errors:
+            errors.append(RowError(source, row_no, row_errors))
+            continue
+        content = _content(meeting)
+        if content in existing:
+            skipped += 1
+            continue
+        existing.add(content)
+        new_meetings.append(dict(meeting, id=new_meeting_id()))
+
+    if errors and not skip_invalid:
+        return ImportResult(0, 0, 0, skipped, errors)
+
+    data.setdefault('people', []).extend(people)
+    data.setdefault('meetings', []).extend(new_meetings)
+    if holidays:
+        merged = dict(data.get('holidays', {}))
+        merged.update(holidays)
+        data['holidays'] = dict(sorted(merged.items()))
+    return ImportResult(len(new_meetings), len(people), len(holidays), skipped, errors)
+
+
+def template_csv(kind):
+    """Tür için örnek CSV (başlık ve bir örnek satır)."""
+    examples = {
+        KIND_MEETINGS: ["Haftalık Durum", "Pazartesi", "10:00", "11:00", "Her Hafta", "Özden, Burak",
+                        datetime.date.today().isoformat(), f"{datetime.date.today().year}-12-31"],
+        KIND_PEOPLE: ["Ayşe", "Ayşe Yılmaz", "ayse@example.com"],
+        KIND_HOLIDAYS: [f"{datetime.date.today().year}-10-29", "Cumhuriyet Bayramı"],
+    }
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(list(HEADERS[kind]))
+    writer.writerow(examples[kind])
+    return buf.getvalue().encode('utf-8-sig')
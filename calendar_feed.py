@@ -0,0 +1,137 @@
+"""
+Etkileşimli takvim (streamlit_calendar) için görünür aralığa göre olay akışı.
+
+Bileşene yalnızca ekranda görünen aralığın (hafta veya ay ızgarası) olayları
+gönderilir. Olay listesi (aralık, kişi filtresi, belge sürümü) anahtarıyla
+süreç genelinde saklanır: aynı haftaya geri dönmek ya da sayfanın yeniden
+çalışması tekrar genişletme yapmaz, veri kaydedilince (doc_version artınca)
+eski listeler kullanılmaz.
+"""
+import datetime
+import threading
+from collections import OrderedDict
+
+import diagnostics
+from occurrence_index import query_occurrences
+from storage import VERSION_KEY
+
+VIEW_WEEK = "timeGridWeek"
+VIEW_MONTH = "dayGridMonth"
+
+# FullCalendar ay ızgarası her zaman 6 hafta gösterir (fixedWeekCount)
+MONTH_GRID_DAYS = 42
+
+FEED_CACHE_ENTRIES = 64
+
+# Tüm ekibin katıldığı toplantılar "All Team" rengiyle gösterilir
+ALL_TEAM = ("Özden", "Burak", "Doğukan")
+
+
+def visible_range(view, anchor):
+    """anchor gününü içeren görünümün ilk ve son günü (dahil); hafta Pazartesi başlar."""
+    if view == VIEW_MONTH:
+        first = anchor.replace(day=1)
+        start = first - datetime.timedelta(days=first.weekday())
+        return start, start + datetime.timedelta(days=MONTH_GRID_DAYS - 1)
+    start = anchor - datetime.timedelta(days=anchor.weekday())
+    return start, start + datetime.timedelta(days=6)
+
+
+def shift_anchor(view, anchor, step):
+    """Önceki (step=-1) veya sonraki (step=1) hafta/ay içindeki gün."""
+    if view == VIEW_MONTH:
+        month = anchor.year * 12 + anchor.month - 1 + step
+        return datetime.date(month // 12, month % 12 + 1, 1)
+    return anchor + datetime.timedelta(days=7 * step)
+
+
+def range_from_dates_set(payload):
+    """
+    FullCalendar datesSet bilgisinden görünen aralık (ilk gün, son gün).
+    end değeri FullCalendar'da hariçtir. Okunamazsa None.
+    """
+    try:
+        start = datetime.date.fromisoformat(str(payload['start'])[:10])
+        end = datetime.date.fromisoformat(str(payload['end'])[:10])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return start, max(start, end - datetime.timedelta(days=1))
+
+
+def _event_color(data, attendees):
+    colors = data['settings'].get('colors', {})
+    if len(attendees) == 1:
+        return colors.get(attendees[0], {}).get('bg', '#CCCCCC')
+    if set(attendees) == set(ALL_TEAM):
+        return colors.get("All Team", {}).get('bg', '#FFCCCC')
+    return "#E0E0E0"  # Karışık
+
+
+@diagnostics.timed("events")
+def build_events(data, index, start, end, person=None):
+    """start-end (dahil) aralığındaki tatil ve toplantıların FullCalendar olayları."""
+    events = []
+    start_str, end_str = start.isoformat(), end.isoformat()
+    for h_date, h_name in data.get('holidays', {}).items():
+        if start_str <= h_date <= end_str:
+            events.append({
+                "title": f"🌴 {h_name}",
+                "start": h_date,
+                "allDay": True,
+                "backgroundColor": "#FFEBEE",
+                "borderColor": "#FFCDD2",
+                "textColor": "#B71C1C",
+                "display": "background"
+            })
+
+    for occ in query_occurrences(index, data, start, end, person=person):
+        if occ.date.weekday() >= 5:  # Haftasonu
+            continue
+        m = occ.meeting
+        atts = m.get('attendees', [])
+        date_str = occ.date.isoformat()
+        events.append({
+            "id": f"{m.get('id')}-{date_str}",
+            "title": f"{m['title']} ({', '.join(atts)})",
+            "start": f"{date_str}T{m['start_time']}",
+            "end": f"{date_str}T{m['end_time']}",
+            "backgroundColor": _event_color(data, atts),
+            "borderColor": "#666666",
+            "textColor": "#000000",
+            "extendedProps": {
+                "attendees": ", ".join(atts),
+                "description": f"{m['title']} ({m['start_time']}-{m['end_time']})\nKatılımcılar: {', '.join(atts)}",
+                # Düzenleme penceresi toplantıyı kimliğiyle bulur
+                "meeting_id": m.get('id')
+            }
+        })
+    return events
+
+
+_FEED_CACHE = OrderedDict()
+_FEED_LOCK = threading.Lock()
+
+
+def events_for_range(data, index, start, end, person=None):
+    """
+    build_events'in (aralık, kişi, belge sürümü) ile saklanan sonucu.
+    Dönen liste paylaşılır, değiştirilmemelidir.
+    """
+    key = (data.get(VERSION_KEY, 0), start, end, person)
+    with _FEED_LOCK:
+        events = _FEED_CACHE.get(key)
+        if events is not None:
+            _FEED_CACHE.move_to_end(key)
+            return events
+
+    events = build_events(data, index, start, end, person=person)
+    with _FEED_LOCK:
+        _FEED_CACHE[key] = events
+        while len(_FEED_CACHE) > FEED_CACHE_ENTRIES:
+            _FEED_CACHE.popitem(last=False)
+    return events
+
+
+def clear_cache():
+    with _FEED_LOCK:
+        _FEED_CACHE.clear()
@@ -0,0 +1,70 @@
+"""
+Kişi bazlı çakışma tespiti.
+
+Her (gün, kişi) için o kişinin toplantı aralıkları başlangıca göre sıralanır ve
+bitiş zamanına göre tutulan bir heap ile taranır (sweep-line, O(n log n)).
+Aynı anda süren ve ortak katılımcısı olan iki toplantı bir Conflict kaydıdır.
+"""
+import heapq
+from collections import namedtuple
+
+from recurrence import expand
+
+# first/second: Occurrence, overlap_min: ortak dakika, people: ortak kişiler (tuple)
+Conflict = namedtuple('Conflict', ['date', 'first', 'second', 'overlap_min', 'people'])
+
+
+def conflicts_from_occurrences(occurrences, people=None):
+    """Hazır tekrar listesindeki çakışmaları tarih ve saate göre sıralı döndürür."""
+    if people is not None:
+        people = set(people)
+
+    lanes = {}
+    for occ in occurrences:
+        for person in dict.fromkeys(occ.meeting.get('attendees', [])):
+            if people is None or person in people:
+                lanes.setdefault((occ.date, person), []).append(occ)
+
+    pairs = {}
+    for (date, person), items in lanes.items():
+        if len(items) < 2:
+            continue
+        items.sort(key=lambda o: (o.start_min, o.end_min))
+        active = []  # (bitiş, sıra, occurrence)
+        for seq, occ in enumerate(items):
+            while active and active[0][0] <= occ.start_min:
+                heapq.heappop(active)
+            for _, _, other in active:
+                key = (id(other), id(occ)) if id(other) < id(occ) else (id(occ), id(other))
+                entry = pairs.get(key)
+                if entry is None:
+                    pairs[key] = entry = [other, occ, []]
+                entry[2].append(person)
+            heapq.heappush(active, (occ.end_min, seq, occ))
+
+    conflicts = []
+    for first, second, shared in pairs.values():
+        overlap = min(first.end_min, second.end_min) - max(first.start_min, second.start_min)
+        conflicts.append(Conflict(first.date, first, second, overlap, tuple(shared)))
+    conflicts.sort(key=lambda c: (c.date, c.first.start_min, c.second.start_min))
+    return conflicts
+
+
+def find_conflicts(data, start, end, people=None, occurrences=None):
+    """
+    start ve end (dahil) arasındaki kişi çakışmalarını döndürür.
+    people: Yalnızca bu kişiler için kontrol et (None = herkes)
+    occurrences: Hazır tekrar listesi (verilmezse veriden genişletilir)
+    """
+    if occurrences is None:
+        occurrences = expand(data, start, end)
+    return conflicts_from_occurrences(occurrences, people=people)
+
+
+def conflicting_occurrence_ids(conflicts):
+    """Çakışmaya giren Occurrence nesnelerinin id() kümesi (çizimde vurgu için)."""
+    ids = set()
+    for c in conflicts:
+        ids.add(id(c.first))
+        ids.add(id(c.second))
+    return ids
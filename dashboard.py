@@ -1,11 +1,15 @@
 import streamlit as st
-import json
 import os
 import datetime
-import shutil
-from generate_calendar_image import generate_calendar_pdf, get_weekly_calendar_figure, get_mixed_color
-from streamlit_calendar import calendar
-from ics import Calendar, Event
+import storage
+import diagnostics
+from occurrence_index import query_occurrences
+from conflicts import find_conflicts
+from rebase import ConcurrentEditError
+
+# Ağır bağımlılıklar (matplotlib çizimi, ICS, takvim bileşeni) yalnızca onları
+# kullanan görünümlerde içe aktarılır; giriş ekranı ve yönetim sekmeleri
+# bunların yükleme maliyetini ödemez.
 
 st.set_page_config(
     page_title="özden Toplantı Yönetim Sistemi",
@@ -55,62 +59,17 @@ def get_person_names(data):
     return people
 
 def load_data():
-    if os.path.exists(JSON_FILE):
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            # Eksik alanları tamamla (Şema Göçü)
-            if 'holidays' not in data:
-                data['holidays'] = {} # YYYY-MM-DD: İsim formatında
-            elif isinstance(data['holidays'], list):
-                # Eski liste formatını sözlüğe çevir
-                data['holidays'] = {h: "Resmi Tatil" for h in data['holidays']}
-                
-            if 'exceptions' not in data:
-                data['exceptions'] = [] # {"date": "YYYY-MM-DD", "meeting_title": "..."}
-
-            # People Schema Migration (String -> Object)
-            if 'people' in data and len(data['people']) > 0 and isinstance(data['people'][0], str):
-                new_people = []
-                for p in data['people']:
-                    new_people.append({
-                        "name": p,
-                        "fullname": p,
-                        "email": ""
-                    })
-                data['people'] = new_people
-
-            # Meetings Schema Migration (Add missing dates)
-            if 'meetings' in data:
-                for m in data['meetings']:
-                    if 'start_date' not in m:
-                        m['start_date'] = "2026-01-01"
-                    if 'end_date' not in m:
-                        m['end_date'] = "2026-12-31"
-                
-            return data
-    return {"settings": {}, "people": [], "meetings": [], "holidays": {}, "exceptions": []}
+    return storage.load_data(JSON_FILE)
 
 def save_data(data):
-    # 1. Yedekleme
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
-    
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = os.path.join(BACKUP_DIR, f"calendar_data_{timestamp}.json")
-    
-    # Mevcut dosyayı yedekle
-    if os.path.exists(JSON_FILE):
-        shutil.copy2(JSON_FILE, backup_path)
-    
-    # Eski yedekleri temizle (Son 10)
-    backups = sorted([os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.endswith('.json')])
-    while len(backups) > 10:
-        os.remove(backups.pop(0))
-
-    # 2. Kaydetme
-    with open(JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # JSON motorunda yedek alınır ve tekrar indeksi güncellenir (storage.py).
+    # Başka bir oturum bu arada kaydettiyse değişiklikler onun üzerine uygulanır;
+    # aynı kayıt iki tarafta farklı değiştirildiyse kayıt yapılmaz.
+    try:
+        return storage.save_data(data, JSON_FILE, BACKUP_DIR)
+    except ConcurrentEditError as e:
+        st.error(f"⚠️ Değişiklikleriniz kaydedilemedi: {e} Sayfayı yenileyip tekrar deneyin.")
+        st.stop()
 
 def validate_time(t):
     try:
@@ -120,10 +79,13 @@ def validate_time(t):
         return False
 
 @st.dialog("✏️ Toplantı Düzenle")
-def edit_meeting_dialog(m_idx):
-    # Veriyi tekrar yükle ki güncel kalsın
-    # Ancak burada global data'yı kullanıyoruz, st.rerun() ile güncellenecek
-    if m_idx is not None and isinstance(m_idx, int) and 0 <= m_idx < len(data['meetings']):
+def edit_meeting_dialog(meeting_id):
+    # Toplantı listedeki sırasıyla değil kimliğiyle bulunur: başka bir oturum
+    # araya toplantı ekleyip silse de doğru kayıt düzenlenir
+    m_idx = meeting_positions.get(meeting_id)
+    if m_idx is None:
+        st.warning("Toplantı bulunamadı; başka bir oturumda silinmiş olabilir.")
+    else:
         m = data['meetings'][m_idx]
         
         with st.form(key="dialog_edit_form"):
@@ -159,16 +121,19 @@ def edit_meeting_dialog(m_idx):
             c1, c2 = st.columns([1, 4])
             with c1:
                 if st.form_submit_button("💾 Kaydet", type="primary"):
-                    data['meetings'][m_idx] = {
-                        "title": new_title,
-                        "day": new_day,
-                        "start_time": new_start,
-                        "end_time": new_end,
-                        "attendees": new_attendees,
-                        "frequency": new_freq,
-                        "start_date": new_start_date.strftime("%Y-%m-%d"),
-                        "end_date": new_end_date.strftime("%Y-%m-%d")
-                    }
+                    # Formda olmayan alanlar (ör. içe aktarmadan gelen ics_uid) korunur
+                    data['meetings'][m_idx] = dict(
+                        m,
+                        id=meeting_id,
+                        title=new_title,
+                        day=new_day,
+                        start_time=new_start,
+                        end_time=new_end,
+                        attendees=new_attendees,
+                        frequency=new_freq,
+                        start_date=new_start_date.strftime("%Y-%m-%d"),
+                        end_date=new_end_date.strftime("%Y-%m-%d"),
+                    )
                     save_data(data)
                     st.success("Güncellendi!")
                     st.rerun()
@@ -180,6 +145,18 @@ def edit_meeting_dialog(m_idx):
                     st.warning("Silindi!")
                     st.rerun()
 
+# --- Tanılama (gizli yönetici sekmesi) ---
+# TAKVIM_DIAGNOSTICS=1 ortam değişkeni veya ?diag=1 adresiyle açılır. Kapalıyken
+# ölçüm noktaları (diagnostics.span/timed) hiçbir şey kaydetmez.
+DIAGNOSTICS = os.environ.get("TAKVIM_DIAGNOSTICS") == "1" or st.query_params.get("diag") == "1"
+DIAGNOSTICS_MENU = "🩺 Tanılama"
+if DIAGNOSTICS:
+    # st.rerun/st.stop ile yarıda kalan önceki çalıştırma da geçmişe yazılır
+    pending_run = st.session_state.pop("diag_run", None)
+    if pending_run is not None:
+        diagnostics.end_run(pending_run, interrupted=True)
+    st.session_state["diag_run"] = diagnostics.start_run()
+
 # --- Sayfa Yapısı ---
 
 st.title("📅 BA Toplantı Yönetim Sistemi")
@@ -190,10 +167,20 @@ if 'settings' not in data:
     st.error("Veri dosyası bozuk veya okunamadı!")
     st.stop()
 
+# Toplantı kimliği -> listedeki sıra
+meeting_positions = storage.meeting_index(data)
+
+# Tekrar İndeksi (JSON: dosya dışarıdan değiştiyse yalnızca farklar yeniden hesaplanır,
+# SQLite: sorgular doğrudan veritabanında daraltılır)
+occ_index = storage.open_index(data, JSON_FILE)
+
 # --- Top Navigation ---
 menu_options = ["Web Takvimi", "Raporlar", "Takvim Yönetimi", "Kullanıcılar", "Ayarlar & Tatiller"]
+if DIAGNOSTICS:
+    menu_options.append(DIAGNOSTICS_MENU)
 # Menüyü yatay olarak en üste koyuyoruz
 menu = st.radio("Ana Menü", menu_options, index=0, horizontal=True, label_visibility="collapsed")
+diagnostics.set_label(menu)
 st.markdown("---")
 
 # --- 1. WEB TAKVİMİ ---
@@ -207,214 +194,64 @@ if menu == "Web Takvimi":
             people_list = ["Tümü"] + people_names
             selected_person = st.selectbox("Kimin Takvimi?", people_list, key="web_cal_person")
         with c2:
-            view_mode = st.selectbox("Görünüm", ["Haftalık (Etkileşimli)", "Aylık (Etkileşimli)", "Klasik (Resim)"])
+            view_mode = st.selectbox("Görünüm", ["Haftalık (Etkileşimli)", "Aylık (Etkileşimli)", "Klasik (Resim)",
+                                                 "Aylık (Resim)", "Yıl / Çeyrek Özeti"])
         with c3:
             st.write("") # Hizalama için boşluk
-            if st.button("📅 Outlook ICS İndir (Bu Hafta)"):
-                c = Calendar()
-                today = datetime.date.today()
-                
-                # Sadece bu haftanın Pazartesi - Cuma arası
-                start_week = today - datetime.timedelta(days=today.weekday())
-                end_week = start_week + datetime.timedelta(days=4)
-                
-                start_range = start_week
-                end_range = end_week
-                
-                st.info(f"{start_range} - {end_range} aralığı için ICS hazırlanıyor...")
-                
-                # Kişi Haritası (Email için)
-                person_map = {}
-                for p in data.get('people', []):
-                    if isinstance(p, dict):
-                        person_map[p['name']] = p
-                
-                # Tatiller
-                for h_date_str, h_name in data.get('holidays', {}).items():
-                    try:
-                        e = Event()
-                        e.name = f"Tatil: {h_name}"
-                        e.begin = h_date_str
-                        e.make_all_day()
-                        c.events.add(e)
-                    except:
-                        pass
-                
-                # Toplantılar
-                day_count = (end_range - start_range).days
-                count = 0
-                
-                for i in range(day_count + 1):
-                    curr = start_range + datetime.timedelta(days=i)
-                    
-                    # Haftasonu Kontrolü (Haftasonları atla)
-                    if curr.weekday() >= 5: continue
-                    
-                    day_str = TR_DAYS[curr.weekday()]
-                    d_str = curr.strftime("%Y-%m-%d")
-                    
-                    # Tatil Kontrolü
-                    if d_str in data.get('holidays', {}): continue
-                    
-                    for m in data['meetings']:
-                        if m['day'] != day_str: continue
-                        
-                        try:
-                            m_start_date = datetime.datetime.strptime(m.get('start_date', '2026-01-01'), "%Y-%m-%d").date()
-                            m_end_date = datetime.datetime.strptime(m.get('end_date', '2026-12-31'), "%Y-%m-%d").date()
-                        except (ValueError, TypeError):
-                             m_start_date = datetime.date(2026, 1, 1)
-                             m_end_date = datetime.date(2026, 12, 31)
-                        
-                        if not (m_start_date <= curr <= m_end_date): continue
-                        
-                        # Sıklık
-                        show = False
-                        if m['frequency'] == "Her Hafta": show = True
-                        elif m['frequency'] == "İki Haftada Bir":
-                            if ((curr - m_start_date).days // 7) % 2 == 0: show = True
-                        elif m['frequency'] == "Tek Seferlik":
-                            if curr == m_start_date: show = True
-                        
-                        if show:
-                            try:
-                                e = Event()
-                                e.name = m['title']
-                                
-                                # Zaman
-                                s_dt = datetime.datetime.combine(curr, datetime.datetime.strptime(m['start_time'], "%H:%M").time())
-                                e_dt = datetime.datetime.combine(curr, datetime.datetime.strptime(m['end_time'], "%H:%M").time())
-                                e.begin = s_dt
-                                e.end = e_dt
-                                
-                                atts = m.get('attendees', [])
-                                desc = f"Toplantı: {m['title']}\nKatılımcılar: {', '.join(atts)}"
-                                e.description = desc
-                                
-                                c.events.add(e)
-                                count += 1
-                            except Exception as err:
-                                print(f"Hata: {err}")
-                                continue
-
-                st.download_button("📥 İndir (.ics)", c.serialize(), file_name="takvim.ics", mime="text/calendar")
+            # Outlook / Google Takvim dışa aktarımı: her toplantı serisi tek VEVENT (RRULE + EXDATE)
+            today = datetime.date.today()
+            week_start = today - datetime.timedelta(days=today.weekday())
+            ics_range = st.date_input("ICS Aralığı", (week_start, week_start + datetime.timedelta(days=4)),
+                                      format="DD.MM.YYYY", key="ics_range")
+            if isinstance(ics_range, (tuple, list)) and len(ics_range) == 2:
+                from ics_export import ics_for_range
+                ics_person = None if selected_person == "Tümü" else selected_person
+                suffix = f"_{ics_person}" if ics_person else ""
+                # Çakışma notlu ICS belge sürümüyle önbellekte: her yeniden çalıştırmada üretilmez
+                st.download_button("📅 Outlook ICS İndir", ics_for_range(data, ics_range[0], ics_range[1], person=ics_person),
+                                   file_name=f"takvim{suffix}_{ics_range[0]:%Y%m%d}_{ics_range[1]:%Y%m%d}.ics",
+                                   mime="text/calendar")
+            # Abonelik adresi (feed_server.py çalışıyorsa): Outlook > Takvim ekle > İnternetten abone ol
+            feed_base = os.environ.get("TAKVIM_FEED_URL", "").rstrip("/")
+            if feed_base:
+                from urllib.parse import quote
+                feed_name = "all" if selected_person == "Tümü" else selected_person
+                st.caption(f"Abonelik: {feed_base}/feeds/{quote(feed_name)}.ics")
             
     # Takvim Alanı (Genişletilmiş)
     if "Etkileşimli" in view_mode:
         # Streamlit Calendar Implementation
-        calendar_events = []
-        
-        # Tatilleri Ekle
-        holidays = data.get('holidays', {})
-        for h_date, h_name in holidays.items():
-            calendar_events.append({
-                "title": f"🌴 {h_name}",
-                "start": h_date,
-                "allDay": True,
-                "backgroundColor": "#FFEBEE",
-                "borderColor": "#FFCDD2",
-                "textColor": "#B71C1C",
-                "display": "background"
-            })
-
-        # Toplantıları Ekle
-        # 3 Aylık bir pencere için hesaplayalım (Performans için)
-        base_date = datetime.date.today()
-        calc_start = base_date - datetime.timedelta(days=30)
-        calc_end = base_date + datetime.timedelta(days=90)
-        
-        day_count = (calc_end - calc_start).days
-        
-        for i in range(day_count + 1):
-            curr_date = calc_start + datetime.timedelta(days=i)
-            
-            if curr_date.weekday() >= 5: # Haftasonu
-                continue
-
-            day_str = TR_DAYS[curr_date.weekday()]
-            date_str = curr_date.strftime("%Y-%m-%d")
-            
-            # Tatil kontrolü
-            if date_str in holidays:
-                continue
-            
-            # O günün toplantılarını bul
-            for m in data['meetings']:
-                # Filtreleme
-                if selected_person != "Tümü" and selected_person not in m.get('attendees', []):
-                    continue
-                    
-                # Gün kontrolü
-                if m['day'] != day_str:
-                    continue
-                    
-                # Tarih aralığı kontrolü
-                try:
-                    m_start_date = datetime.datetime.strptime(m.get('start_date', '2026-01-01'), "%Y-%m-%d").date()
-                    m_end_date = datetime.datetime.strptime(m.get('end_date', '2026-12-31'), "%Y-%m-%d").date()
-                except (ValueError, TypeError):
-                     # Eğer tarih formatı bozuksa varsayılan ata
-                     m_start_date = datetime.date(2026, 1, 1)
-                     m_end_date = datetime.date(2026, 12, 31)
-                
-                if not (m_start_date <= curr_date <= m_end_date):
-                    continue
-                    
-                # Sıklık Kontrolü
-                show = False
-                if m['frequency'] == "Her Hafta":
-                    show = True
-                elif m['frequency'] == "İki Haftada Bir":
-                    weeks_diff = (curr_date - m_start_date).days // 7
-                    if weeks_diff % 2 == 0:
-                        show = True
-                elif m['frequency'] == "Tek Seferlik":
-                    if curr_date == m_start_date:
-                        show = True
-                elif m['frequency'] == "Aylık":
-                    pass 
-                
-                if show:
-                    # Renk
-                    atts = m.get('attendees', [])
-                    if len(atts) == 1:
-                        color = data['settings']['colors'].get(atts[0], {}).get('bg', '#CCCCCC')
-                    elif set(atts) == set(["Özden", "Burak", "Doğukan"]): # Tüm Ekip (Hardcoded logic from json)
-                        color = data['settings']['colors'].get("All Team", {}).get('bg', '#FFCCCC')
-                    else:
-                        color = "#E0E0E0" # Mixed
-                    
-                    # Başlıkta Katılımcıları Göster
-                    display_title = f"{m['title']} ({', '.join(atts)})"
-                    
-                    # Meeting indexini bul
-                    try:
-                         m_idx = data['meetings'].index(m)
-                    except ValueError:
-                         m_idx = -1
-
-                    calendar_events.append({
-                        "title": display_title,
-                        "start": f"{date_str}T{m['start_time']}",
-                        "end": f"{date_str}T{m['end_time']}",
-                        "backgroundColor": color,
-                        "borderColor": "#666666",
-                        "textColor": "#000000",
-                        "extendedProps": {
-                            "attendees": ", ".join(atts),
-                            "description": f"{m['title']} ({m['start_time']}-{m['end_time']})\nKatılımcılar: {', '.join(atts)}",
-                            "meeting_idx": m_idx
-                        }
-                    })
-
-        mode = "timeGridWeek" if "Haftalık" in view_mode else "dayGridMonth"
+        # Yalnızca görünen hafta/ay ızgarasının olayları hesaplanıp gönderilir;
+        # gezinme ile aralık değişir (sınırsız ileri/geri).
+        import calendar_feed
+        mode = calendar_feed.VIEW_WEEK if "Haftalık" in view_mode else calendar_feed.VIEW_MONTH
+        if "web_cal_anchor" not in st.session_state:
+            st.session_state["web_cal_anchor"] = datetime.date.today()
+
+        def _shift_calendar(step):
+            if step:
+                st.session_state["web_cal_anchor"] = calendar_feed.shift_anchor(mode, st.session_state["web_cal_anchor"], step)
+            else:
+                st.session_state["web_cal_anchor"] = datetime.date.today()
+
+        nav1, nav2, nav3, _ = st.columns([1, 1, 1, 5])
+        nav1.button("◀ Önceki", on_click=_shift_calendar, args=(-1,), use_container_width=True)
+        nav2.button("Bugün", on_click=_shift_calendar, args=(0,), use_container_width=True)
+        nav3.button("Sonraki ▶", on_click=_shift_calendar, args=(1,), use_container_width=True)
+
+        anchor = st.session_state["web_cal_anchor"]
+        calc_start, calc_end = calendar_feed.visible_range(mode, anchor)
+        filter_person = None if selected_person == "Tümü" else selected_person
+        calendar_events = calendar_feed.events_for_range(data, occ_index, calc_start, calc_end, person=filter_person)
         
         calendar_options = {
             "initialView": mode,
+            "initialDate": anchor.isoformat(),
+            # Gezinme yukarıdaki düğmelerle yapılır (olaylar görünen aralık için hesaplanır)
             "headerToolbar": {
-                "left": "prev,next today",
+                "left": "",
                 "center": "title",
-                "right": "dayGridMonth,timeGridWeek,timeGridDay"
+                "right": ""
             },
             "slotMinTime": "08:00:00",
             "slotMaxTime": "17:30:00", # Kullanıcı isteği: 17:30
@@ -432,23 +269,62 @@ if menu == "Web Takvimi":
             .fc-event:hover::after { content: attr(title); position: absolute; z-index: 100; background: black; color: white; padding: 5px; border-radius: 4px; }
         """
         
-        cal_component = calendar(events=calendar_events, options=calendar_options, custom_css=custom_css, key="cal_main")
+        from streamlit_calendar import calendar
+        # Anahtar görünen aralığa bağlı: gezinmede bileşen yeni initialDate ile açılır
+        with diagnostics.span("calendar_component"):
+            cal_component = calendar(events=calendar_events, options=calendar_options, custom_css=custom_css,
+                                     callbacks=["datesSet", "eventClick"], key=f"cal_main_{mode}_{calc_start.isoformat()}")
+        
+        if cal_component and cal_component.get("callback") == "datesSet":
+            # datesSet destekleyen bileşen sürümlerinde takvimin kendi gezinmesi de izlenir
+            shown = calendar_feed.range_from_dates_set(cal_component.get("datesSet", {}))
+            if shown and not (calc_start <= shown[0] <= calc_end):
+                st.session_state["web_cal_anchor"] = shown[0] + (shown[1] - shown[0]) / 2
+                st.rerun()
         
         if cal_component and "eventClick" in cal_component:
             event_data = cal_component["eventClick"]["event"]
             props = event_data.get("extendedProps", {})
-            m_idx = props.get("meeting_idx")
+            meeting_id = props.get("meeting_id")
             
-            if m_idx is not None:
-                edit_meeting_dialog(m_idx)
+            if meeting_id:
+                edit_meeting_dialog(meeting_id)
         
+    elif view_mode == "Aylık (Resim)":
+        # Gün ve kişi başına sayılar ayın tek bir genişletmesinden gelir (month_model)
+        month_date = st.date_input("Ay", datetime.date.today(), format="DD.MM.YYYY", key="web_cal_month")
+        with st.spinner('Takvim hazırlanıyor...'):
+            from generate_calendar_image import render_month_page
+            filter_person = None if selected_person == "Tümü" else selected_person
+            image = render_month_page(data, month_date.year, month_date.month, fmt='png', dpi=100, user_filter=filter_person)
+            with diagnostics.span("st.image"):
+                st.image(image, use_container_width=True)
+
+    elif view_mode == "Yıl / Çeyrek Özeti":
+        # 12 (veya 3) mini ay, gün yoğunluğu renkle; matplotlib'siz vektör çizim
+        from month_model import QUARTERS
+        from vector_render import render_overview_svg
+        o1, o2, _ = st.columns([1, 1, 4])
+        overview_year = o1.number_input("Yıl", min_value=2000, max_value=2100, value=datetime.date.today().year,
+                                        key="overview_year")
+        overview_quarter = o2.selectbox("Dönem", (None,) + QUARTERS, key="overview_quarter",
+                                        format_func=lambda q: "Tüm Yıl" if q is None else f"{q}. Çeyrek")
+        filter_person = None if selected_person == "Tümü" else selected_person
+        svg = render_overview_svg(data, int(overview_year), quarter=overview_quarter, user_filter=filter_person)
+        with diagnostics.span("st.image"):
+            st.image(svg, use_container_width=True)
+
     else:
         # Klasik Görünüm
         start_date = st.date_input("Hafta Başlangıç Tarihi", datetime.date.today(), key="web_cal_date")
         with st.spinner('Takvim hazırlanıyor...'):
+            from generate_calendar_image import get_weekly_calendar_image
             filter_person = None if selected_person == "Tümü" else selected_person
-            fig = get_weekly_calendar_figure(data=data, start_date=start_date, user_filter=filter_person)
-            st.pyplot(fig)
+            week_start = start_date - datetime.timedelta(days=start_date.weekday())
+            week_occurrences = query_occurrences(occ_index, data, week_start, week_start + datetime.timedelta(days=6), person=filter_person)
+            image = get_weekly_calendar_image(data=data, start_date=start_date, user_filter=filter_person, occurrences=week_occurrences)
+            with diagnostics.span("st.image"):
+                st.image(image, use_container_width=True)
 
 # --- 2. RAPORLAR ---
 elif menu == "Raporlar":
@@ -459,12 +335,17 @@ elif menu == "Raporlar":
     selected_person = st.selectbox("Kimin Takvimi?", people_list)
     
     start_date = st.date_input("Başlangıç Tarihi", datetime.date.today())
+    fast_render = st.checkbox("⚡ Hızlı vektör çizim (matplotlib'siz)", value=False,
+                              help="Sayfaları doğrudan PDF olarak yazar; çok sayıda hafta/kişi için çok daha hızlıdır.")
+    backend = "vector" if fast_render else "matplotlib"
     
     if st.button("PDF Oluştur", type="primary"):
         with st.spinner('PDF hazırlanıyor...'):
             try:
+                from generate_calendar_image import generate_calendar_pdf
                 filter_person = None if selected_person == "Tümü" else selected_person
-                output_file = generate_calendar_pdf(data=data, start_date=start_date, user_filter=filter_person)
+                output_file = generate_calendar_pdf(data=data, start_date=start_date, user_filter=filter_person,
+                                                    backend=backend)
                 
                 st.success(f"Başarılı! Dosya oluşturuldu: {output_file}")
                 
@@ -479,66 +360,130 @@ elif menu == "Raporlar":
             except Exception as e:
                 st.error(f"Hata oluştu: {e}")
 
+    st.markdown("---")
+    st.subheader("🗓️ Yıl / Çeyrek Özeti")
+    st.write("Seçilen yılın 12 ayını (veya bir çeyreğini) tek sayfada, gün yoğunluğuyla gösteren PDF.")
+    from month_model import QUARTERS
+    r1, r2 = st.columns(2)
+    report_year = r1.number_input("Yıl", min_value=2000, max_value=2100, value=start_date.year, key="report_year")
+    report_quarter = r2.selectbox("Dönem", (None,) + QUARTERS, key="report_quarter",
+                                  format_func=lambda q: "Tüm Yıl" if q is None else f"{q}. Çeyrek")
+    if st.button("Özet PDF Oluştur"):
+        import io
+        from vector_render import render_overview_pdf
+        filter_person = None if selected_person == "Tümü" else selected_person
+        buf = io.BytesIO()
+        render_overview_pdf(data, [(int(report_year), report_quarter)], buf, user_filter=filter_person)
+        suffix = f"_Q{report_quarter}" if report_quarter else ""
+        person_suffix = f"_{filter_person}" if filter_person else ""
+        st.download_button(label="📥 Özet PDF İndir",
+                           data=buf.getvalue(),
+                           file_name=f"takvim_ozet_{int(report_year)}{suffix}{person_suffix}.pdf",
+                           mime='application/pdf')
+
+    st.markdown("---")
+    st.subheader("📦 Ekip Paketi")
+    st.write("Her kişi ve 'Tümü' için haftalık PDF'leri tek seferde üretip ZIP olarak indirir.")
+    pack_weeks = st.number_input("Hafta Sayısı", min_value=1, max_value=52, value=4, key="pack_weeks")
+    
+    if st.button("Tüm Ekip Paketi Oluştur (ZIP)"):
+        with st.spinner('Paket hazırlanıyor...'):
+            try:
+                from generate_calendar_image import generate_team_pdf_zip
+                # Çok sayfalı tek iş: sayfalar CPU sayısı kadar süreçte çizilir (tek PDF düğmesi sıralı kalır)
+                zip_bytes = generate_team_pdf_zip(data, start_date=start_date, weeks=int(pack_weeks), backend=backend,
+                                                  jobs=os.cpu_count() or 1)
+                st.download_button(label="📥 ZIP İndir",
+                                   data=zip_bytes,
+                                   file_name=f"takvim_paketi_{start_date.strftime('%Y%m%d')}.zip",
+                                   mime='application/zip')
+            except Exception as e:
+                st.error(f"Hata oluştu: {e}")
+
 # --- 3. TAKVİM YÖNETİMİ ---
 elif menu == "Takvim Yönetimi":
     st.header("📝 Toplantı Yönetimi")
     
-    tab1, tab2 = st.tabs(["Toplantı Listesi & Düzenle", "Yeni Toplantı Ekle"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Toplantı Listesi & Düzenle", "Yeni Toplantı Ekle", "⚠️ Çakışmalar", "📥 Toplu İçe Aktar"])
     
     with tab1:
         if not data['meetings']:
             st.info("Henüz hiç toplantı yok.")
         else:
-            for i, m in enumerate(data['meetings']):
-                with st.expander(f"{m['title']} ({m['day']} {m['start_time']}-{m['end_time']})"):
-                    with st.form(key=f"edit_form_{i}"):
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            new_title = st.text_input("Başlık", m['title'])
-                            new_day = st.selectbox("Gün", TR_DAYS, index=TR_DAYS.index(m['day']) if m['day'] in TR_DAYS else 0)
-                            new_freq = st.selectbox("Sıklık", 
-                                                  ["Tek Seferlik", "Her Hafta", "İki Haftada Bir", "Aylık", "Aylık (Son Pazartesi)"],
-                                                  index=["Tek Seferlik", "Her Hafta", "İki Haftada Bir", "Aylık", "Aylık (Son Pazartesi)"].index(m['frequency']) if m['frequency'] in ["Tek Seferlik", "Her Hafta", "İki Haftada Bir", "Aylık", "Aylık (Son Pazartesi)"] else 0)
-                        
-                        with col2:
-                            new_start = st.text_input("Başlangıç (HH:MM)", m['start_time'])
-                            new_end = st.text_input("Bitiş (HH:MM)", m['end_time'])
-                            new_attendees = st.multiselect("Katılımcılar", data['people'], default=[p for p in m['attendees'] if p in data['people']])
-                        
-                        new_start_date = st.date_input("Başlangıç Tarihi", datetime.datetime.strptime(m.get('start_date', '2026-01-01'), "%Y-%m-%d").date())
-                        new_end_date = st.date_input("Bitiş Tarihi (Opsiyonel)", datetime.datetime.strptime(m.get('end_date', '2026-12-31'), "%Y-%m-%d").date())
-
-                        c1, c2 = st.columns([1, 4])
-                        with c1:
-                            submitted = st.form_submit_button("Kaydet", type="primary")
-                        with c2:
-                            delete_btn = st.form_submit_button("Sil", type="secondary")
-                        
-                        if submitted:
-                            if not validate_time(new_start) or not validate_time(new_end):
-                                st.error("Saat formatı hatalı! (HH:MM)")
-                            elif new_end <= new_start:
-                                st.error("Bitiş saati başlangıçtan büyük olmalı!")
-                            else:
-                                data['meetings'][i] = {
-                                    "title": new_title,
-                                    "day": new_day,
-                                    "start_time": new_start,
-                                    "end_time": new_end,
-                                    "frequency": new_freq,
-                                    "attendees": new_attendees,
-                                    "start_date": new_start_date.strftime("%Y-%m-%d"),
-                                    "end_date": new_end_date.strftime("%Y-%m-%d")
-                                }
-                                save_data(data)
-                                st.success("Toplantı güncellendi!")
-                                st.rerun()
-                        
-                        if delete_btn:
-                            data['meetings'].pop(i)
-                            save_data(data)
-                            st.warning("Toplantı silindi!")
-                            st.rerun()
+            # Filtreler sunucuda uygulanır; tabloya yalnızca geçerli sayfa gönderilir
+            import pandas as pd
+            import meeting_table
+            people_names = get_person_names(data)
+
+            f1, f2, f3, f4 = st.columns([2, 1, 1, 1])
+            search = f1.text_input("🔍 Başlıkta ara", key="mt_search")
+            day_filter = f2.selectbox("Gün", ["Tümü"] + meeting_table.DAYS, key="mt_day")
+            person_filter = f3.selectbox("Katılımcı", ["Tümü"] + people_names, key="mt_person")
+            freq_filter = f4.selectbox("Sıklık", ["Tümü"] + meeting_table.FREQUENCIES, key="mt_freq")
+
+            filtered = meeting_table.filter_meetings(
+                data['meetings'], search,
+                day=None if day_filter == "Tümü" else day_filter,
+                person=None if person_filter == "Tümü" else person_filter,
+                frequency=None if freq_filter == "Tümü" else freq_filter)
+
+            p1, p2, p3 = st.columns([1, 1, 3])
+            page_size = p1.selectbox("Sayfa başına", meeting_table.PAGE_SIZES, key="mt_page_size")
+            pages = meeting_table.page_count(len(filtered), page_size)
+            if st.session_state.get("mt_page", 1) > pages:
+                st.session_state["mt_page"] = pages  # Filtre daralınca son sayfaya
+            page = p2.number_input(f"Sayfa (/{pages})", min_value=1, max_value=pages, value=1, step=1, key="mt_page")
+            p3.caption(f"{len(filtered)} / {len(data['meetings'])} toplantı. "
+                       "Değişiklikler sayfa veya filtre değiştirilmeden önce kaydedilmelidir.")
+
+            page_meetings = meeting_table.paginate(filtered, int(page), page_size)
+            if not page_meetings:
+                st.info("Filtreye uyan toplantı yok.")
+            else:
+                multiselect = getattr(st.column_config, "MultiselectColumn", None)
+                if multiselect is not None:
+                    attendees_column = multiselect("Katılımcılar", options=people_names)
+                else:
+                    # Eski Streamlit sürümleri: katılımcılar virgülle ayrılmış metin
+                    attendees_column = st.column_config.TextColumn("Katılımcılar", help="Virgülle ayırın")
+
+                rows = meeting_table.to_rows(page_meetings, attendees_as_list=multiselect is not None)
+                frame = pd.DataFrame(rows).set_index(meeting_table.ID_COLUMN)
+                # Anahtar sayfa içeriğine bağlı: başka sayfaya geçince yarım düzenlemeler taşınmaz
+                grid_key = f"mt_grid_{data.get(storage.VERSION_KEY, 0)}_{page_meetings[0]['id']}_{len(page_meetings)}"
+                edited = st.data_editor(
+                    frame,
+                    key=grid_key,
+                    hide_index=True,
+                    num_rows="fixed",
+                    use_container_width=True,
+                    column_config={
+                        meeting_table.DELETE_COLUMN: st.column_config.CheckboxColumn("Sil", help="Kaydedince silinir"),
+                        "Başlık": st.column_config.TextColumn("Başlık", required=True),
+                        "Gün": st.column_config.SelectboxColumn("Gün", options=meeting_table.DAYS, required=True),
+                        "Başlangıç": st.column_config.TextColumn("Başlangıç", validate=r"^\d{2}:\d{2}$"),
+                        "Bitiş": st.column_config.TextColumn("Bitiş", validate=r"^\d{2}:\d{2}$"),
+                        "Sıklık": st.column_config.SelectboxColumn("Sıklık", options=meeting_table.FREQUENCIES, required=True),
+                        "Katılımcılar": attendees_column,
+                        "Başlangıç Tarihi": st.column_config.DateColumn("Başlangıç Tarihi", format="YYYY-MM-DD"),
+                        "Bitiş Tarihi": st.column_config.DateColumn("Bitiş Tarihi", format="YYYY-MM-DD"),
+                    },
+                )
+
+                if st.button("💾 Değişiklikleri Kaydet", type="primary", key="mt_save"):
+                    updated, deleted, errors = meeting_table.apply_edits(
+                        data, edited.reset_index().to_dict('records'), people_names)
+                    if errors:
+                        st.error("Değişiklikler kaydedilmedi; hatalı satırları düzeltin:")
+                        for title, row_errors in errors.items():
+                            st.write(f"- **{title}**: {'; '.join(row_errors)}")
+                    elif updated or deleted:
+                        # Tüm satır değişiklikleri tek kayıtta yazılır
+                        save_data(data)
+                        st.success(f"{updated} toplantı güncellendi, {deleted} toplantı silindi.")
+                        st.rerun()
+                    else:
+                        st.info("Değişiklik yok.")
 
     with tab2:
         st.subheader("Yeni Toplantı")
@@ -567,6 +512,7 @@ elif menu == "Takvim Yönetimi":
                     st.error("Bitiş saati başlangıçtan büyük olmalı.")
                 else:
                     new_meeting = {
+                        "id": storage.new_meeting_id(),
                         "title": title,
                         "day": day,
                         "start_time": s_time,
@@ -581,6 +527,93 @@ elif menu == "Takvim Yönetimi":
                     st.success("Toplantı eklendi!")
                     st.rerun()
 
+    with tab3:
+        st.subheader("Kişi Bazlı Çakışmalar")
+        c1, c2, c3 = st.columns([1, 1, 1])
+        with c1:
+            conf_start = st.date_input("Başlangıç", datetime.date.today(), key="conf_start")
+        with c2:
+            conf_end = st.date_input("Bitiş", datetime.date.today() + datetime.timedelta(days=90), key="conf_end")
+        with c3:
+            conf_people = st.multiselect("Kişiler (boş = herkes)", get_person_names(data), key="conf_people")
+        
+        if conf_end < conf_start:
+            st.error("Bitiş tarihi başlangıçtan önce olamaz.")
+        else:
+            range_occurrences = query_occurrences(occ_index, data, conf_start, conf_end)
+            conflicts = find_conflicts(data, conf_start, conf_end, people=conf_people or None, occurrences=range_occurrences)
+            if not conflicts:
+                st.success("Seçilen aralıkta çakışma yok.")
+            else:
+                st.warning(f"{len(conflicts)} çakışma bulundu.")
+                st.dataframe([{
+                    "Tarih": conf.date.strftime("%Y-%m-%d"),
+                    "Gün": TR_DAYS[conf.date.weekday()],
+                    "Toplantı 1": f"{conf.first.meeting['title']} ({conf.first.meeting['start_time']}-{conf.first.meeting['end_time']})",
+                    "Toplantı 2": f"{conf.second.meeting['title']} ({conf.second.meeting['start_time']}-{conf.second.meeting['end_time']})",
+                    "Ortak Süre (dk)": conf.overlap_min,
+                    "Ortak Kişiler": ", ".join(conf.people)
+                } for conf in conflicts], use_container_width=True, hide_index=True)
+
+    with tab4:
+        st.subheader("CSV / Excel'den Toplu İçe Aktarma")
+        st.write("Toplantılar, kişiler ve tatiller tek seferde eklenir. Her dosyanın (Excel'de her sayfanın) "
+                 "türü başlık satırından anlaşılır; kişiler aynı içe aktarmadaki toplantılarda kullanılabilir.")
+        import bulk_import
+        t1, t2, t3 = st.columns(3)
+        t1.download_button("📄 Toplantı şablonu", bulk_import.template_csv(bulk_import.KIND_MEETINGS),
+                           file_name="toplantilar.csv", mime="text/csv")
+        t2.download_button("📄 Kişi şablonu", bulk_import.template_csv(bulk_import.KIND_PEOPLE),
+                           file_name="kisiler.csv", mime="text/csv")
+        t3.download_button("📄 Tatil şablonu", bulk_import.template_csv(bulk_import.KIND_HOLIDAYS),
+                           file_name="tatiller.csv", mime="text/csv")
+
+        uploads = st.file_uploader("Dosyalar", type=["csv", "xlsx"], accept_multiple_files=True, key="bulk_files")
+        skip_invalid = st.checkbox("Hatalı satırları atlayıp geri kalanını içe aktar", value=False)
+
+        if uploads and st.button("📥 İçe Aktar", type="primary"):
+            with st.spinner("Dosyalar okunuyor..."):
+                result = bulk_import.import_files(data, [(f.name, f) for f in uploads], skip_invalid=skip_invalid)
+
+            if result.errors:
+                st.error(f"{len(result.errors)} satırda hata var." +
+                         ("" if skip_invalid else " Hiçbir kayıt eklenmedi; düzeltip tekrar deneyin."))
+                st.dataframe([{"Kaynak": e.source, "Satır": e.row, "Hata": "; ".join(e.messages)} for e in result.errors],
+                             use_container_width=True, hide_index=True)
+
+            if result.meetings or result.people or result.holidays:
+                # Tüm kayıtlar tek kayıtta yazılır (tek yedek, tek indeks güncellemesi)
+                save_data(data)
+                st.success(f"{result.meetings} toplantı, {result.people} kişi, {result.holidays} tatil eklendi"
+                           + (f" ({result.skipped} kayıt zaten vardı)." if result.skipped else "."))
+            elif not result.errors:
+                st.info(f"Eklenecek yeni kayıt yok ({result.skipped} kayıt zaten vardı).")
+
+        st.markdown("---")
+        st.subheader("Outlook / Google Takvim'den (.ics) İçe Aktarma")
+        st.write("Tekrarlanan seriler haftalık/aylık toplantılara çevrilir; modelde karşılığı olmayanlar tek seferlik "
+                 "kayıt olarak eklenir. Aynı dosya tekrar yüklendiğinde seriler çoğaltılmaz, güncellenir.")
+        import ics_import
+        ics_uploads = st.file_uploader("ICS dosyaları", type=["ics"], accept_multiple_files=True, key="ics_files")
+        add_people = st.checkbox("Tanınmayan e-postaları yeni kişi olarak ekle", value=False)
+
+        if ics_uploads and st.button("📥 ICS İçe Aktar", type="primary"):
+            with st.spinner("Takvim dosyaları okunuyor..."):
+                result = ics_import.import_ics(data, [(f.name, f) for f in ics_uploads], add_people=add_people)
+
+            if result.errors:
+                st.warning(f"{len(result.errors)} etkinlik içe aktarılamadı.")
+                st.dataframe([{"Kaynak": e.source, "Satır": e.row, "Neden": "; ".join(e.messages)} for e in result.errors],
+                             use_container_width=True, hide_index=True)
+
+            if result.added or result.updated or result.people:
+                save_data(data)
+                st.success(f"{result.added} seri eklendi, {result.updated} seri güncellendi "
+                           f"({result.one_offs} tek seferlik kayıt), {result.people} kişi eklendi"
+                           + (f"; {result.skipped} etkinlik atlandı." if result.skipped else "."))
+            else:
+                st.info(f"Eklenecek yeni kayıt yok ({result.skipped} etkinlik atlandı).")
+
 # --- 4. KULLANICILAR ---
 elif menu == "Kullanıcılar":
     st.header("👥 Kullanıcı Yönetimi")
@@ -705,3 +738,78 @@ elif menu == "Ayarlar & Tatiller":
     st.markdown("---")
     st.subheader("Tekil Toplantı İptalleri (Exceptions)")
     st.info("Bu özellik yapım aşamasında. Şimdilik 'Tatiller' kısmını kullanarak o günkü tüm toplantıları iptal edebilirsiniz.")
+
+    if storage.storage_backend() == "journal":
+        from journal import open_journal
+        journal = open_journal(JSON_FILE)
+
+        st.markdown("---")
+        st.subheader("🕘 Değişiklik Geçmişi")
+        st.write(f"Güncel kayıt no: {journal.seq} (son anlık görüntü: {journal.snapshot_seq})")
+
+        history = journal.history(limit=20)
+        if history:
+            st.dataframe([{"No": seq, "Zaman": ts, "Değişiklik": summary} for seq, ts, summary in history],
+                         use_container_width=True, hide_index=True)
+
+        with st.form("restore_form"):
+            restore_seq = st.number_input("Geri dönülecek kayıt no", min_value=0, max_value=journal.seq, value=journal.seq, step=1)
+            if st.form_submit_button("⏪ Bu Noktaya Geri Yükle"):
+                # Geri yükleme de yeni bir kayıt olarak günlüğe eklenir (geçmiş kaybolmaz).
+                # Eski belge güncel sürümün üzerine yazılan bir düzenleme olarak kaydedilir.
+                restored = journal.restore(int(restore_seq))
+                restored[storage.VERSION_KEY] = data.get(storage.VERSION_KEY, 0)
+                save_data(restored)
+                st.success(f"{int(restore_seq)} numaralı kayda geri dönüldü.")
+                st.rerun()
+
+# --- 6. TANILAMA (gizli) ---
+elif menu == DIAGNOSTICS_MENU:
+    st.header("🩺 Tanılama")
+    st.caption("Son yeniden çalıştırmaların aşama süreleri. Aşama süreleri iç içe aşamaları da içerir "
+               "(ör. draw_weekly_view içinde expand); bu sayfanın kendi çalıştırması bir sonrakinde görünür.")
+    trace = st.checkbox("Ayrıntılı bellek ölçümü (tracemalloc; açıkken uygulama yavaşlar)", key="diag_tracemalloc")
+    diagnostics.trace_memory(trace)
+
+    records = diagnostics.history()
+    if not records:
+        st.info("Henüz ölçüm yok. Diğer sayfalarda gezindikçe çalıştırmalar burada listelenir.")
+    else:
+        def _peak_mb(record):
+            return round(record.peak_kb / 1024, 1) if record.peak_kb is not None else None
+
+        st.dataframe([{
+            "Zaman": r.started.strftime("%H:%M:%S"),
+            "Sayfa": r.label,
+            "Toplam (ms)": round(r.total_ms, 1),
+            "En Yavaş Aşama": f"{r.stages[0].name} ({r.stages[0].ms:.0f} ms)" if r.stages else "",
+            "Taranan Toplantı": r.counts.get("meetings_scanned", 0),
+            "Üretilen Tekrar": r.counts.get("occurrences", 0),
+            "Çizilen Şekil": r.counts.get("patches", 0),
+            "Tepe Bellek (MB)": _peak_mb(r),
+            "Yarıda Kesildi": "✓" if r.interrupted else "",
+        } for r in records], use_container_width=True, hide_index=True)
+
+        choice = st.selectbox("Çalıştırma Ayrıntısı", range(len(records)),
+                              format_func=lambda i: f"{records[i].started:%H:%M:%S} — {records[i].label} ({records[i].total_ms:.0f} ms)")
+        record = records[choice]
+        if record.stages:
+            st.dataframe([{
+                "Aşama": s.name,
+                "Çağrı": s.calls,
+                "Süre (ms)": round(s.ms, 2),
+                "Pay (%)": round(100 * s.ms / record.total_ms, 1) if record.total_ms else 0.0,
+            } for s in record.stages], use_container_width=True, hide_index=True)
+        if record.counts:
+            st.write("Sayaçlar: " + ", ".join(f"{name}: {value}" for name, value in sorted(record.counts.items())))
+        if record.memory_source == "tracemalloc":
+            st.caption(f"Bu çalıştırmadaki tepe Python belleği: {_peak_mb(record)} MB (tracemalloc)")
+        elif record.memory_source == "rss":
+            st.caption(f"Sürecin tepe bellek kullanımı (RSS): {_peak_mb(record)} MB")
+
+    if st.button("Geçmişi Temizle"):
+        diagnostics.clear_history()
+        st.rerun()
+
+if DIAGNOSTICS:
+    diagnostics.end_run(st.session_state.pop("diag_run", None))
@@ -0,0 +1,188 @@
+"""
+Hafif performans tanılama: aşama süreleri, sayaçlar ve tepe bellek.
+
+Bir çalıştırma (panonun bir yeniden çalıştırması) start_run ile başlar ve
+end_run ile geçmişe eklenir. Arada çağrılan span("ad") bağlam yöneticileri ve
+@timed("ad") ile işaretli fonksiyonlar aşama süresi, count("ad", n) sayaç
+biriktirir. Etkin çalıştırma iş parçacığına özeldir: arka plan iş parçacıkları
+(akış yayını vb.) ve işçi süreçler ölçüme karışmaz.
+
+Etkin çalıştırma yokken span() paylaşılan boş bir bağlam yöneticisi döndürür,
+count() ve @timed tek bir öznitelik okumasıyla geri döner (çağrı başına
+yüzlerce nanosaniye); ölçüm noktaları döngü içlerine değil aşama sınırlarına konur.
+"""
+import time
+import datetime
+import functools
+import threading
+import contextlib
+from collections import deque, namedtuple
+
+try:
+    import resource  # Windows'ta yok
+except ImportError:
+    resource = None
+
+# Geçmişte tutulan son çalıştırma sayısı
+HISTORY_SIZE = 30
+
+# Aşama: toplam süre (ms, iç içe aşamalar dahil) ve çağrı sayısı
+Stage = namedtuple('Stage', 'name ms calls')
+# peak_kb: tracemalloc açıksa çalıştırma içindeki tepe, değilse sürecin tepe RSS değeri
+RunRecord = namedtuple('RunRecord', 'started label total_ms stages counts peak_kb memory_source interrupted')
+
+
+class _State(threading.local):
+    # Sınıf özniteliği: öznitelik okuması her iş parçacığında hata yakalamadan None döner
+    run = None
+
+
+_local = _State()
+_NULL_SPAN = contextlib.nullcontext()
+_history = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+
+
+class _Run:
+    __slots__ = ('label', 'started', 't0', 'last', 'stages', 'counts', 'finished')
+
+    def __init__(self, label):
+        self.label = label
+        self.started = datetime.datetime.now()
+        self.t0 = self.last = time.perf_counter()
+        self.stages = {}
+        self.counts = {}
+        self.finished = False
+
+
+class _Span:
+    __slots__ = ('run', 'name', 't0')
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        now = time.perf_counter()
+        stage = self.run.stages.get(self.name)
+        if stage is None:
+            self.run.stages[self.name] = [now - self.t0, 1]
+        else:
+            stage[0] += now - self.t0
+            stage[1] += 1
+        self.run.last = now
+        return False
+
+
+def active():
+    """Bu iş parçacığında ölçüm yapılıyor mu (pahalı sayaçları korumak için)."""
+    return _local.run is not None
+
+
+def span(name):
+    """Aşama süresi ölçen bağlam yöneticisi."""
+    run = _local.run
+    if run is None:
+        return _NULL_SPAN
+    return _Span(run, name)
+
+
+def timed(name):
+    """Fonksiyonun tamamını name aşaması olarak ölçen dekoratör."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _local.run
+            if run is None:
+                return func(*args, **kwargs)
+            with _Span(run, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """Sayaç ekler (taranan toplantı, üretilen tekrar, çizilen şekil...)."""
+    run = _local.run
+    if run is not None:
+        run.counts[name] = run.counts.get(name, 0) + n
+
+
+def set_label(label):
+    """Etkin çalıştırmanın etiketi (ör. panoda seçili sayfa)."""
+    run = _local.run
+    if run is not None:
+        run.label = label
+
+
+def trace_memory(enabled):
+    """Ayrıntılı bellek ölçümü (tracemalloc) açar/kapatır; açıkken her şey yavaşlar."""
+    import tracemalloc
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _tracing():
+    import sys
+    tracemalloc = sys.modules.get('tracemalloc')
+    return tracemalloc is not None and tracemalloc.is_tracing()
+
+
+def start_run(label=""):
+    """Bu iş parçacığında yeni çalıştırma başlatır ve döndürür."""
+    if _tracing():
+        import tracemalloc
+        tracemalloc.reset_peak()
+    run = _Run(label)
+    _local.run = run
+    return run
+
+
+def end_run(run=None, interrupted=False):
+    """
+    Çalıştırmayı bitirip geçmişe ekler ve kaydını döndürür (bitmişse None).
+    interrupted: Çalıştırma yarıda kesildi (st.rerun/st.stop); toplam süre
+    son ölçülen aşamada biter.
+    """
+    current = _local.run
+    if run is None:
+        run = current
+    if run is current:
+        _local.run = None
+    if run is None or run.finished:
+        return None
+    run.finished = True
+
+    end = run.last if interrupted else time.perf_counter()
+    if _tracing():
+        import tracemalloc
+        peak_kb, source = tracemalloc.get_traced_memory()[1] // 1024, "tracemalloc"
+    elif resource is not None:
+        peak_kb, source = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "rss"
+    else:
+        peak_kb, source = None, None
+
+    stages = sorted((Stage(name, seconds * 1000, calls) for name, (seconds, calls) in run.stages.items()),
+                    key=lambda s: s.ms, reverse=True)
+    record = RunRecord(run.started, run.label, (end - run.t0) * 1000, stages, dict(run.counts),
+                       peak_kb, source, interrupted)
+    with _history_lock:
+        _history.append(record)
+    return record
+
+
+def history():
+    """Son çalıştırmalar (en yenisi başta)."""
+    with _history_lock:
+        return list(reversed(_history))
+
+
+def clear_history():
+    with _history_lock:
+        _history.clear()
@@ -0,0 +1,360 @@
+"""
+Kişi bazlı ICS abonelik akışları (Outlook / Google Takvim "İnternetten abone ol").
+
+Akışlar her başarılı save_data sonrasında bir kez üretilir (publish_feeds) ve
+calendar_data.feeds/ altına içerik özetiyle adlandırılmış dosyalar olarak
+yazılır; hangi kişinin hangi dosyayı kullandığı sürüm numaralı bir manifest
+dosyasında tutulur. İçeriği değişmeyen akışın dosyası ve ETag'i korunur.
+
+Sunucu (python feed_server.py) yalnızca bu dosyaları okur; JSON'a veya tekrar
+motoruna dokunmaz. Yanıtlar bellekteki hazır baytlardan verilir, güçlü ETag
+taşır ve If-None-Match eşleşirse 304 döner. Dizin en fazla RELOAD_INTERVAL
+saniyede bir kontrol edilir.
+
+    /feeds/all.ics        Tüm toplantılar
+    /feeds/<kişi>.ics     Kişinin katıldığı toplantılar (kısa ad, ör. /feeds/Özden.ics)
+
+Kullanım: python feed_server.py [--host 0.0.0.0] [--port 8502] [--data calendar_data.json]
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from storage import JSON_FILE
+
+ALL_FEED = "all"
+MANIFEST_PREFIX = "manifest-"
+DEFAULT_PORT = 8502
+
+# Akış aralığı: geçen yılın başından gelecek yılın sonuna (seriler RRULE ile yazıldığından küçük kalır)
+FEED_YEARS_BEFORE = 1
+FEED_YEARS_AFTER = 1
+
+# Eski manifest ve akış dosyaları bu kadar saniye sonra silinir (o sırada okuyan sunucu için)
+STALE_SECONDS = 60
+MANIFESTS_KEEP = 2
+
+RELOAD_INTERVAL = 1.0
+# Kayıttan sonra yayına kadar beklenen süre: art arda kayıtlar tek yayında birleşir
+PUBLISH_DELAY = 1.0
+# İstemciler yine de koşullu istekle doğrular; bu süre yalnızca gereksiz yoklamayı azaltır
+CACHE_CONTROL = "public, max-age=300"
+
+# İçerik karşılaştırması için sabit DTSTAMP; dosyaya yazılırken yayın zamanıyla değiştirilir
+_FIXED_STAMP = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_FIXED_STAMP_LINE = b"DTSTAMP:19700101T000000Z"
+
+
+def feed_dir(json_file=JSON_FILE):
+    return os.path.splitext(json_file)[0] + ".feeds"
+
+
+def feed_window(today=None):
+    today = today or datetime.date.today()
+    return datetime.date(today.year - FEED_YEARS_BEFORE, 1, 1), datetime.date(today.year + FEED_YEARS_AFTER, 12, 31)
+
+
+def _manifests(directory):
+    """(sürüm, dosya adı) listesi, eskiden yeniye."""
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(MANIFEST_PREFIX) and name.endswith(".json"):
+            try:
+                found.append((int(name[len(MANIFEST_PREFIX):-5]), name))
+            except ValueError:
+                continue
+    return sorted(found)
+
+
+def _read_manifest(directory, name):
+    try:
+        with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, body):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def publish_feeds(data, json_file=JSON_FILE, today=None):
+    """
+    Tüm ekip ve kişi akışlarını üretip feed dizinine yazar. Belge sürümü son
+    yayınlanandan eski değilse bir şey yapmaz. Yazılan manifestin sürümünü
+    (veya None) döndürür.
+    """
+    from ics_export import ics_bytes
+    from storage import VERSION_KEY
+
+    directory = feed_dir(json_file)
+    os.makedirs(directory, exist_ok=True)
+    version = data.get(VERSION_KEY, 0)
+    existing = _manifests(directory)
+    if existing and existing[-1][0] >= version:
+        return None
+    previous = (_read_manifest(directory, existing[-1][1]) or {}) if existing else {}
+    previous_feeds = previous.get('feeds', {})
+
+    start, end = feed_window(today)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("DTSTAMP:%Y%m%dT%H%M%SZ").encode()
+    people = [p['name'] if isinstance(p, dict) else p for p in data.get('people', [])]
+    feeds = {}
+    for person in [None] + people:
+        key = person or ALL_FEED
+        # Çakışma notları akışa yazılmaz: kayıt başına maliyeti toplantı sayısıyla karesel artar
+        body = ics_bytes(data, start, end, person=person, dtstamp=_FIXED_STAMP, conflicts=False,
+                         calendar_name=f"Toplantı Takvimi - {person}" if person else "Toplantı Takvimi")
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        old = previous_feeds.get(key)
+        if old and old.get('etag') == etag and os.path.exists(os.path.join(directory, old['file'])):
+            feeds[key] = old
+            continue
+        file_name = f"{etag}.ics"
+        _write_atomic(os.path.join(directory, file_name), body.replace(_FIXED_STAMP_LINE, stamp))
+        feeds[key] = {"file": file_name, "etag": etag}
+
+    manifest = {"doc_version": version, "generated": datetime.datetime.now().isoformat(timespec='seconds'),
+                "window": [start.isoformat(), end.isoformat()], "feeds": feeds}
+    _write_atomic(os.path.join(directory, f"{MANIFEST_PREFIX}{version:010d}.json"),
+                  json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+    _cleanup(directory)
+    return version
+
+
+_PENDING = {}       # veri dosyası -> yayınlanmayı bekleyen en yeni belge
+_PUBLISHERS = {}    # veri dosyası -> yayın iş parçacığı
+_PENDING_LOCK = threading.Lock()
+
+
+def schedule_publish(data, json_file=JSON_FILE):
+    """
+    Akışları PUBLISH_DELAY sonra arka planda yeniden üretir. Bu sürede gelen
+    kayıtlardan yalnızca en yeni belge yayınlanır; kaydeden oturum beklemez. İş parçacığı daemon
+    değildir: süreç çıkmadan önce bekleyen yayın tamamlanır.
+    """
+    key = os.path.abspath(json_file)
+    with _PENDING_LOCK:
+        _PENDING[key] = (data, json_file)
+        if key in _PUBLISHERS:
+            return
+        thread = threading.Thread(target=_publish_pending, args=(key,), name="feed-publisher")
+        _PUBLISHERS[key] = thread
+    thread.start()
+
+
+def _publish_pending(key):
+    try:
+        while True:
+            time.sleep(PUBLISH_DELAY)
+            with _PENDING_LOCK:
+                item = _PENDING.pop(key, None)
+                if item is None:
+                    del _PUBLISHERS[key]
+                    return
+            try:
+                publish_feeds(*item)
+            except Exception as e:
+                # Yayınlanamayan belge (hatalı kayıt, disk hatası) yayıncıyı
+                # durdurmaz: sonraki kayıt yine yayınlanır
+                print(f"ICS akışları yazılamadı: {e!r}")
+    finally:
+        # Beklenmedik çıkışta kayıt kalırsa sonraki schedule_publish çağrıları yayıncı başlatmaz
+        with _PENDING_LOCK:
+            if _PUBLISHERS.get(key) is threading.current_thread():
+                del _PUBLISHERS[key]
+
+
+def wait_for_publish(timeout=None):
+    """Bekleyen yayınların bitmesini bekler (komut satırı araçları ve ölçümler için)."""
+    with _PENDING_LOCK:
+        threads = list(_PUBLISHERS.values())
+    for thread in threads:
+        thread.join(timeout)
+
+
+def _cleanup(directory):
+    """Eski manifestleri ve hiçbir güncel manifestin kullanmadığı akış dosyalarını siler."""
+    now = time.time()
+    manifests = _manifests(directory)
+    keep = manifests[-MANIFESTS_KEEP:]
+    referenced = set()
+    for _, name in keep:
+        manifest = _read_manifest(directory, name) or {}
+        referenced.update(feed['file'] for feed in manifest.get('feeds', {}).values())
+    stale = [name for _, name in manifests[:-MANIFESTS_KEEP]]
+    stale += [name for name in os.listdir(directory) if name.endswith(".ics") and name not in referenced]
+    for name in stale:
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > STALE_SECONDS:
+                os.remove(path)
+        except OSError:
+            continue
+
+
+class FeedStore:
+    """Yayınlanmış akışların bellekteki kopyası; dizin değişince yeniden yüklenir."""
+
+    def __init__(self, directory, reload_interval=RELOAD_INTERVAL):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.version = None
+        self._feeds = {}      # ad -> (bayt, etag)
+        self._lookup = {}     # casefold ad -> ad
+        self._dir_key = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked < self.reload_interval:
+                return
+            self._checked = now
+            try:
+                st = os.stat(self.directory)
+            except OSError:
+                return
+            dir_key = (st.st_ino, st.st_mtime_ns)
+            if dir_key == self._dir_key:
+                return
+            manifests = _manifests(self.directory)
+            if not manifests or manifests[-1][0] == self.version:
+                self._dir_key = dir_key
+                return
+            version, name = manifests[-1]
+            manifest = _read_manifest(self.directory, name)
+            if manifest is None:
+                return
+            feeds = {}
+            try:
+                for key, feed in manifest.get('feeds', {}).items():
+                    with open(os.path.join(self.directory, feed['file']), 'rb') as f:
+                        feeds[key] = (f.read(), f'"{feed["etag"]}"')
+            except OSError:
+                return  # Yayın sürüyor; bir sonraki kontrolde tekrar denenir
+            self._feeds = feeds
+            self._lookup = {key.casefold(): key for key in feeds}
+            self.version = version
+            self._dir_key = dir_key
+
+    def get(self, name):
+        """Akış adına (büyük/küçük harf duyarsız) göre (bayt, etag) veya None."""
+        self._maybe_reload()
+        key = self._lookup.get(name.casefold())
+        return self._feeds.get(key) if key is not None else None
+
+    def names(self):
+        self._maybe_reload()
+        return sorted(self._feeds)
+
+
+def _etag_matches(header, etag):
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidates)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    store = None
+    quiet = True
+    server_version = "TakvimFeed/1.0"
+
+    def _route(self):
+        path = unquote(urlsplit(self.path).path)
+        if not (path.startswith("/feeds/") and path.endswith(".ics")):
+            return None
+        return self.store.get(path[len("/feeds/"):-len(".ics")])
+
+    def _respond(self, send_body):
+        feed = self._route()
+        if feed is None:
+            body = ("Bilinmeyen akış. Kullanılabilir: " +
+                    ", ".join(f"/feeds/{n}.ics" for n in self.store.names())).encode('utf-8')
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        body, etag = feed
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/calendar; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(json_file, host="127.0.0.1", port=DEFAULT_PORT, quiet=True):
+    """Akış sunucusu; henüz yayın yoksa başlangıçta bir kez üretilir."""
+    directory = feed_dir(json_file)
+    if not os.path.isdir(directory) or not _manifests(directory):
+        from storage import load_data
+        publish_feeds(load_data(json_file), json_file)
+    handler = type("Handler", (FeedHandler,), {"store": FeedStore(directory), "quiet": quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kişi bazlı ICS abonelik akışlarını sunar.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("FEED_PORT", DEFAULT_PORT)))
+    parser.add_argument("--data", default=JSON_FILE, help="Takvim veri dosyası")
+    parser.add_argument("--verbose", action="store_true", help="Her isteği yazdır")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.data, args.host, args.port, quiet=not args.verbose)
+    print(f"Akışlar: http://{args.host}:{args.port}/feeds/{ALL_FEED}.ics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,152 +1,41 @@
 import json
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.font_manager import FontProperties
-from matplotlib.backends.backend_pdf import PdfPages
-import textwrap
 import datetime
-import calendar
 import os
+import io
+import textwrap
 
-# Türkçe gün ve ay isimleri
-TR_DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-TR_MONTHS = ["", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", 
-             "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
-
-def time_to_min(t):
-    h, m = map(int, t.split(':'))
-    return h * 60 + m
+import diagnostics
+from recurrence import TR_DAYS, TR_MONTHS, time_to_min, get_last_monday, compile_meeting, expand, get_holidays
+from week_model import build_weekly_model, get_mixed_color
+from month_model import build_month_model, HOLIDAY_COLOR, WEEKEND_COLOR
+from render_cache import default_cache, weekly_render_key
+from vector_render import render_weekly_svg, render_weekly_pdf
 
-def get_last_monday(year, month):
-    """Verilen yıl ve ayın son pazartesi gününün tarihini döndürür."""
-    # Bir sonraki ayın ilk gününü bul
-    if month == 12:
-        next_month = datetime.date(year + 1, 1, 1)
-    else:
-        next_month = datetime.date(year, month + 1, 1)
-    
-    # Geriye doğru giderek ilk pazartesiyi bul
-    current_day = next_month - datetime.timedelta(days=1)
-    while current_day.weekday() != 0: # 0 = Pazartesi
-        current_day -= datetime.timedelta(days=1)
-    return current_day
+# matplotlib yalnızca matplotlib motoruyla çizim yapılırken içe aktarılır
+# (pyplot yüklemesi tek başına ~1 sn; panonun açılışını yavaşlatmasın).
 
 def should_show_meeting(meeting, week_start_date):
     """
     Bir toplantının verilen haftada gösterilip gösterilmeyeceğini belirler.
     week_start_date: O haftanın Pazartesi günü (datetime.date objesi)
     """
-    freq = meeting.get('frequency', 'Her Hafta')
-    start_date_str = meeting.get('start_date', '2026-02-02')
-    end_date_str = meeting.get('end_date', '2026-12-31')
-    
-    try:
-        meeting_start_date = datetime.datetime.strptime(start_date_str, "%Y-%m-%d").date()
-        meeting_end_date = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
-    except ValueError:
-        return True # Hata durumunda göster
-    
-    # Toplantı başlangıç tarihinin olduğu haftanın pazartesisi
-    meeting_start_week = meeting_start_date - datetime.timedelta(days=meeting_start_date.weekday())
-    
-    # Hafta farkı
-    weeks_diff = (week_start_date - meeting_start_week).days // 7
-    
-    if weeks_diff < 0:
-        return False # Henüz başlamadı
-    
-    # Bu hafta içinde hangi gün?
-    meeting_day_name = meeting.get('day', '').strip()
-    meeting_date_this_week = None
-    
-    if meeting_day_name in TR_DAYS:
-        day_idx = TR_DAYS.index(meeting_day_name)
-        meeting_date_this_week = week_start_date + datetime.timedelta(days=day_idx)
-
-    show_this_week = False
-
-    if freq == "Her Hafta":
-        show_this_week = True
-    elif freq == "İki Haftada Bir":
-        show_this_week = weeks_diff % 2 == 0
-    elif freq == "Tek Seferlik":
-        show_this_week = weeks_diff == 0
-    elif "Aylık" in freq:
-        # Aylık mantığı: O hafta içinde ilgili gün var mı?
-        # "Aylık (Son Pazartesi)" kontrolü
-        if "Son Pazartesi" in freq:
-            # Bu haftanın günlerini kontrol et
-            for i in range(5): # Pzt-Cuma
-                current_day = week_start_date + datetime.timedelta(days=i)
-                if current_day.weekday() == 0: # Pazartesi
-                    last_monday = get_last_monday(current_day.year, current_day.month)
-                    if current_day == last_monday:
-                        meeting_date_this_week = current_day
-                        show_this_week = True
-                        break
-        else:
-            # Standart aylık (Tarih bazlı varsayalım veya şimdilik her ayın ilk haftası gibi)
-            show_this_week = True 
-            
-    if show_this_week:
-        # Tarih kontrolü (Bitiş Tarihi ve Başlangıç Tarihi)
-        if meeting_date_this_week:
-             if meeting_date_this_week > meeting_end_date:
-                 return False
-             if meeting_date_this_week < meeting_start_date:
-                 return False
-        return True
-        
-    return False
-
-def get_mixed_color(attendees, colors):
-    """Katılımcıların renklerinin ortalamasını alarak dinamik renk üretir."""
-    if not attendees:
-        return colors.get("Mixed", {"bg": "#E0E0E0", "border": "#666666"})
-        
-    bg_r, bg_g, bg_b = 0, 0, 0
-    border_r, border_g, border_b = 0, 0, 0
-    count = 0
-    
-    found_any = False
-    
-    for person in attendees:
-        if person in colors:
-            found_any = True
-            c = colors[person]
-            # BG hex to int
-            bg = c.get('bg', '#CCCCCC').lstrip('#')
-            if len(bg) == 6:
-                bg_r += int(bg[0:2], 16)
-                bg_g += int(bg[2:4], 16)
-                bg_b += int(bg[4:6], 16)
-            
-            # Border hex to int
-            border = c.get('border', '#666666').lstrip('#')
-            if len(border) == 6:
-                border_r += int(border[0:2], 16)
-                border_g += int(border[2:4], 16)
-                border_b += int(border[4:6], 16)
-            count += 1
-            
-    if found_any and count > 0:
-        new_bg = f"#{int(bg_r/count):02x}{int(bg_g/count):02x}{int(bg_b/count):02x}"
-        new_border = f"#{int(border_r/count):02x}{int(border_g/count):02x}{int(border_b/count):02x}"
-        return {"bg": new_bg, "border": new_border}
-    
-    return colors.get("Mixed", {"bg": "#E0E0E0", "border": "#666666"})
+    week_end_date = week_start_date + datetime.timedelta(days=6)
+    return compile_meeting(meeting).has_occurrence(week_start_date, week_end_date)
 
-def draw_weekly_view(ax, data, week_start_date):
-    settings = data['settings']
-    days = settings['days']
-    colors = settings.get('colors', {})
-    
-    work_start_min = time_to_min(settings['work_start'])
-    work_end_min = time_to_min(settings['work_end'])
+@diagnostics.timed("draw_weekly_view")
+def draw_weekly_view(ax, data, week_start_date, occurrences=None, model=None):
+    """
+    Haftalık görünümü çizer (model: week_model.build_weekly_model çıktısı).
+    occurrences: O haftanın hazır tekrar listesi (verilmezse veriden genişletilir)
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    if model is None:
+        model = build_weekly_model(data, week_start_date, occurrences=occurrences)
     
-    # Başlık
-    week_end_date = week_start_date + datetime.timedelta(days=4)
-    header_text = f"{week_start_date.day} {TR_MONTHS[week_start_date.month]} - {week_end_date.day} {TR_MONTHS[week_end_date.month]} {week_start_date.year}"
+    n_days = model['n_days']
+    work_start_min = model['work_start']
+    work_end_min = model['work_end']
     
     # Sayfa düzeni ayarları (Margins)
     plt.subplots_adjust(top=0.85, bottom=0.15, left=0.05, right=0.95)
@@ -154,273 +43,52 @@ def draw_weekly_view(ax, data, week_start_date):
     # Başlığı biraz daha yukarı al (boşluk artırma)
     # Veri koordinatlarında çiziyoruz. Eksenin üstü work_start_min.
     # 80 birim yukarı alalım.
-    ax.text(len(days)/2, work_start_min - 80, header_text, ha='center', va='center', fontsize=20, fontweight='bold', color='#333333')
+    ax.text(n_days/2, work_start_min - 80, model['header'], ha='center', va='center', fontsize=20, fontweight='bold', color='#333333')
 
     # Eksen Ayarları
     ax.set_ylim(work_end_min, work_start_min)
-    ax.set_xlim(0, len(days))
+    ax.set_xlim(0, n_days)
     ax.set_facecolor("#FFFFFF")
     
     # Grid
     grid_color = "#E0E0E0"
-    for i in range(len(days) + 1):
+    for i in range(n_days + 1):
         ax.axvline(i, color=grid_color, linestyle='-', linewidth=1)
     
-    current_time = work_start_min
-    while current_time <= work_end_min:
+    for current_time in model['half_hours']:
         ax.axhline(current_time, color=grid_color, linestyle='--', linewidth=0.5, alpha=0.5)
-        current_time += 30
         
-    # Gün Başlıkları
-    for i, day in enumerate(days):
-        # O günün tarihi
-        current_day = week_start_date + datetime.timedelta(days=i)
-        day_label = f"{day}\n{current_day.day} {TR_MONTHS[current_day.month]}"
-        # Gün başlıklarını ızgaradan biraz uzaklaştır
+    # Gün Başlıkları (ızgaradan biraz uzakta)
+    for i, day_label in enumerate(model['day_labels']):
         ax.text(i + 0.5, work_start_min - 30, day_label, ha='center', va='center', fontsize=14, fontweight='bold', color='#333333')
 
     # Y Eksen Etiketleri
-    yticks = []
-    yticklabels = []
-    current_time = work_start_min
-    while current_time <= work_end_min:
-        yticks.append(current_time)
-        h = current_time // 60
-        m = current_time % 60
-        yticklabels.append(f"{h:02d}:{m:02d}")
-        current_time += 60
-    ax.set_yticks(yticks)
-    ax.set_yticklabels(yticklabels)
+    ax.set_yticks([t for t, _ in model['hour_ticks']])
+    ax.set_yticklabels([label for _, label in model['hour_ticks']])
     ax.tick_params(axis='y', labelsize=12)
     
     # Öğle Arası
-    lunch_start = time_to_min(settings['lunch_break']['start'])
-    lunch_end = time_to_min(settings['lunch_break']['end'])
-    rect_lunch = patches.Rectangle((0, lunch_start), len(days), lunch_end - lunch_start, linewidth=0, facecolor='#F2F2F2', alpha=0.5)
+    lunch_start, lunch_end = model['lunch']
+    rect_lunch = patches.Rectangle((0, lunch_start), n_days, lunch_end - lunch_start, linewidth=0, facecolor='#F2F2F2', alpha=0.5)
     ax.add_patch(rect_lunch)
-    ax.text(len(days)/2, (lunch_start + lunch_end)/2, "ÖĞLE ARASI", ha='center', va='center', color='#999999', fontsize=10, fontstyle='italic')
-    
-    # Resmi Tatiller
-    holidays = data.get('holidays', {})
-    # Listeden sözlüğe geçiş kontrolü (Geriye dönük uyumluluk)
-    if isinstance(holidays, list):
-        holidays = {h: "RESMİ TATİL" for h in holidays}
-
-    for i, day in enumerate(days):
-        current_day = week_start_date + datetime.timedelta(days=i)
-        current_day_str = current_day.strftime("%Y-%m-%d")
-        if current_day_str in holidays:
-            holiday_name = holidays[current_day_str]
-            # Tüm günü kapatan blok
-            rect_h = patches.Rectangle((i, work_start_min), 1, work_end_min - work_start_min, 
-                                     linewidth=0, facecolor='#FFEBEE', alpha=0.85, zorder=25)
-            ax.add_patch(rect_h)
-            ax.text(i + 0.5, (work_start_min + work_end_min)/2, holiday_name, 
-                   ha='center', va='center', rotation=90, fontsize=16, color='#D32F2F', fontweight='bold', zorder=30)
-
-    # Toplantıları Filtrele ve Hazırla
-    meetings_by_day = {day: [] for day in days}
+    ax.text(n_days/2, (lunch_start + lunch_end)/2, "ÖĞLE ARASI", ha='center', va='center', color='#999999', fontsize=10, fontstyle='italic')
     
-    for meeting in data['meetings']:
-        # Önce bu haftada gösterilecek mi kontrol et
-        if not should_show_meeting(meeting, week_start_date):
-            continue
-            
-        day_str = meeting['day'].strip()
-        if day_str in days:
-            # Tatil kontrolü
-            day_idx = days.index(day_str)
-            meeting_date = week_start_date + datetime.timedelta(days=day_idx)
-            meeting_date_str = meeting_date.strftime("%Y-%m-%d")
-            
-            # Sözlük/Liste kontrolü
-            is_holiday = False
-            if isinstance(holidays, dict):
-                is_holiday = meeting_date_str in holidays
-            else:
-                is_holiday = meeting_date_str in holidays
-                
-            if is_holiday:
-                continue # Tatil gününe toplantı koyma
-            
-            start = time_to_min(meeting['start_time'])
-            end = time_to_min(meeting['end_time'])
-            meeting['start_min'] = start
-            meeting['end_min'] = end
-            meetings_by_day[day_str].append(meeting)
-            
-    # Kişi Bazlı Çakışma Kontrolü (Conflict Detection)
-    conflicting_meeting_ids = set()
-    for day_str in days:
-        day_meetings = meetings_by_day[day_str]
-        n = len(day_meetings)
-        for i in range(n):
-            for j in range(i + 1, n):
-                m1 = day_meetings[i]
-                m2 = day_meetings[j]
-                
-                # Zaman Çakışması Kontrolü
-                if max(m1['start_min'], m2['start_min']) < min(m1['end_min'], m2['end_min']):
-                    # Katılımcı Çakışması Kontrolü
-                    attendees1 = set(m1.get('attendees', []))
-                    attendees2 = set(m2.get('attendees', []))
-                    
-                    if not attendees1.isdisjoint(attendees2):
-                        conflicting_meeting_ids.add(id(m1))
-                        conflicting_meeting_ids.add(id(m2))
-
-    # Çizim ve Çakışma Mantığı
-    for day_str in days:
-        day_meetings = meetings_by_day[day_str]
-        if not day_meetings: continue
-        
-        day_idx = days.index(day_str)
-        day_meetings.sort(key=lambda x: x['start_min'])
-        
-        # Gruplama Algoritması (Çakışan Grupları Bul)
-        groups = []
-        if day_meetings:
-            current_group = [day_meetings[0]]
-            group_end = day_meetings[0]['end_min']
-            
-            for meeting in day_meetings[1:]:
-                if meeting['start_min'] < group_end:
-                    current_group.append(meeting)
-                    group_end = max(group_end, meeting['end_min'])
-                else:
-                    groups.append(current_group)
-                    current_group = [meeting]
-                    group_end = meeting['end_min']
-            groups.append(current_group)
-        
-        # Her grubu çiz
-        for group in groups:
-            columns = []
-            meeting_cols = {}
-            
-            # 1. Sütun Atama (Packing)
-            for meeting in group:
-                placed = False
-                for i, col_end in enumerate(columns):
-                    if meeting['start_min'] >= col_end:
-                        columns[i] = meeting['end_min']
-                        meeting_cols[id(meeting)] = i
-                        placed = True
-                        break
-                if not placed:
-                    columns.append(meeting['end_min'])
-                    meeting_cols[id(meeting)] = len(columns) - 1
-            
-            total_cols = len(columns)
-            
-            # 2. Genişleme Mantığı (Smart Expansion)
-            # Her sütun için kullanım aralıklarını kaydet
-            col_usage = {i: [] for i in range(total_cols)}
-            for meeting in group:
-                c_idx = meeting_cols[id(meeting)]
-                col_usage[c_idx].append((meeting['start_min'], meeting['end_min']))
-            
-            # Her toplantı için genişleme miktarını (span) hesapla
-            meeting_spans = {}
-            for meeting in group:
-                start = meeting['start_min']
-                end = meeting['end_min']
-                c_idx = meeting_cols[id(meeting)]
-                span = 1
-                
-                # Sağa doğru bak: boşsa genişle
-                for check_col in range(c_idx + 1, total_cols):
-                    is_free = True
-                    for u_start, u_end in col_usage[check_col]:
-                        # Çakışma kontrolü (Interval Overlap)
-                        if max(start, u_start) < min(end, u_end):
-                            is_free = False
-                            break
-                    if is_free:
-                        span += 1
-                    else:
-                        break # Engellendi, daha öteye gidemez (bitişik olmalı)
-                
-                meeting_spans[id(meeting)] = span
-
-            base_col_width = 0.9 / total_cols
-            
-            for meeting in group:
-                col_idx = meeting_cols[id(meeting)]
-                span = meeting_spans[id(meeting)]
-                
-                start = meeting['start_min']
-                end = meeting['end_min']
-                duration = end - start
-                
-                attendees = meeting.get('attendees', [])
-                bg_color = "#DDDDDD"
-                border_color = "#666666"
-                
-                # Renk Belirleme Mantığı
-                if set(attendees) == set(["Özden", "Burak", "Doğukan"]):
-                    c = colors.get("All Team", {})
-                    bg_color = c.get("bg", "#FFCCCC")
-                    border_color = c.get("border", "#FF0000")
-                elif len(attendees) == 1:
-                    person = attendees[0]
-                    c = colors.get(person, {})
-                    bg_color = c.get("bg", "#E0E0E0")
-                    border_color = c.get("border", "#666666")
-                else:
-                    # Dinamik Karışık Renk
-                    c = get_mixed_color(attendees, colors)
-                    bg_color = c.get("bg", "#E0E0E0")
-                    border_color = c.get("border", "#666666")
-                
-                linewidth = 2
-                # Çakışma Vurgusu
-                if id(meeting) in conflicting_meeting_ids:
-                    border_color = "#FF0000"
-                    linewidth = 5
-                     
-                # Genişlik hesaplama (span ile)
-                final_width = (base_col_width * span) - 0.02
-                x_pos = day_idx + 0.05 + (col_idx * base_col_width)
-                
-                rect = patches.Rectangle((x_pos, start), final_width, duration, linewidth=linewidth, edgecolor=border_color, facecolor=bg_color, joinstyle='round', zorder=10)
-                ax.add_patch(rect)
-                
-                text_x = x_pos + (final_width / 2)
-                text_y = start + (duration / 2)
-                
-                # Metin kaydırma (width'e göre)
-                # 1 birim genişlik ~ 40 karakter sığıyorsa, oranlayalım
-                # base_col_width tüm günün %90'ı. Tüm gün ~ 40 char?
-                # Deneme yanılma: base_col_width=0.9 -> 35 char.
-                # Daha güvenli olması için 30 çarpanı kullanalım
-                char_limit = int(30 * (final_width / 0.9))
-                if char_limit < 8: char_limit = 8
-                
-                wrapped_title = textwrap.fill(meeting['title'], width=char_limit)
-                label = f"{wrapped_title}"
-                
-                if attendees:
-                    attendees_str = ", ".join(attendees)
-                    wrapped_attendees = textwrap.fill(attendees_str, width=char_limit)
-                    label += f"\n({wrapped_attendees})"
-                
-                # Font boyutlarını büyüt (Kullanıcı isteği: yaşlı kullanıcı, büyük yazı)
-                # Alan darsa küçült - Overlap önlemek için biraz küçültüldü
-                if span == total_cols: # Tam genişlik
-                    font_size = 14
-                elif final_width > 0.4:
-                    font_size = 12
-                else:
-                    font_size = 10
-                    
-                ax.text(text_x, text_y, label, ha='center', va='center', fontsize=font_size, wrap=True, color='#333333', zorder=15)
+    # Resmi Tatiller (Tüm günü kapatan blok)
+    for i, holiday_name in model['holidays']:
+        rect_h = patches.Rectangle((i, work_start_min), 1, work_end_min - work_start_min, 
+                                 linewidth=0, facecolor='#FFEBEE', alpha=0.85, zorder=25)
+        ax.add_patch(rect_h)
+        ax.text(i + 0.5, (work_start_min + work_end_min)/2, holiday_name, 
+               ha='center', va='center', rotation=90, fontsize=16, color='#D32F2F', fontweight='bold', zorder=30)
+
+    # Toplantı Kutuları
+    for box in model['boxes']:
+        rect = patches.Rectangle((box.x, box.y), box.width, box.height, linewidth=box.linewidth, edgecolor=box.border, facecolor=box.bg, joinstyle='round', zorder=10)
+        ax.add_patch(rect)
+        ax.text(box.x + box.width / 2, box.y + box.height / 2, box.label, ha='center', va='center', fontsize=box.font_size, wrap=True, color='#333333', zorder=15)
 
     # Lejant
-    legend_elements = []
-    for key, val in colors.items():
-        if key == "Mixed": continue
-        legend_elements.append(patches.Patch(facecolor=val['bg'], edgecolor=val['border'], label=val['label']))
+    legend_elements = [patches.Patch(facecolor=bg, edgecolor=border, label=label) for bg, border, label in model['legend']]
     
     # Lejant konumunu en alta al (footer gibi)
     # Axes coordinates: (0,0) sol alt, (1,1) sağ üst.
@@ -437,43 +105,39 @@ def draw_weekly_view(ax, data, week_start_date):
     ax.spines['left'].set_visible(False)
     ax.set_xticklabels([])
     ax.tick_params(axis='x', length=0)
+    if diagnostics.active():
+        diagnostics.count("patches", len(ax.patches))
 
-def draw_monthly_view(ax, data, year, month):
-    ax.set_title(f"{TR_MONTHS[month]} {year}", fontsize=24, pad=20)
+@diagnostics.timed("draw_monthly_view")
+def draw_monthly_view(ax, data, year, month, user_filter=None, model=None):
+    """
+    Aylık görünümü çizer (model: month_model.build_month_model çıktısı).
+    Hücrede günün toplantı sayısı; kişi filtresi yoksa en yoğun iki kişi de yazılır.
+    """
+    if model is None:
+        model = build_month_model(data, year, month, user_filter=user_filter)
+    ax.set_title(model['title'], fontsize=24, pad=20)
     ax.axis('off')
     
-    cal = calendar.monthcalendar(year, month)
-    
     # Tablo verilerini hazırla
     table_data = []
     # Gün başlıkları
     table_data.append(TR_DAYS)
     
     # Haftalar
-    for week in cal:
+    for week in model['weeks']:
         row = []
-        for day in week:
-            if day == 0:
+        for cell in week:
+            if cell is None:
                 row.append("")
+            elif cell.holiday:
+                row.append(f"{cell.day}\n" + textwrap.fill(cell.holiday, 16))
             else:
-                cell_text = f"{day}\n"
-                # O günün toplantılarını bul
-                current_date = datetime.date(year, month, day)
-                day_name = TR_DAYS[current_date.weekday()] # 0-6
-                
-                # O gün için geçerli toplantılar (sadece hafta içi)
-                if current_date.weekday() < 5: 
-                    # Bu haftanın başını bul (gösterim mantığı için)
-                    week_start = current_date - datetime.timedelta(days=current_date.weekday())
-                    
-                    count = 0
-                    for meeting in data['meetings']:
-                        if meeting['day'] == day_name and should_show_meeting(meeting, week_start):
-                            count += 1
-                    
-                    if count > 0:
-                        cell_text += f"\n{count} Toplantı"
-                
+                cell_text = f"{cell.day}\n"
+                if cell.count > 0:
+                    cell_text += f"\n{cell.count} Toplantı"
+                    if not user_filter and cell.people:
+                        cell_text += "\n" + ", ".join(f"{name} {n}" for name, n in cell.people[:2])
                 row.append(cell_text)
         table_data.append(row)
     
@@ -490,19 +154,123 @@ def draw_monthly_view(ax, data, year, month):
             cell.set_height(0.1)
         else:
             cell.set_height(0.15)
-            if j < 5: # Hafta içi
+            day_cell = model['weeks'][i - 1][j]
+            if day_cell is not None and day_cell.holiday:
+                cell.set_facecolor(HOLIDAY_COLOR)
+                cell.get_text().set_color('#D32F2F')
+            elif j < 5: # Hafta içi
                 cell.set_facecolor('#FFFFFF')
             else: # Hafta sonu
-                cell.set_facecolor('#F2F2F2')
-                
-            # Gün numarası bold olsun (basit regex veya split ile yapılabilir ama burada tüm text bold olur)
-            # Hücre içeriği karmaşık olduğu için bırakıyoruz.
+                cell.set_facecolor(WEEKEND_COLOR)
 
 def validate_data(data):
     if 'settings' not in data:
         raise ValueError("JSON verisinde 'settings' anahtarı eksik!")
 
-def generate_calendar_pdf(json_file='calendar_data.json', output_file='takvim_ciktisi.pdf', user_filter=None, data=None, start_date=None):
+# Bu sayıdan az sayfa için paralel çizim başlatılmaz (süreç açma maliyeti)
+PARALLEL_MIN_PAGES = 4
+
+# Toplu dışa aktarımda herkesin ortak takvimi için kullanılan ad
+ALL_PEOPLE_LABEL = "Tümü"
+
+# Çizim motorları: matplotlib (varsayılan) veya doğrudan SVG/PDF yazan vector_render
+BACKENDS = ("matplotlib", "vector")
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen çizim motoru: {backend} (seçenekler: {', '.join(BACKENDS)})")
+
+def _render_week_pdf_page(data, week_start_date, occurrences=None):
+    """Tek haftalık sayfayı ayrı bir PDF olarak çizip baytlarını döndürür (işçi süreçte çalışır)."""
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(16, 10))
+    draw_weekly_view(ax, data, week_start_date, occurrences=occurrences)
+    buf = io.BytesIO()
+    fig.savefig(buf, format='pdf')
+    plt.close(fig)
+    return buf.getvalue()
+
+def render_month_page(data, year, month, fmt='pdf', dpi=200, user_filter=None):
+    """Aylık görünümü tek sayfa olarak çizip baytlarını döndürür (işçi süreçte çalışabilir)."""
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(16, 10))
+    draw_monthly_view(ax, data, year, month, user_filter=user_filter)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    plt.close(fig)
+    return buf.getvalue()
+
+def _resolve_jobs(jobs, page_count):
+    """Kullanılacak işçi sayısı; 1 ise sıralı çizim yapılır."""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if page_count < PARALLEL_MIN_PAGES:
+        return 1
+    try:
+        import pypdf  # noqa: F401 (sayfaları birleştirmek için gerekli)
+    except ImportError:
+        return 1
+    return max(1, min(jobs, page_count))
+
+def _week_starts(start_date, weeks):
+    if start_date is None:
+        start_date = datetime.date.today()
+    week_start_date = start_date - datetime.timedelta(days=start_date.weekday())
+    return [week_start_date + datetime.timedelta(weeks=w) for w in range(weeks)]
+
+def _split_weeks(occurrences, week_starts):
+    """Sıralı tekrar listesini haftalara böler."""
+    first = week_starts[0].toordinal()
+    buckets = [[] for _ in week_starts]
+    for occ in occurrences:
+        w = (occ.date.toordinal() - first) // 7
+        if 0 <= w < len(buckets):
+            buckets[w].append(occ)
+    return buckets
+
+def render_pdf_pages(data, week_starts, jobs=None, week_occurrences=None):
+    """Haftalık sayfaları işçi süreçlerde çizer, sayfa sırasıyla PDF baytları listesi döndürür."""
+    from concurrent.futures import ProcessPoolExecutor
+    if week_occurrences is None:
+        week_occurrences = [None] * len(week_starts)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_render_week_pdf_page, [data] * len(week_starts), week_starts, week_occurrences))
+
+def merge_pdf_pages(pages, output):
+    """Tek sayfalık PDF baytlarını sırasıyla tek bir dosyada (yol veya dosya nesnesi) birleştirir."""
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    for page in pages:
+        writer.append(io.BytesIO(page))
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            writer.write(f)
+    else:
+        writer.write(output)
+
+def _write_sequential_pdf(data, week_starts, week_occurrences, output):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    with PdfPages(output) as pdf:
+        for current_week_start, occurrences in zip(week_starts, week_occurrences):
+            # Haftalık Görünüm
+            fig, ax = plt.subplots(figsize=(16, 10))
+            draw_weekly_view(ax, data, current_week_start, occurrences=occurrences)
+            pdf.savefig(fig)
+            plt.close()
+
+@diagnostics.timed("pdf")
+def generate_calendar_pdf(json_file='calendar_data.json', output_file='takvim_ciktisi.pdf', user_filter=None, data=None, start_date=None,
+                          weeks=4, jobs=1, backend="matplotlib"):
+    """
+    Haftalık sayfalardan oluşan PDF üretir.
+    weeks: Sayfa (hafta) sayısı
+    jobs: Paralel işçi süreç sayısı (1 = sıralı, None = CPU sayısı). Pano
+          tıklamaları süreç havuzu açmasın diye varsayılan sıralıdır; CLI
+          (takvim render) CPU sayısını verir.
+    backend: "matplotlib" veya "vector" (matplotlib'siz, sayfa başına çok daha hızlı)
+    """
+    _check_backend(backend)
     if data is None:
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -510,67 +278,171 @@ def generate_calendar_pdf(json_file='calendar_data.json', output_file='takvim_ci
     # Veri doğrulama
     validate_data(data)
     
-    # Kullanıcı Filtreleme
+    week_starts = _week_starts(start_date, weeks)
+    range_end = week_starts[-1] + datetime.timedelta(days=6)
+    
+    # Kullanıcı Filtreleme (Veri değiştirilmez, tekrarlar bir kez genişletilir)
+    occurrences = expand(data, week_starts[0], range_end, user_filter=user_filter)
     if user_filter:
-        filtered_meetings = []
-        for m in data['meetings']:
-            # Eğer kullanıcı "Tümü" ise veya toplantı katılımcılarında varsa
-            if user_filter in m.get('attendees', []):
-                filtered_meetings.append(m)
-        
-        data['meetings'] = filtered_meetings
-        print(f"Filtre uygulandı: {user_filter} ({len(filtered_meetings)} toplantı)")
+        meeting_count = sum(1 for m in data['meetings'] if user_filter in m.get('attendees', []))
+        print(f"Filtre uygulandı: {user_filter} ({meeting_count} toplantı)")
         
         # Dosya adına kişi ekle
         base, ext = os.path.splitext(output_file)
         output_file = f"{base}_{user_filter}{ext}"
 
-    # Tarih Ayarları
-    if start_date is None:
-        # Bugünün tarihi
-        today = datetime.date.today()
-    else:
-        today = start_date
-    
-    # Bu haftanın Pazartesisi
-    week_start_date = today - datetime.timedelta(days=today.weekday())
+    week_occurrences = _split_weeks(occurrences, week_starts)
+    jobs = _resolve_jobs(jobs, len(week_starts)) if backend == "matplotlib" else 1
     
     # PDF Oluştur
-    with PdfPages(output_file) as pdf:
-        # 4 Hafta Döngüsü
-        for w in range(4):
-            current_week_start = week_start_date + datetime.timedelta(weeks=w)
-            
-            # Haftalık Görünüm
-            fig, ax = plt.subplots(figsize=(16, 10))
-            draw_weekly_view(ax, data, current_week_start)
-            pdf.savefig(fig)
-            plt.close()
+    if backend == "vector":
+        render_weekly_pdf(data, week_starts, output_file, week_occurrences=week_occurrences)
+    elif jobs > 1:
+        # Paralel: her hafta ayrı süreçte çizilir, sayfa sırasıyla birleştirilir
+        merge_pdf_pages(render_pdf_pages(data, week_starts, jobs=jobs, week_occurrences=week_occurrences), output_file)
+    else:
+        _write_sequential_pdf(data, week_starts, week_occurrences, output_file)
 
     print(f"Takvim oluşturuldu: {output_file}")
     return output_file
 
-def get_weekly_calendar_figure(data, start_date=None, user_filter=None):
+def split_by_person(occurrences, targets):
+    """Tekrarları kişilere böler; ALL_PEOPLE_LABEL herkesin tüm tekrarlarını alır."""
+    by_person = {person: [] for person in targets}
+    by_person[ALL_PEOPLE_LABEL] = occurrences
+    for occ in occurrences:
+        for person in dict.fromkeys(occ.meeting.get('attendees', [])):
+            if person in by_person and person != ALL_PEOPLE_LABEL:
+                by_person[person].append(occ)
+    return by_person
+
+def iter_team_pdfs(data, week_starts, targets, jobs=1, backend="matplotlib"):
+    """
+    Her hedef kişi için haftalık PDF'i (kişi, bayt) olarak sırayla üretir.
+    Tekrarlar bir kez genişletilir ve katılımcılara bölünür; jobs > 1 (veya
+    None = CPU sayısı) ise tüm kişilerin sayfaları aynı süreç havuzunda
+    çizilir, her kişinin PDF'i tamamlandıkça döner.
+    """
+    _check_backend(backend)
+    range_end = week_starts[-1] + datetime.timedelta(days=6)
+    by_person = split_by_person(expand(data, week_starts[0], range_end), targets)
+    tasks = [(person, _split_weeks(by_person[person], week_starts)) for person in targets]
+    jobs = _resolve_jobs(jobs, len(targets) * len(week_starts)) if backend == "matplotlib" else 1
+
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map sırayı korur: sonuçlar geldikçe kişi kişi birleştirilir
+            page_args = [(person, ws, occ) for person, weeks_occ in tasks for ws, occ in zip(week_starts, weeks_occ)]
+            results = executor.map(_render_week_pdf_page, [data] * len(page_args),
+                                   [a[1] for a in page_args], [a[2] for a in page_args])
+            for person, _ in tasks:
+                pdf_buf = io.BytesIO()
+                merge_pdf_pages([next(results) for _ in week_starts], pdf_buf)
+                yield person, pdf_buf.getvalue()
+    else:
+        for person, weeks_occ in tasks:
+            pdf_buf = io.BytesIO()
+            if backend == "vector":
+                render_weekly_pdf(data, week_starts, pdf_buf, week_occurrences=weeks_occ)
+            else:
+                _write_sequential_pdf(data, week_starts, weeks_occ, pdf_buf)
+            yield person, pdf_buf.getvalue()
+
+@diagnostics.timed("team_pdf_zip")
+def generate_team_pdf_zip(data, output=None, start_date=None, weeks=4, people=None, jobs=1,
+                          base_name='takvim_ciktisi', backend="matplotlib"):
+    """
+    Herkes için (ve "Tümü" için) haftalık PDF'leri tek işte üretip bir ZIP'e yazar
+    (bkz. iter_team_pdfs).
+    output: ZIP yolu veya dosya nesnesi (None ise bayt döndürülür)
+    """
+    import zipfile
+    _check_backend(backend)
+    validate_data(data)
+    
+    if people is None:
+        people = [p['name'] if isinstance(p, dict) else p for p in data.get('people', [])]
+    targets = [ALL_PEOPLE_LABEL] + [p for p in people if p != ALL_PEOPLE_LABEL]
+    week_starts = _week_starts(start_date, weeks)
+    
+    buffer = io.BytesIO() if output is None else None
+    with zipfile.ZipFile(output if output is not None else buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for person, pdf in iter_team_pdfs(data, week_starts, targets, jobs=jobs, backend=backend):
+            zf.writestr(f"{base_name}_{person}.pdf", pdf)
+    
+    print(f"Toplu takvim paketi oluşturuldu: {len(targets)} PDF")
+    return buffer.getvalue() if buffer is not None else output
+
+def get_weekly_calendar_figure(data, start_date=None, user_filter=None, occurrences=None, backend="matplotlib"):
+    """
+    Haftalık görünümü döndürür.
+    backend="matplotlib": matplotlib Figure, backend="vector": SVG metni
+    """
+    _check_backend(backend)
     if start_date is None:
         start_date = datetime.date.today()
         
     # Bu haftanın Pazartesisi
     week_start_date = start_date - datetime.timedelta(days=start_date.weekday())
     
-    # Veri Filtreleme (Kopya üzerinde)
-    data_copy = json.loads(json.dumps(data)) # Deep copy to avoid modifying original data
-    
-    if user_filter:
-        filtered_meetings = []
-        for m in data_copy['meetings']:
-            if user_filter in m.get('attendees', []):
-                filtered_meetings.append(m)
-        data_copy['meetings'] = filtered_meetings
+    # Veri Filtreleme (Çizim veriyi değiştirmez, kopya gerekmez)
+    if occurrences is None:
+        week_end_date = week_start_date + datetime.timedelta(days=6)
+        occurrences = expand(data, week_start_date, week_end_date, user_filter=user_filter)
+
+    if backend == "vector":
+        return render_weekly_svg(data, week_start_date, occurrences=occurrences)
 
     # Figür oluştur
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(16, 10))
-    draw_weekly_view(ax, data_copy, week_start_date)
+    draw_weekly_view(ax, data, week_start_date, occurrences=occurrences)
     return fig
 
+def get_weekly_calendar_image(data, start_date=None, user_filter=None, occurrences=None, fmt='png', dpi=200, cache=None,
+                              backend="matplotlib"):
+    """
+    Haftalık görünümü PNG/SVG baytı olarak döndürür.
+    Aynı içerikli hafta önbellekten gelir; yalnızca değişen haftalar yeniden çizilir.
+    backend="vector" yalnızca fmt='svg' veya 'pdf' destekler.
+    """
+    _check_backend(backend)
+    if backend == "vector" and fmt not in ('svg', 'pdf'):
+        raise ValueError("Vektör çizim motoru yalnızca 'svg' ve 'pdf' çıktısı üretir.")
+    if start_date is None:
+        start_date = datetime.date.today()
+    week_start_date = start_date - datetime.timedelta(days=start_date.weekday())
+    
+    if occurrences is None:
+        week_end_date = week_start_date + datetime.timedelta(days=6)
+        occurrences = expand(data, week_start_date, week_end_date, user_filter=user_filter)
+    
+    if cache is None:
+        cache = default_cache()
+    key = weekly_render_key(data, week_start_date, occurrences, user_filter=user_filter, fmt=fmt, dpi=dpi,
+                            backend=backend)
+    
+    image = cache.get(key)
+    diagnostics.count("render_cache_hits" if image is not None else "render_cache_misses")
+    if image is None and backend == "vector":
+        if fmt == 'svg':
+            image = render_weekly_svg(data, week_start_date, occurrences=occurrences).encode('utf-8')
+        else:
+            buf = io.BytesIO()
+            render_weekly_pdf(data, [week_start_date], buf, week_occurrences=[occurrences])
+            image = buf.getvalue()
+        cache.put(key, image)
+    elif image is None:
+        import matplotlib.pyplot as plt
+        fig = get_weekly_calendar_figure(data, week_start_date, user_filter=user_filter, occurrences=occurrences)
+        buf = io.BytesIO()
+        with diagnostics.span("rasterize"):
+            fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+        image = buf.getvalue()
+        cache.put(key, image)
+    return image
+
 if __name__ == "__main__":
     generate_calendar_pdf()
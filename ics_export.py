@@ -0,0 +1,216 @@
+"""
+RRULE tabanlı ICS (iCalendar, RFC 5545) dışa aktarımı.
+
+Her toplantı serisi tek bir VEVENT olarak yazılır: tekrar kuralı RRULE ile
+(haftalık, iki haftada bir, ayın ilk <gün>ü, ayın son pazartesisi), tatile
+denk gelen tekrarlar EXDATE ile, katılımcılar kişi e-postalarından ATTENDEE
+satırlarıyla verilir. UID toplantı kimliğinden türetilir; aynı dosya tekrar
+içe aktarıldığında takvim uygulaması kayıtları çoğaltmaz, günceller.
+
+Çıktı satır satır üretilir (iter_ics); ara nesne oluşturulmaz.
+"""
+import datetime
+import threading
+from collections import OrderedDict
+
+from recurrence import (compile_meeting, holiday_ordinals, exception_ordinals, meeting_skip, get_holidays,
+                        KIND_WEEKLY, KIND_ONCE, KIND_MONTHLY_FIRST, KIND_MONTHLY_LAST)
+from storage import VERSION_KEY
+
+PRODID = "-//Takvim//Toplanti Takvimi//TR"
+UID_DOMAIN = "takvim"
+
+# Türkiye 2016'dan beri yaz saati uygulamıyor: sabit UTC+3
+TIMEZONE = "Europe/Istanbul"
+_VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TIMEZONE}",
+    "BEGIN:STANDARD",
+    "DTSTART:19700101T000000",
+    "TZOFFSETFROM:+0300",
+    "TZOFFSETTO:+0300",
+    "TZNAME:+03",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+)
+
+_BYDAY = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Açıklamaya yazılan çakışma notu sayısı (seri başına)
+MAX_CONFLICT_NOTES = 10
+
+# ics_for_range önbelleğinde tutulan en fazla (sürüm, aralık, kişi) sayısı
+ICS_CACHE_ENTRIES = 16
+
+
+def _escape(text):
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """RFC 5545 satır katlama: en fazla 75 bayt, devam satırları boşlukla başlar."""
+    raw = line.encode('utf-8')
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, current, size, limit = [], [], 0, 75
+    for ch in line:
+        width = len(ch.encode('utf-8'))
+        if size + width > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, 74  # Devam satırının ilk baytı boşluk
+        current.append(ch)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _local(date, minutes):
+    return f"{date.strftime('%Y%m%d')}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def _rrule(rule, count):
+    if rule.kind == KIND_WEEKLY:
+        interval = f";INTERVAL={rule.period}" if rule.period > 1 else ""
+        return f"RRULE:FREQ=WEEKLY{interval};BYDAY={_BYDAY[rule.weekday]};WKST=MO;COUNT={count}"
+    if rule.kind == KIND_MONTHLY_FIRST:
+        return f"RRULE:FREQ=MONTHLY;BYDAY=1{_BYDAY[rule.weekday]};COUNT={count}"
+    if rule.kind == KIND_MONTHLY_LAST:
+        return f"RRULE:FREQ=MONTHLY;BYDAY=-1{_BYDAY[rule.weekday]};COUNT={count}"
+    return None
+
+
+def _attendee_lines(meeting, people):
+    lines = []
+    for name in meeting.get('attendees', []):
+        person = people.get(name, {})
+        email = (person.get('email') or "").strip()
+        if email:
+            cn = person.get('fullname') or name
+            lines.append(f'ATTENDEE;CN="{cn}";ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION:mailto:{email}')
+    return lines
+
+
+def _conflict_notes(data, start, end, person):
+    """Toplantı id -> çakışma notları (tarih, diğer toplantı, ortak kişiler)."""
+    from conflicts import find_conflicts
+    notes = {}
+    for conf in find_conflicts(data, start, end, people=[person] if person else None):
+        for a, b in ((conf.first, conf.second), (conf.second, conf.first)):
+            notes.setdefault(a.meeting.get('id'), []).append(
+                f"{conf.date.isoformat()} {b.meeting['title']} ({', '.join(conf.people)})")
+    return notes
+
+
+def iter_ics(data, start, end, person=None, dtstamp=None, calendar_name="Toplantı Takvimi", conflicts=True):
+    """
+    start-end (dahil) aralığının ICS satırlarını (CRLF ile, katlanmış) üretir.
+    person verilirse yalnızca o kişinin katıldığı toplantılar yazılır. Her seri
+    aralıktaki ilk tekrarından başlar ve aralıktaki tekrar sayısı (COUNT) kadar
+    sürer. dtstamp verilmezse şimdiki zaman (UTC) kullanılır.
+    """
+    if dtstamp is None:
+        dtstamp = datetime.datetime.now(datetime.timezone.utc)
+    stamp = dtstamp.strftime("%Y%m%dT%H%M%SZ")
+    lo, hi = start.toordinal(), end.toordinal()
+    skip = holiday_ordinals(data)
+    cancelled = exception_ordinals(data)
+    people = {p['name']: p for p in data.get('people', []) if isinstance(p, dict)}
+    notes = _conflict_notes(data, start, end, person) if conflicts else {}
+
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH",
+              f"X-WR-CALNAME:{_escape(calendar_name)}", f"X-WR-TIMEZONE:{TIMEZONE}"]
+    for line in header:
+        yield _fold(line)
+    for line in _VTIMEZONE:
+        yield line + "\r\n"
+
+    # Tatiller (yalnızca aralıktakiler), tüm gün
+    for date_str, name in sorted(get_holidays(data).items()):
+        try:
+            date = datetime.date.fromisoformat(date_str)
+        except (ValueError, TypeError):
+            continue
+        if not lo <= date.toordinal() <= hi:
+            continue
+        for line in ("BEGIN:VEVENT", f"UID:tatil-{date_str}@{UID_DOMAIN}", f"DTSTAMP:{stamp}",
+                     f"DTSTART;VALUE=DATE:{date.strftime('%Y%m%d')}",
+                     f"DTEND;VALUE=DATE:{(date + datetime.timedelta(days=1)).strftime('%Y%m%d')}",
+                     f"SUMMARY:{_escape('Tatil: ' + name)}", "TRANSP:TRANSPARENT", "END:VEVENT"):
+            yield _fold(line)
+
+    # Toplantı serileri
+    for meeting in data.get('meetings', []):
+        if person and person not in meeting.get('attendees', []):
+            continue
+        rule = compile_meeting(meeting)
+        if rule.start_min is None:
+            continue
+        ordinals = list(rule.ordinals(lo, hi))
+        # Tatiller ve iptal edilen tekrarlar (data['exceptions']) EXDATE olarak yazılır
+        skip_days = meeting_skip(meeting, skip, cancelled)
+        exdates = [o for o in ordinals if o in skip_days]
+        if len(exdates) == len(ordinals):
+            continue  # Aralıkta gerçekleşen tekrarı yok
+
+        first = datetime.date.fromordinal(ordinals[0])
+        attendees = meeting.get('attendees', [])
+        description = f"Toplantı: {meeting['title']}\nKatılımcılar: {', '.join(attendees)}"
+        meeting_notes = notes.get(meeting.get('id'))
+        if meeting_notes:
+            shown = meeting_notes[:MAX_CONFLICT_NOTES]
+            more = len(meeting_notes) - len(shown)
+            description += "\n⚠️ Çakışma: " + "; ".join(shown) + (f" (+{more})" if more > 0 else "")
+
+        lines = ["BEGIN:VEVENT",
+                 f"UID:{meeting.get('id') or meeting['title']}@{UID_DOMAIN}",
+                 f"DTSTAMP:{stamp}",
+                 f"DTSTART;TZID={TIMEZONE}:{_local(first, rule.start_min)}",
+                 f"DTEND;TZID={TIMEZONE}:{_local(first, rule.end_min)}"]
+        if rule.kind != KIND_ONCE:
+            lines.append(_rrule(rule, len(ordinals)))
+        if exdates:
+            lines.append(f"EXDATE;TZID={TIMEZONE}:" +
+                         ",".join(_local(datetime.date.fromordinal(o), rule.start_min) for o in exdates))
+        lines += [f"SUMMARY:{_escape(meeting['title'])}", f"DESCRIPTION:{_escape(description)}"]
+        lines += _attendee_lines(meeting, people)
+        lines.append("END:VEVENT")
+        for line in lines:
+            yield _fold(line)
+
+    yield "END:VCALENDAR\r\n"
+
+
+def write_ics(stream, data, start, end, **options):
+    """ICS metnini ikili akışa (dosya, yanıt gövdesi) UTF-8 olarak yazar."""
+    for line in iter_ics(data, start, end, **options):
+        stream.write(line.encode('utf-8'))
+
+
+def ics_bytes(data, start, end, **options):
+    return "".join(iter_ics(data, start, end, **options)).encode('utf-8')
+
+
+_ICS_CACHE = OrderedDict()
+_ICS_LOCK = threading.Lock()
+
+
+def ics_for_range(data, start, end, person=None):
+    """
+    ics_bytes'ın (belge sürümü, aralık, kişi) ile saklanan sonucu (çakışma
+    notları dahil). Panonun indirme düğmesi her yeniden çalıştırmada baytları
+    ister; belge değişmedikçe dosya yeniden üretilmez.
+    """
+    key = (data.get(VERSION_KEY, 0), start, end, person)
+    with _ICS_LOCK:
+        content = _ICS_CACHE.get(key)
+        if content is not None:
+            _ICS_CACHE.move_to_end(key)
+            return content
+
+    content = ics_bytes(data, start, end, person=person)
+    with _ICS_LOCK:
+        _ICS_CACHE[key] = content
+        while len(_ICS_CACHE) > ICS_CACHE_ENTRIES:
+            _ICS_CACHE.popitem(last=False)
+    return content
@@ -0,0 +1,530 @@
+"""
+Outlook / Google Takvim .ics dosyalarından toplantı içe aktarma.
+
+Dosya satır satır okunur (katlanmış satırlar birleştirilerek); aynı anda
+yalnızca bir VEVENT bellekte tutulur, gereksiz özellikler (ATTACH, X-ALT-DESC
+gibi büyük alanlar) hiç biriktirilmez. Her seri toplantı modeline çevrilir:
+
+    FREQ=WEEKLY (INTERVAL 1/2, BYDAY)   -> Her Hafta / İki Haftada Bir (gün başına bir kayıt)
+    FREQ=DAILY;BYDAY=<hafta içi>        -> gün başına Her Hafta
+    FREQ=MONTHLY;BYDAY=1XX              -> Aylık (ayın ilk <gün>ü)
+    FREQ=MONTHLY;BYDAY=-1MO             -> Aylık (Son Pazartesi)
+
+Modelle ifade edilemeyen seriler tekrarlarına açılarak "Tek Seferlik"
+kayıtlar olur. Katılımcılar e-posta adreslerinden kişilere eşlenir. Seriler
+UID ile (ics_uid alanı) tanınır: aynı dosya tekrar içe aktarıldığında kayıtlar
+çoğaltılmaz, değişenler güncellenir. Tatile denk gelmeyen EXDATE'ler
+data['exceptions'] listesine toplantı kimliğiyle yazılır; tekrar genişletmesi
+(recurrence.exception_ordinals) bu tarihleri atlar.
+"""
+import io
+import re
+import heapq
+import datetime
+import itertools
+from collections import namedtuple
+from functools import lru_cache
+
+from bulk_import import RowError
+from meeting_table import DAYS
+from recurrence import compile_meeting, holiday_ordinals
+
+IcsImportResult = namedtuple('IcsImportResult', ['added', 'updated', 'one_offs', 'people', 'skipped', 'errors'])
+
+UID_FIELD = "ics_uid"
+OWN_UID_SUFFIX = "@takvim"
+
+# Saatler İstanbul yerel saatine çevrilir (sabit UTC+3)
+LOCAL_TZ = datetime.timezone(datetime.timedelta(hours=3))
+
+# Okunan özellikler; diğerleri (ve devam satırları) atlanır
+WANTED = frozenset(("UID", "SUMMARY", "DTSTART", "DTEND", "DURATION", "RRULE", "EXDATE",
+                    "RECURRENCE-ID", "ATTENDEE", "ORGANIZER", "STATUS"))
+
+# Tek mantıksal satır için üst sınır (bozuk dosyada belleği sınırlar)
+MAX_LINE = 64 * 1024
+
+# Tüm gün etkinlikleri (tatil, izin, doğum günü) toplantı değildir; sessizce atlanır
+ALL_DAY = "Tüm gün etkinliği"
+
+# İfade edilemeyen bir seriden en fazla bu kadar tek seferlik kayıt üretilir
+MAX_ONE_OFFS = 260
+
+_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+_NAME_RE = re.compile(r"[^;:]*")
+_BYDAY_RE = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+_DURATION_RE = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+# --- Okuma (akış) ---
+
+def _logical_lines(stream):
+    """Katlanmış satırları birleştirerek (satır no, satır) üretir; istenmeyen özellikler atlanır."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+    try:
+        pending, pending_no, keep = None, 0, False
+        for line_no, raw in enumerate(text, 1):
+            line = raw.rstrip("\r\n")
+            if line[:1] in (" ", "\t"):
+                if keep and pending is not None and len(pending) < MAX_LINE:
+                    pending += line[1:]
+                continue
+            if keep and pending:
+                yield pending_no, pending
+            name = _NAME_RE.match(line).group().upper()
+            keep = name in WANTED or name in ("BEGIN", "END")
+            pending, pending_no = (line if keep else None), line_no
+        if keep and pending:
+            yield pending_no, pending
+    finally:
+        text.detach()  # Çağıranın akışı kapatılmaz
+
+
+def _split(line):
+    """'AD;P1=a;P2="b:c":değer' -> (AD, {P1: a, P2: b:c}, değer)."""
+    head, _, value = line.partition(":")
+    if '"' not in head:
+        name, *parts = head.split(";")
+        params = {}
+        for part in parts:
+            key, _, val = part.partition("=")
+            params[key.upper()] = val
+        return name.upper(), params, value
+    quoted, cut = False, len(line)
+    for i, ch in enumerate(line):
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ':' and not quoted:
+            cut = i
+            break
+    head, value = line[:cut], line[cut + 1:]
+    parts, current, quoted = [], [], False
+    for ch in head:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ';' and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    params = {}
+    for part in parts[1:]:
+        key, _, val = part.partition("=")
+        params[key.upper()] = val.strip('"')
+    return parts[0].upper(), params, value
+
+
+def _unescape(value):
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def iter_events(stream):
+    """VEVENT'leri tek tek {özellik: [(parametreler, değer)]} sözlüğü olarak üretir (başlangıç satırıyla)."""
+    event, depth, start_no = None, 0, 0
+    for line_no, line in _logical_lines(stream):
+        name, params, value = _split(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and event is None:
+                event, depth, start_no = {}, 0, line_no
+            elif event is not None:
+                depth += 1  # VALARM gibi iç bileşenler
+        elif name == "END":
+            if event is not None:
+                if depth:
+                    depth -= 1
+                elif value.upper() == "VEVENT":
+                    yield start_no, event
+                    event = None
+        elif event is not None and not depth:
+            event.setdefault(name, []).append((params, value))
+
+
+# --- Değer dönüşümleri ---
+
+def _first(event, name):
+    values = event.get(name)
+    return values[0] if values else ({}, "")
+
+
+def _local_naive(dt):
+    return dt.astimezone(LOCAL_TZ).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=64)
+def _zone(tzid):
+    """TZID'yi saat dilimine çevirir; tanınmıyorsa (ör. Windows adları) None: saat olduğu gibi alınır."""
+    if not tzid:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(tzid)
+    except Exception:
+        return None
+
+
+def _datetime(params, value):
+    """Tarih/saat değeri -> yerel naive datetime veya (tüm gün için) date. Okunamazsa None."""
+    value = value.strip()
+    try:
+        date = datetime.date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+            return date
+        if value[8:9] != "T":
+            return None
+        local = datetime.datetime(date.year, date.month, date.day, int(value[9:11]), int(value[11:13]),
+                                  int(value[13:15] or 0))
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        return _local_naive(local.replace(tzinfo=datetime.timezone.utc))
+    zone = _zone(params.get("TZID"))
+    return _local_naive(local.replace(tzinfo=zone)) if zone else local
+
+
+def _duration(value):
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = datetime.timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                               minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def _exdates(event):
+    dates = set()
+    for params, value in event.get("EXDATE", []):
+        for part in value.split(","):
+            dt = _datetime(params, part)
+            if dt is not None:
+                dates.add(dt if isinstance(dt, datetime.date) and not isinstance(dt, datetime.datetime) else dt.date())
+    return dates
+
+
+def _rrule(value):
+    parts = {}
+    for part in value.split(";"):
+        key, _, val = part.partition("=")
+        if key:
+            parts[key.strip().upper()] = val.strip().upper()
+    return parts
+
+
+def _open_end(start):
+    """Bitişi belirtilmemiş seriler için bitiş: gelecek yılın sonu (başlangıçtan önce değil)."""
+    return max(start, datetime.date(datetime.date.today().year + 1, 12, 31))
+
+
+# --- Seri -> toplantı modeli ---
+
+def _plans(rule, start):
+    """RRULE modelle ifade edilebiliyorsa [(hafta günü, sıklık)], değilse None."""
+    allowed = {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL", "WKST", "BYSETPOS"}
+    if set(rule) - allowed:
+        return None
+    freq = rule.get("FREQ")
+    try:
+        interval = int(rule.get("INTERVAL") or 1)
+    except ValueError:
+        return None
+    bydays = []
+    for item in filter(None, (rule.get("BYDAY") or "").split(",")):
+        match = _BYDAY_RE.match(item)
+        if not match:
+            return None
+        bydays.append((int(match.group(1)) if match.group(1) else None, _CODES.index(match.group(2))))
+
+    if freq in ("WEEKLY", "DAILY"):
+        if "BYSETPOS" in rule or any(n is not None for n, _ in bydays):
+            return None
+        if freq == "DAILY" and (interval != 1 or not bydays):
+            return None  # Hafta sonları dahil günlük tekrar modelde yok
+        if interval not in (1, 2) or (interval == 2 and rule.get("WKST", "MO") != "MO"):
+            return None
+        weekdays = sorted({wd for _, wd in bydays}) or [start.weekday()]
+        if any(wd >= 5 for wd in weekdays):
+            return None
+        frequency = "Her Hafta" if interval == 1 else "İki Haftada Bir"
+        return [(wd, frequency) for wd in weekdays]
+
+    if freq == "MONTHLY" and interval == 1 and len(bydays) == 1:
+        n, weekday = bydays[0]
+        if "BYSETPOS" in rule:
+            if n is not None:
+                return None
+            try:
+                n = int(rule["BYSETPOS"])
+            except ValueError:
+                return None
+        if n == 1 and weekday < 5:
+            return [(weekday, "Aylık")]
+        if n == -1 and weekday == 0:
+            return [(0, "Aylık (Son Pazartesi)")]
+    return None
+
+
+def _meeting(title, attendees, weekday, start_min, end_min, frequency, start_date, end_date, uid):
+    return {
+        "title": title,
+        "attendees": attendees,
+        "day": DAYS[weekday],
+        "start_time": f"{start_min // 60:02d}:{start_min % 60:02d}",
+        "end_time": f"{end_min // 60:02d}:{end_min % 60:02d}",
+        "frequency": frequency,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        UID_FIELD: uid,
+    }
+
+
+def _end_by_count(meetings, count):
+    """Birleştirilmiş kuralların count'uncu tekrarının tarihi (yetmezse son tekrar)."""
+    streams = [compile_meeting(m).ordinals(datetime.date.fromisoformat(m['start_date']).toordinal(),
+                                           datetime.date(9999, 12, 31).toordinal()) for m in meetings]
+    last = None
+    for last in itertools.islice(heapq.merge(*streams), count):
+        pass
+    return datetime.date.fromordinal(last) if last is not None else None
+
+
+def _one_off_dates(rule_value, rule, start, exdates):
+    """İfade edilemeyen serinin tekrar tarihleri (hafta içi, EXDATE hariç, MAX_ONE_OFFS ile sınırlı)."""
+    try:
+        from dateutil.rrule import rrulestr
+    except ImportError:
+        return [start.date()]
+    parts = [p for p in rule_value.split(";") if p and not p.upper().startswith("UNTIL=")]
+    if "UNTIL" in rule:
+        until = _datetime({}, rule["UNTIL"])
+        if until is not None:
+            if not isinstance(until, datetime.datetime):
+                until = datetime.datetime.combine(until, datetime.time(23, 59, 59))
+            parts.append(f"UNTIL={until:%Y%m%dT%H%M%S}")
+    try:
+        occurrences = rrulestr(";".join(parts), dtstart=start)
+    except (ValueError, TypeError):
+        return [start.date()]
+    horizon = datetime.datetime.combine(_open_end(start.date()), datetime.time.max)
+    dates = []
+    for occ in occurrences:
+        if occ > horizon or len(dates) >= MAX_ONE_OFFS:
+            break
+        if occ.weekday() < 5 and occ.date() not in exdates:
+            dates.append(occ.date())
+    return dates
+
+
+def _times(event):
+    """(başlangıç, bitiş) yerel datetime; tüm gün/çok günlü/okunamayan etkinlikte (None, hata)."""
+    start = _datetime(*_first(event, "DTSTART"))
+    if start is None:
+        return None, "DTSTART okunamadı"
+    if not isinstance(start, datetime.datetime):
+        return None, ALL_DAY
+    if "DTEND" in event:
+        end = _datetime(*_first(event, "DTEND"))
+    elif "DURATION" in event:
+        delta = _duration(_first(event, "DURATION")[1])
+        end = start + delta if delta is not None else None
+    else:
+        end = None
+    if not isinstance(end, datetime.datetime) or end <= start:
+        return None, "Bitiş saati okunamadı"
+    if end.date() != start.date():
+        return None, "Birden fazla güne yayılan etkinlik"
+    if start.weekday() >= 5:
+        return None, "Hafta sonu etkinliği"
+    return (start, end), None
+
+
+def _attendees(event, by_email, new_people, add_people, taken_names):
+    names = []
+    for name in ("ORGANIZER", "ATTENDEE"):
+        for params, value in event.get(name, []):
+            email = value.strip()
+            if email[:7].lower() == "mailto:":
+                email = email[7:]
+            key = email.strip().casefold()
+            if not key:
+                continue
+            person = by_email.get(key)
+            if person is None and add_people:
+                cn = params.get("CN", "").strip() or email.split("@")[0]
+                short = cn.split()[0] if cn.split() else cn
+                candidate, n = short, 2
+                while candidate in taken_names:
+                    candidate, n = f"{short} {n}", n + 1
+                taken_names.add(candidate)
+                new_people.append({"name": candidate, "fullname": cn, "email": email})
+                person = by_email[key] = candidate
+            if person and person not in names:
+                names.append(person)
+    return names
+
+
+def _convert(event, uid, title, attendees, span, holidays):
+    """Seri -> (toplantılar, istisna tarihleri, tek seferlik kayıt sayısı)."""
+    start, end = span
+    start_min, end_min = start.hour * 60 + start.minute, end.hour * 60 + end.minute
+    exdates = _exdates(event)
+    rule_value = _first(event, "RRULE")[1]
+
+    if not rule_value:
+        meeting = _meeting(title, attendees, start.weekday(), start_min, end_min, "Tek Seferlik",
+                           start.date(), start.date(), uid)
+        return [meeting], [], 1
+
+    rule = _rrule(rule_value)
+    plans = _plans(rule, start.date())
+    if plans is None:
+        dates = _one_off_dates(rule_value, rule, start, exdates)
+        return [_meeting(title, attendees, d.weekday(), start_min, end_min, "Tek Seferlik", d, d, uid)
+                for d in dates], [], len(dates)
+
+    open_end = _open_end(start.date())
+    meetings = [_meeting(title, attendees, weekday, start_min, end_min, frequency, start.date(), open_end, uid)
+                for weekday, frequency in plans]
+    end_date = None
+    if "UNTIL" in rule:
+        until = _datetime({}, rule["UNTIL"])
+        end_date = until.date() if isinstance(until, datetime.datetime) else until
+    elif "COUNT" in rule and rule["COUNT"].isdigit():
+        end_date = _end_by_count(meetings, int(rule["COUNT"]))
+    if end_date is not None:
+        end_date = max(end_date, start.date())
+        for m in meetings:
+            m['end_date'] = end_date.isoformat()
+
+    exceptions = sorted(d for d in exdates if d.toordinal() not in holidays)
+    return meetings, exceptions, 0
+
+
+def _content(meetings):
+    return sorted(tuple(sorted((k, str(v)) for k, v in m.items() if k != 'id')) for m in meetings)
+
+
+def import_ics(data, files, add_people=False):
+    """
+    files: [(dosya adı, ikili akış)]. Serileri data'ya ekler veya (aynı UID)
+    günceller (yerinde) ve IcsImportResult döndürür. İçe aktarılamayan
+    etkinlikler errors'da raporlanır, diğerleri yine eklenir. add_people ise
+    tanınmayan e-postalar yeni kişi olarak eklenir, değilse katılımcı listesine
+    alınmaz.
+    """
+    from storage import new_meeting_id
+
+    by_email = {}
+    for p in data.get('people', []):
+        if isinstance(p, dict) and p.get('email'):
+            by_email.setdefault(p['email'].strip().casefold(), p['name'])
+    taken_names = {p['name'] if isinstance(p, dict) else p for p in data.get('people', [])}
+    own_ids = {m.get('id') for m in data.get('meetings', [])}
+    holidays = holiday_ordinals(data)
+
+    series = {}     # uid -> [toplantılar, istisna tarihleri]
+    overrides = []  # (kaynak, satır, uid, özgün tarih, iptal mi, (başlık, katılımcılar, aralık))
+    new_people, errors = [], []
+    one_offs = skipped = 0
+
+    for filename, stream in files:
+        for line_no, event in iter_events(stream):
+            uid = _first(event, "UID")[1].strip() or f"{filename}:{line_no}"
+            cancelled = _first(event, "STATUS")[1].strip().upper() == "CANCELLED"
+            title = _unescape(_first(event, "SUMMARY")[1]).strip() or "(Başlıksız)"
+            recurrence_id = _datetime(*_first(event, "RECURRENCE-ID")) if "RECURRENCE-ID" in event else None
+
+            span, problem = (None, None) if cancelled else _times(event)
+            if problem == ALL_DAY:
+                skipped += 1
+                continue
+            if problem:
+                errors.append(RowError(filename, line_no, [f"{title}: {problem}"]))
+                continue
+            attendees = [] if cancelled else _attendees(event, by_email, new_people, add_people, taken_names)
+
+            if recurrence_id is not None:
+                original = recurrence_id.date() if isinstance(recurrence_id, datetime.datetime) else recurrence_id
+                overrides.append((filename, line_no, uid, original, cancelled, (title, attendees, span)))
+            elif cancelled:
+                skipped += 1
+            else:
+                meetings, exceptions, count = _convert(event, uid, title, attendees, span, holidays)
+                if not meetings:
+                    errors.append(RowError(filename, line_no, [f"{title}: Hafta içi tekrarı yok"]))
+                    continue
+                series[uid] = [meetings, exceptions]
+                one_offs += count
+
+    # Tek tekrarı değiştirilmiş/iptal edilmiş seriler: özgün tarih istisna olur, yeni hali tek seferlik eklenir
+    for filename, line_no, uid, original, cancelled, (title, attendees, span) in overrides:
+        entry = series.get(uid)
+        if entry is None:
+            if cancelled:
+                skipped += 1
+                continue
+            uid = f"{uid}/{original.isoformat()}"
+            entry = series.setdefault(uid, [[], []])
+        elif span is not None:
+            master = entry[0][0]
+            if (span[0].date() == original and span[0].strftime("%H:%M") == master['start_time']
+                    and span[1].strftime("%H:%M") == master['end_time'] and title == master['title']):
+                continue  # Yalnızca modelde tutulmayan alanlar (açıklama, yer) değişmiş
+        kept = [m for m in entry[0] if m['frequency'] != "Tek Seferlik" or m['start_date'] != original.isoformat()]
+        if len(kept) < len(entry[0]):
+            entry[0][:] = kept  # Açılmış serinin o günkü tekrarı
+        elif original.toordinal() not in holidays and entry[0]:
+            entry[1].append(original)
+        if not cancelled:
+            start, end = span
+            if not attendees and entry[0]:
+                attendees = entry[0][0]['attendees']  # Katılımcı listesi tekrarlanmamışsa seriden
+            entry[0].append(_meeting(title, attendees, start.weekday(), start.hour * 60 + start.minute,
+                                     end.hour * 60 + end.minute, "Tek Seferlik", start.date(), start.date(), uid))
+            one_offs += 1
+
+    # UID ile eşleştirme: aynı içerik atlanır, değişen seri aynı kimliklerle güncellenir
+    meetings = list(data.get('meetings', []))
+    positions = {}
+    for i, m in enumerate(meetings):
+        if m.get(UID_FIELD):
+            positions.setdefault(m[UID_FIELD], []).append(i)
+    exceptions = list(data.get('exceptions', []))
+    replaced_ids, removed, added, updated = set(), set(), 0, 0
+
+    for uid, (new_meetings, dates) in series.items():
+        if uid.endswith(OWN_UID_SUFFIX) and uid[:-len(OWN_UID_SUFFIX)] in own_ids:
+            skipped += 1  # Bu takvimden dışa aktarılmış seri
+            continue
+        old = positions.get(uid, [])
+        if old and _content(meetings[i] for i in old) == _content(new_meetings):
+            skipped += 1
+            continue
+        ids = [meetings[i]['id'] for i in old]
+        replaced_ids.update(ids)
+        for i, meeting in itertools.zip_longest(old, new_meetings):
+            if meeting is None:
+                removed.add(i)
+                continue
+            meeting['id'] = ids.pop(0) if ids else new_meeting_id()
+            if i is None:
+                meetings.append(meeting)
+            else:
+                meetings[i] = meeting
+        by_day = {m['day']: m for m in reversed(new_meetings) if m['frequency'] != "Tek Seferlik"}
+        for d in sorted(set(dates)):
+            owner = by_day.get(DAYS[d.weekday()] if d.weekday() < 5 else None, new_meetings[0])
+            exceptions.append({"date": d.isoformat(), "meeting_title": owner['title'], "meeting_id": owner['id']})
+        if old:
+            updated += 1
+        else:
+            added += 1
+
+    if added or updated:
+        data['meetings'] = [m for i, m in enumerate(meetings) if i not in removed]
+        # Güncellenen serilerin eski istisnaları yenileriyle değişir
+        fresh = len(data.get('exceptions', []))
+        data['exceptions'] = [e for e in exceptions[:fresh] if e.get('meeting_id') not in replaced_ids] + exceptions[fresh:]
+    if new_people:
+        data.setdefault('people', []).extend(new_people)
+    return IcsImportResult(added, updated, one_offs, len(new_people), skipped, errors)
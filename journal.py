@@ -0,0 +1,419 @@
+"""
+Değişiklik günlüğü (journal) ile kalıcılık.
+
+Her kayıt, önceki belgeyle yeni belge arasındaki farkı küçük işlemler
+(toplantı/kişi/istisna ekle-güncelle-sil, tatil ekle-sil, ayar değiştir) olarak
+günlük dosyasına tek satır JSON halinde ekler; kayıt maliyeti değişikliğin
+boyutu kadardır. Her SNAPSHOT_EVERY işlemde bir anlık görüntü alınır:
+
+    calendar_data.json                     güncel anlık görüntü (journal_seq ile)
+    calendar_data.journal/<seq>.log        anlık görüntüden sonraki kayıtlar (segment)
+    calendar_data.journal/snapshots/<seq>.json.gz   geçmiş anlık görüntüler
+
+Herhangi bir sıra numarasına (seq) geri dönmek için o numaradan önceki en
+yakın anlık görüntü alınır ve kayıtlar o numaraya kadar yeniden oynatılır.
+fsync çağrıları gruplanır (FSYNC_INTERVAL / FSYNC_BATCH); anlık görüntü
+alınırken ve süreç kapanırken bekleyenler diske zorlanır.
+"""
+import os
+import json
+import gzip
+import time
+import atexit
+import difflib
+import datetime
+import threading
+
+SEQ_KEY = "journal_seq"
+
+# Anlık görüntü aralığı (işlem sayısı)
+SNAPSHOT_EVERY = 200
+
+# fsync gruplama: en geç bu kadar saniyede veya bu kadar kayıtta bir
+FSYNC_INTERVAL = 1.0
+FSYNC_BATCH = 32
+
+# Sıralı listeler (indeksle adreslenir) ve sözlük koleksiyonları
+LIST_COLLECTIONS = ("meetings", "people", "exceptions")
+DICT_COLLECTIONS = ("holidays",)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _copy(value):
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def journal_dir(json_file):
+    return os.path.splitext(json_file)[0] + '.journal'
+
+
+# --- Fark ve Uygulama ---
+
+def _diff_list(name, old, new):
+    """İki liste arasındaki farkı, sondan başa uygulanacak indeksli işlemler olarak döndürür."""
+    old_keys = [_dumps(item) for item in old]
+    new_keys = [_dumps(item) for item in new]
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == 'equal':
+            continue
+        common = min(i2 - i1, j2 - j1)
+        for k in range(common):
+            ops.append({"op": f"{name}.update", "i": i1 + k, "v": new[j1 + k]})
+        for i in range(i2 - 1, i1 + common - 1, -1):
+            ops.append({"op": f"{name}.delete", "i": i})
+        for k in range(common, j2 - j1):
+            ops.append({"op": f"{name}.add", "i": i1 + k, "v": new[j1 + k]})
+    return ops
+
+
+def diff_documents(old, new):
+    """old belgesini new belgesine dönüştüren işlem listesi."""
+    ops = []
+    for name in LIST_COLLECTIONS:
+        if old.get(name, []) != new.get(name, []):
+            ops += _diff_list(name, old.get(name, []), new.get(name, []))
+    for name in DICT_COLLECTIONS:
+        old_items, new_items = old.get(name, {}), new.get(name, {})
+        for key in old_items.keys() - new_items.keys():
+            ops.append({"op": f"{name}.delete", "k": key})
+        for key, value in new_items.items():
+            if old_items.get(key, object()) != value:
+                ops.append({"op": f"{name}.set", "k": key, "v": value})
+    if old.get('settings') != new.get('settings'):
+        ops.append({"op": "settings.set", "v": new.get('settings', {})})
+    known = set(LIST_COLLECTIONS + DICT_COLLECTIONS + ('settings', SEQ_KEY))
+    for key in old.keys() - new.keys() - known:
+        ops.append({"op": "doc.delete", "k": key})
+    for key in new.keys() - known:
+        if old.get(key, object()) != new[key]:
+            ops.append({"op": "doc.set", "k": key, "v": new[key]})
+    return ops
+
+
+def apply_ops(doc, ops):
+    """İşlemleri belgeye yerinde uygular."""
+    for op in ops:
+        target, action = op['op'].split('.')
+        if target in LIST_COLLECTIONS:
+            items = doc.setdefault(target, [])
+            if action == 'add':
+                items.insert(op['i'], op['v'])
+            elif action == 'update':
+                items[op['i']] = op['v']
+            elif action == 'delete':
+                del items[op['i']]
+        elif target in DICT_COLLECTIONS:
+            items = doc.setdefault(target, {})
+            if action == 'set':
+                items[op['k']] = op['v']
+            else:
+                items.pop(op['k'], None)
+        elif target == 'settings':
+            doc['settings'] = op['v']
+        elif target == 'doc':
+            if action == 'set':
+                doc[op['k']] = op['v']
+            else:
+                doc.pop(op['k'], None)
+        else:
+            raise ValueError(f"Bilinmeyen günlük işlemi: {op['op']}")
+    return doc
+
+
+def describe_ops(ops):
+    """Geçmiş listesinde gösterilecek kısa özet (ör. 'meetings.update ×1, holidays.set ×2')."""
+    counts = {}
+    for op in ops:
+        counts[op['op']] = counts.get(op['op'], 0) + 1
+    return ", ".join(f"{name} ×{count}" for name, count in counts.items())
+
+
+# --- Günlük ---
+
+class Journal:
+    """Bir takvim dosyası için günlük + anlık görüntü deposu."""
+
+    def __init__(self, json_file, snapshot_every=SNAPSHOT_EVERY):
+        self.json_file = json_file
+        self.dir = journal_dir(json_file)
+        self.snapshot_dir = os.path.join(self.dir, 'snapshots')
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self._open()
+
+    # Segmentler ve anlık görüntüler sıra numarasıyla adlandırılır (sıfır dolgulu)
+    def _segments(self):
+        return sorted(int(f[:-4]) for f in os.listdir(self.dir) if f.endswith('.log'))
+
+    def _segment_path(self, start_seq):
+        return os.path.join(self.dir, f"{start_seq:012d}.log")
+
+    def _snapshot_path(self, seq):
+        return os.path.join(self.snapshot_dir, f"{seq:012d}.json.gz")
+
+    def _snapshots(self):
+        return sorted(int(f[:-8]) for f in os.listdir(self.snapshot_dir) if f.endswith('.json.gz'))
+
+    def _open(self):
+        # Anlık görüntü göç ettirilmeden okunur: şema göçü de (storage) günlüğe
+        # bir kayıt olarak eklenir, anlık görüntünün altındaki kayıtlar değişmez
+        from storage import empty_data
+        try:
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = empty_data()
+        self.seq = self.snapshot_seq = state.pop(SEQ_KEY, 0)
+        self.state = state
+        if self.snapshot_seq not in self._snapshots():
+            self._write_gzip_snapshot(self.snapshot_seq, state)
+
+        # Anlık görüntüden sonraki kayıtları içeren ilk segmentten itibaren oku
+        segments = self._segments()
+        starts = [s for s in segments if s <= self.seq + 1]
+        self._segment = starts[-1] if starts else self.seq + 1
+        self._offset = 0
+        self._catch_up()
+        self.ops_since_snapshot = 0
+
+    def _read_segment(self, start_seq, offset=0):
+        """Segmentteki tamamlanmış satırları (kayıt, satır sonu ofseti) olarak üretir."""
+        path = self._segment_path(start_seq)
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Yarım kalmış son satır (çökme) yok sayılır
+                offset += len(line)
+                yield json.loads(line), offset
+
+    def _catch_up(self):
+        """Başka süreçlerin eklediği kayıtları bellekteki duruma uygular."""
+        while True:
+            for record, offset in self._read_segment(self._segment, self._offset):
+                self._offset = offset
+                if record['seq'] > self.seq:
+                    apply_ops(self.state, record['ops'])
+                    self.seq = record['seq']
+            later = [s for s in self._segments() if s > self._segment]
+            if not later:
+                return
+            self._close_file()
+            self._segment, self._offset = later[0], 0
+
+    def _close_file(self):
+        if self._file is not None:
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+    def _fsync(self):
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._fsync()
+
+    def load(self):
+        """Güncel belgenin bağımsız bir kopyası."""
+        with self._lock:
+            self._catch_up()
+            return _copy(self.state)
+
+    def version(self):
+        """Güncel belgenin sürümü (doc_version)."""
+        from storage import VERSION_KEY
+        with self._lock:
+            self._catch_up()
+            return self.state.get(VERSION_KEY, 0)
+
+    def save(self, data, expected_version=None):
+        """
+        Farkı günlüğe ekler; yeni sıra numarasını döndürür (fark yoksa mevcut numara).
+        expected_version verilirse ve güncel belgenin sürümü farklıysa ya da aynı
+        sıra numarasını başka bir süreç yazıyorsa None döner.
+        """
+        from storage import VERSION_KEY
+        with self._lock:
+            self._catch_up()
+            if expected_version is not None and self.state.get(VERSION_KEY, 0) != expected_version:
+                return None
+            ops = diff_documents(self.state, data)
+            if not ops:
+                return self.seq
+
+            claim = self._claim(self.seq + 1)
+            if claim is None:
+                return None
+            try:
+                # Talep alınmadan hemen önce başka bir süreç yazmış olabilir
+                seq = self.seq
+                self._catch_up()
+                if self.seq != seq:
+                    return None
+                self._append(ops)
+                if self.ops_since_snapshot >= self.snapshot_every:
+                    self._snapshot()
+                return self.seq
+            finally:
+                _release(claim)
+
+    def _claim(self, seq):
+        """
+        seq numaralı kaydı yazma hakkı (O_EXCL talep dosyası); başka bir süreç
+        tutuyorsa None. Süresi dolmuş (çökmüş yazara ait) talepler kaldırılır.
+        """
+        from storage import CLAIM_TIMEOUT
+        path = os.path.join(self.dir, f"{seq:012d}.claim")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return path
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > CLAIM_TIMEOUT:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+
+    def _append(self, ops):
+        record = {"seq": self.seq + 1, "ts": datetime.datetime.now().isoformat(timespec='seconds'), "ops": ops}
+        line = _dumps(record) + "\n"
+        if self._file is None:
+            self._file = open(self._segment_path(self._segment), 'ab')
+        self._file.write(line.encode('utf-8'))
+        self._file.flush()
+        self._offset = self._file.tell()
+        self._pending += 1
+        if self._pending >= FSYNC_BATCH or time.monotonic() - self._last_fsync >= FSYNC_INTERVAL:
+            self._fsync()
+
+        # Serileştirilmiş satırdan uygulanır: durum çağıranın nesnelerini paylaşmaz
+        apply_ops(self.state, json.loads(line)['ops'])
+        self.seq = record['seq']
+        self.ops_since_snapshot += len(ops)
+
+    def snapshot(self):
+        with self._lock:
+            while True:
+                self._catch_up()
+                claim = self._claim(self.seq + 1)
+                if claim is not None:
+                    break
+                time.sleep(0.01)
+            try:
+                self._catch_up()
+                self._snapshot()
+            finally:
+                _release(claim)
+
+    def _snapshot(self):
+        """Güncel durumu calendar_data.json'a ve geçmiş arşivine yazar, yeni segment başlatır."""
+        from storage import write_json_atomic
+        self._close_file()
+        doc = dict(self.state)
+        doc[SEQ_KEY] = self.seq
+        write_json_atomic(doc, self.json_file)
+        self._write_gzip_snapshot(self.seq, self.state)
+        self.snapshot_seq = self.seq
+        self._segment, self._offset = self.seq + 1, 0
+        # Yeni segment hemen oluşturulur: eski segmentte bekleyen diğer süreçler
+        # bir sonraki kayıttan önce ona geçer
+        open(self._segment_path(self._segment), 'ab').close()
+        self.ops_since_snapshot = 0
+
+    def _write_gzip_snapshot(self, seq, state):
+        tmp_path = f"{self._snapshot_path(seq)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self._snapshot_path(seq))
+
+    def _records(self, after_seq, until_seq=None):
+        """after_seq'ten sonraki kayıtlar (until_seq dahil)."""
+        segments = self._segments()
+        starts = [s for s in segments if s <= after_seq + 1]
+        first = starts[-1] if starts else (segments[0] if segments else None)
+        for start_seq in segments:
+            if first is None or start_seq < first:
+                continue
+            for record, _ in self._read_segment(start_seq):
+                if record['seq'] <= after_seq:
+                    continue
+                if until_seq is not None and record['seq'] > until_seq:
+                    return
+                yield record
+
+    def restore(self, seq):
+        """seq numaralı kayıttan hemen sonraki belgeyi döndürür (kaydetmez)."""
+        with self._lock:
+            self._fsync()
+            base = [s for s in self._snapshots() if s <= seq]
+            if not base:
+                raise ValueError(f"{seq} numarasından önce anlık görüntü yok.")
+            with gzip.open(self._snapshot_path(base[-1]), 'rt', encoding='utf-8') as f:
+                doc = json.load(f)
+            for record in self._records(base[-1], seq):
+                apply_ops(doc, record['ops'])
+            return doc
+
+    def history(self, limit=50):
+        """
+        En yeni kayıtlar: [(seq, zaman, özet)], yeniden eskiye. Segmentler
+        sondan başa okunur; limit dolunca daha eski segmentler açılmaz.
+        """
+        with self._lock:
+            self._fsync()
+            snapshots = self._snapshots()
+            oldest = snapshots[0] if snapshots else 0
+            records = []
+            for start_seq in reversed(self._segments()):
+                segment = [r for r, _ in self._read_segment(start_seq) if r['seq'] > oldest]
+                records.extend(reversed(segment))
+                if len(records) >= limit or start_seq <= oldest + 1:
+                    break
+        return [(r['seq'], r['ts'], describe_ops(r['ops'])) for r in records[:limit]]
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+
+def _release(claim):
+    try:
+        os.remove(claim)
+    except FileNotFoundError:
+        pass
+
+
+# Süreç içi günlükler (Streamlit yeniden çalıştırmaları arasında korunur)
+_JOURNALS = {}
+
+
+def open_journal(json_file):
+    path = os.path.abspath(json_file)
+    journal = _JOURNALS.get(path)
+    if journal is None:
+        journal = Journal(json_file)
+        _JOURNALS[path] = journal
+    return journal
+
+
+@atexit.register
+def _flush_all():
+    for journal in _JOURNALS.values():
+        journal.close()
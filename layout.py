@@ -0,0 +1,83 @@
+"""
+Gün içi yerleşim (layout) motoru.
+
+Bir günün zaman aralıklarını alır ve her biri için (sütun, genişlik, toplam
+sütun) geometrisini döndürür. Çizim kütüphanesinden bağımsızdır; matplotlib,
+SVG/HTML ve PDF çizicileri aynı sonucu kullanır.
+
+- Gruplama: Birbirine zincirleme çakışan aralıklar aynı gruba girer.
+- Sütun atama (Packing): Boşalan en küçük sütun bir heap'ten alınır.
+- Genişleme (Smart Expansion): Sağdaki sütun boşsa kutu genişler; her sütunda
+  aralıklar sıralı olduğundan doluluk kontrolü bisect ile yapılır.
+"""
+import heapq
+from bisect import bisect_left
+from collections import namedtuple
+
+Placement = namedtuple('Placement', ['column', 'span', 'total_cols'])
+
+
+def _layout_group(intervals, members, placements):
+    active = []   # (bitiş, sütun)
+    free = []     # boşalan sütunlar (küçükten büyüğe)
+    col_starts = []
+    col_ends = []
+    columns = {}
+
+    # 1. Sütun Atama (Packing)
+    for i in members:
+        start, end = intervals[i]
+        while active and active[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        if free:
+            col = heapq.heappop(free)
+        else:
+            col = len(col_starts)
+            col_starts.append([])
+            col_ends.append([])
+        columns[i] = col
+        col_starts[col].append(start)
+        col_ends[col].append(end)
+        heapq.heappush(active, (end, col))
+
+    total_cols = len(col_starts)
+
+    # 2. Genişleme Mantığı (Smart Expansion)
+    for i in members:
+        start, end = intervals[i]
+        col = columns[i]
+        span = 1
+        for check_col in range(col + 1, total_cols):
+            # Bu sütunda 'end'den önce başlayan son aralık tek adaydır
+            k = bisect_left(col_starts[check_col], end) - 1
+            if k >= 0 and max(start, col_starts[check_col][k]) < min(end, col_ends[check_col][k]):
+                break
+            span += 1
+        placements[i] = Placement(col, span, total_cols)
+
+
+def layout_day(intervals):
+    """
+    intervals: [(başlangıç, bitiş), ...] (dakika)
+    Girdi sırasıyla Placement(column, span, total_cols) listesi döndürür.
+    """
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    placements = [None] * len(intervals)
+
+    # Gruplama Algoritması (Çakışan Grupları Bul)
+    group = []
+    group_end = None
+    for i in order:
+        start, end = intervals[i]
+        if group and start < group_end:
+            group.append(i)
+            group_end = max(group_end, end)
+        else:
+            if group:
+                _layout_group(intervals, group, placements)
+            group = [i]
+            group_end = end
+    if group:
+        _layout_group(intervals, group, placements)
+
+    return placements
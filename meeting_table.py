@@ -0,0 +1,182 @@
+"""
+Takvim Yönetimi toplantı tablosu: filtreleme, sayfalama ve toplu düzenleme.
+
+Filtreler sunucu tarafında uygulanır ve tabloya (st.data_editor) yalnızca
+geçerli sayfanın satırları gönderilir; sayfa ağırlığı toplantı sayısından
+bağımsızdır. Tablodaki değişiklikler satır satır doğrulanır, hepsi geçerliyse
+tek bir kayıtla yazılır.
+"""
+import datetime
+
+DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+FREQUENCIES = ["Tek Seferlik", "Her Hafta", "İki Haftada Bir", "Aylık", "Aylık (Son Pazartesi)"]
+
+PAGE_SIZES = (25, 50, 100)
+
+DELETE_COLUMN = "Sil"
+ID_COLUMN = "id"
+
+
+def filter_meetings(meetings, text="", day=None, person=None, frequency=None):
+    """Başlıkta geçen metin, gün, katılımcı ve sıklığa göre süzülmüş toplantılar."""
+    text = text.strip().casefold()
+    result = []
+    for m in meetings:
+        if text and text not in m.get('title', '').casefold():
+            continue
+        if day and m.get('day') != day:
+            continue
+        if person and person not in m.get('attendees', []):
+            continue
+        if frequency and m.get('frequency') != frequency:
+            continue
+        result.append(m)
+    return result
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def paginate(items, page, page_size):
+    """1'den başlayan page numaralı sayfanın öğeleri (sayfa aralık dışındaysa son sayfa)."""
+    page = min(max(1, page), page_count(len(items), page_size))
+    return items[(page - 1) * page_size:page * page_size]
+
+
+def _parse_date(value, default=None):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return default
+
+
+def to_rows(meetings, attendees_as_list=True):
+    """Toplantıları tablo satırlarına çevirir (tarihler date, katılımcılar liste veya metin)."""
+    rows = []
+    for m in meetings:
+        attendees = list(m.get('attendees', []))
+        rows.append({
+            ID_COLUMN: m['id'],
+            DELETE_COLUMN: False,
+            "Başlık": m.get('title', ''),
+            "Gün": m.get('day', ''),
+            "Başlangıç": m.get('start_time', ''),
+            "Bitiş": m.get('end_time', ''),
+            "Sıklık": m.get('frequency', ''),
+            "Katılımcılar": attendees if attendees_as_list else ", ".join(attendees),
+            "Başlangıç Tarihi": _parse_date(m.get('start_date')),
+            "Bitiş Tarihi": _parse_date(m.get('end_date')),
+        })
+    return rows
+
+
+def _valid_time(value):
+    try:
+        datetime.datetime.strptime(value, "%H:%M")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _attendee_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [p.strip() for p in value.split(",") if p.strip()]
+    return [str(p) for p in value]
+
+
+def row_to_meeting(row, original, people_names):
+    """
+    Düzenlenmiş satırdan toplantı kaydı ve hata listesi. Tabloda bulunmayan
+    alanlar (ör. içe aktarmadan gelenler) özgün kayıttan korunur.
+    """
+    errors = []
+    title = str(row.get("Başlık") or "").strip()
+    if not title:
+        errors.append("Başlık boş olamaz")
+
+    day = row.get("Gün")
+    if day not in DAYS:
+        errors.append(f"Geçersiz gün: {day}")
+
+    start_time, end_time = str(row.get("Başlangıç") or "").strip(), str(row.get("Bitiş") or "").strip()
+    if not _valid_time(start_time) or not _valid_time(end_time):
+        errors.append("Saat formatı hatalı (HH:MM)")
+    elif end_time <= start_time:
+        errors.append("Bitiş saati başlangıçtan büyük olmalı")
+
+    frequency = row.get("Sıklık")
+    if frequency not in FREQUENCIES:
+        errors.append(f"Geçersiz sıklık: {frequency}")
+
+    attendees = _attendee_list(row.get("Katılımcılar"))
+    unknown = [p for p in attendees if p not in people_names]
+    if unknown:
+        errors.append(f"Tanımsız katılımcı: {', '.join(unknown)}")
+
+    start_date = _parse_date(row.get("Başlangıç Tarihi"))
+    end_date = _parse_date(row.get("Bitiş Tarihi"))
+    if start_date is None or end_date is None:
+        errors.append("Tarih hatalı (YYYY-AA-GG)")
+    elif end_date < start_date:
+        errors.append("Bitiş tarihi başlangıçtan önce olamaz")
+
+    meeting = dict(original)
+    meeting.update({
+        "title": title,
+        "day": day,
+        "start_time": start_time,
+        "end_time": end_time,
+        "frequency": frequency,
+        "attendees": attendees,
+    })
+    if start_date is not None:
+        meeting['start_date'] = start_date.strftime("%Y-%m-%d")
+    if end_date is not None:
+        meeting['end_date'] = end_date.strftime("%Y-%m-%d")
+    return meeting, errors
+
+
+def _clean(row):
+    """Tablodan dönen boş hücreler (NaN/NaT) None olur."""
+    return {k: None if v is None or (not isinstance(v, (str, list, tuple)) and v != v) else v
+            for k, v in row.items()}
+
+
+def apply_edits(data, rows, people_names):
+    """
+    Tablo satırlarını (id ile) veriye uygular: değişen toplantılar yenisiyle
+    değiştirilir, "Sil" işaretliler çıkarılır. Herhangi bir satır geçersizse
+    veri değiştirilmez. (güncellenen, silinen, {toplantı başlığı: hatalar}) döner.
+    """
+    positions = {m['id']: i for i, m in enumerate(data.get('meetings', []))}
+    updates, deletes, errors = {}, set(), {}
+    for row in map(_clean, rows):
+        pos = positions.get(row.get(ID_COLUMN))
+        if pos is None:
+            continue
+        original = data['meetings'][pos]
+        if row.get(DELETE_COLUMN):
+            deletes.add(pos)
+            continue
+        meeting, row_errors = row_to_meeting(row, original, people_names)
+        if meeting == original:
+            continue  # Değişmeyen satırlar doğrulanmaz (eski kayıtlar kaydı engellemesin)
+        if row_errors:
+            errors[f"{original.get('title', '')} ({original.get('day', '')} {original.get('start_time', '')})"] = row_errors
+        else:
+            updates[pos] = meeting
+
+    if errors:
+        return 0, 0, errors
+    for pos, meeting in updates.items():
+        data['meetings'][pos] = meeting
+    if deletes:
+        data['meetings'] = [m for i, m in enumerate(data['meetings']) if i not in deletes]
+    return len(updates), len(deletes), errors
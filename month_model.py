@@ -0,0 +1,157 @@
+"""
+Aylık görünüm ve yıl/çeyrek özetinin çizim kütüphanesinden bağımsız modeli.
+
+count_by_day() tek bir aralık genişletmesiyle gün başına toplantı sayısını ve
+kişi dağılımını çıkarır. build_month_model() bir ayın hücrelerini,
+build_overview_model() birden çok ayın (çeyrek: 3, yıl: 12) mini takvimlerini
+aynı sayımdan üretir. matplotlib (draw_monthly_view) ve vektör
+(vector_render.draw_overview_vector) çizicileri bu modelleri çizer.
+"""
+import calendar
+import datetime
+from collections import namedtuple
+
+import diagnostics
+from recurrence import TR_MONTHS, compile_meeting, get_holidays, holiday_ordinals, exception_ordinals, meeting_skip
+
+# total: {ordinal: sayı}, people: {ordinal: {kişi: sayı}}, person_totals: {kişi: sayı}
+DayCounts = namedtuple('DayCounts', ['total', 'people', 'person_totals'])
+
+# people: O günün kişi dağılımı [(kişi, sayı)], çoktan aza
+MonthCell = namedtuple('MonthCell', ['day', 'date', 'count', 'people', 'holiday', 'weekend'])
+
+QUARTERS = (1, 2, 3, 4)
+
+# Yoğunluk (ısı) renkleri: 0 = toplantı yok, 5 = en yoğun gün
+HEAT_COLORS = ["#FFFFFF", "#DCE9F6", "#B3CFEA", "#7FAEDB", "#4F81BD", "#2F5F99"]
+HOLIDAY_COLOR = "#FFEBEE"
+WEEKEND_COLOR = "#F2F2F2"
+
+
+def count_by_day(data, start, end, user_filter=None, skip_holidays=True):
+    """
+    start ve end (dahil) arasındaki toplantıları gün ve kişi başına sayar.
+    Tekrarlar Occurrence nesnesi oluşturulmadan doğrudan kuraldan sayılır.
+    """
+    lo, hi = start.toordinal(), end.toordinal()
+    skip = holiday_ordinals(data) if skip_holidays else ()
+    cancelled = exception_ordinals(data)
+
+    total, people, person_totals = {}, {}, {}
+    meetings = data.get('meetings', [])
+    produced = 0
+    for meeting in meetings:
+        attendees = meeting.get('attendees', [])
+        if user_filter and user_filter not in attendees:
+            continue
+        skip_days = meeting_skip(meeting, skip, cancelled)
+        ordinals = [o for o in compile_meeting(meeting).ordinals(lo, hi) if o not in skip_days]
+        if not ordinals:
+            continue
+        produced += len(ordinals)
+        for ordinal in ordinals:
+            total[ordinal] = total.get(ordinal, 0) + 1
+            day_people = people.setdefault(ordinal, {})
+            for person in attendees:
+                day_people[person] = day_people.get(person, 0) + 1
+        for person in attendees:
+            person_totals[person] = person_totals.get(person, 0) + len(ordinals)
+
+    diagnostics.count("meetings_scanned", len(meetings))
+    diagnostics.count("occurrences", produced)
+    return DayCounts(total, people, person_totals)
+
+
+def _ranked(counts):
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _month_range(year, month):
+    return datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def build_month_model(data, year, month, user_filter=None, counts=None):
+    """
+    Ayın hücreleri: weeks = haftalar x 7 (ay dışı günler None).
+    counts: Bu ayı kapsayan hazır count_by_day sonucu (verilmezse hesaplanır)
+    """
+    if counts is None:
+        counts = count_by_day(data, *_month_range(year, month), user_filter=user_filter)
+    holidays = get_holidays(data)
+
+    weeks = []
+    month_total = 0
+    for week in calendar.monthcalendar(year, month):
+        row = []
+        for weekday, day in enumerate(week):
+            if day == 0:
+                row.append(None)
+                continue
+            date = datetime.date(year, month, day)
+            ordinal = date.toordinal()
+            count = counts.total.get(ordinal, 0)
+            month_total += count
+            row.append(MonthCell(day, date, count, _ranked(counts.people.get(ordinal, {})),
+                                 holidays.get(date.isoformat()), weekday >= 5))
+        weeks.append(row)
+
+    title = f"{TR_MONTHS[month]} {year}"
+    if user_filter:
+        title += f" — {user_filter}"
+    return {'year': year, 'month': month, 'name': TR_MONTHS[month], 'title': title,
+            'weeks': weeks, 'total': month_total}
+
+
+def overview_months(year, quarter=None):
+    """Özetin ayları: quarter verilirse o çeyreğin 3 ayı, yoksa yılın 12 ayı."""
+    if quarter is None:
+        return list(range(1, 13))
+    if quarter not in QUARTERS:
+        raise ValueError(f"Çeyrek 1-4 arasında olmalı: {quarter}")
+    return list(range(3 * quarter - 2, 3 * quarter + 1))
+
+
+def overview_title(year, quarter=None):
+    return f"{year} Yıllık Özet" if quarter is None else f"{year} — {quarter}. Çeyrek"
+
+
+def heat_level(count, max_count):
+    """0 (toplantı yok) .. len(HEAT_COLORS) - 1 (en yoğun)."""
+    if count <= 0 or max_count <= 0:
+        return 0
+    top = len(HEAT_COLORS) - 1
+    return min(top, -(-count * top // max_count))
+
+
+def heat_legend(max_count):
+    """[(renk, etiket)]: her yoğunluk seviyesinin kapsadığı sayı aralığı."""
+    legend = [(HEAT_COLORS[0], "0")]
+    top = len(HEAT_COLORS) - 1
+    low = 1
+    for level in range(1, top + 1):
+        high = max_count * level // top
+        if high < low:
+            continue
+        legend.append((HEAT_COLORS[level], str(low) if high == low else f"{low}-{high}"))
+        low = high + 1
+    return legend
+
+
+@diagnostics.timed("overview_model")
+def build_overview_model(data, year, quarter=None, user_filter=None):
+    """Çeyrek (3 ay) veya yıl (12 ay) özeti; tüm aylar tek sayımdan hesaplanır."""
+    months = overview_months(year, quarter)
+    start = _month_range(year, months[0])[0]
+    end = _month_range(year, months[-1])[1]
+    counts = count_by_day(data, start, end, user_filter=user_filter)
+
+    title = overview_title(year, quarter)
+    if user_filter:
+        title += f" — {user_filter}"
+    return {
+        'title': title,
+        'months': [build_month_model(data, year, month, user_filter=user_filter, counts=counts) for month in months],
+        'max_count': max(counts.total.values(), default=0),
+        'total': sum(counts.total.values()),
+        'person_totals': [] if user_filter else _ranked(counts.person_totals),
+    }
@@ -0,0 +1,197 @@
+"""
+Kalıcı (materialized) toplantı tekrar indeksi.
+
+Her toplantının tekrar ordinalleri bir kez hesaplanır ve calendar_data.json'ın
+yanındaki <ad>.index.json dosyasında saklanır. sync_index() yalnızca içeriği
+değişen (yeni/düzenlenen) toplantıları yeniden genişletir; hafta, ay veya yıl
+sorguları tarih ve kişi bazlı sıralı listelerde bisect ile dilim okumasıdır.
+"""
+import json
+import os
+import hashlib
+import datetime
+import threading
+from bisect import bisect_left, bisect_right
+
+import diagnostics
+from recurrence import compile_meeting, holiday_ordinals, exception_ordinals, expand, Occurrence
+
+INDEX_VERSION = 1
+
+# Tarih sınırı olmayan (hatalı tarihli) toplantılar için indeks penceresi (yıl)
+WINDOW_YEARS_BACK = 2
+WINDOW_YEARS_AHEAD = 5
+
+
+def meeting_key(meeting):
+    """Toplantı içeriğinin parmak izi (içerik değişirse anahtar da değişir)."""
+    raw = json.dumps(meeting, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def index_path(json_file):
+    base, _ = os.path.splitext(json_file)
+    return f"{base}.index.json"
+
+
+def _default_window():
+    year = datetime.date.today().year
+    return (datetime.date(year - WINDOW_YEARS_BACK, 1, 1).toordinal(),
+            datetime.date(year + WINDOW_YEARS_AHEAD, 12, 31).toordinal())
+
+
+class OccurrenceIndex:
+    """Toplantı tekrarlarının tarih ve katılımcı bazlı indeksi."""
+
+    def __init__(self, window=None, series=None):
+        self.window = tuple(window) if window else _default_window()
+        self.series = series or {}   # anahtar -> [ordinal, ...]
+        self.meetings = {}           # anahtar -> [toplantı, ...] (aynı içerikli kopyalar dahil)
+        self.skip = set()            # tatil ordinalleri
+        self.cancelled = {}          # toplantı kimliği -> iptal edilen ordinaller
+        self._by_date = None
+        self._by_person = None
+        # Streamlit oturumları aynı indeksi farklı iş parçacıklarından eşitler/sorgular
+        self._lock = threading.RLock()
+
+    def _expand_series(self, meeting):
+        rule = compile_meeting(meeting)
+        lo, hi = self.window
+        return list(rule.ordinals(lo, hi))
+
+    def sync(self, data):
+        """
+        İndeksi verideki toplantılarla eşitler.
+        Yalnızca yeni veya değişmiş toplantıları genişletir; değişen seri sayısını döndürür.
+        """
+        with self._lock:
+            return self._sync(data)
+
+    def _sync(self, data):
+        meetings = {}
+        for m in data.get('meetings', []):
+            meetings.setdefault(meeting_key(m), []).append(m)
+
+        changed = 0
+        for key, group in meetings.items():
+            if key not in self.series:
+                self.series[key] = self._expand_series(group[0])
+                changed += 1
+        for key in [k for k in self.series if k not in meetings]:
+            del self.series[key]
+            changed += 1
+
+        counts = {k: len(v) for k, v in meetings.items()}
+        if changed or counts != {k: len(v) for k, v in self.meetings.items()}:
+            self._by_date = None
+            self._by_person = None
+        self.meetings = meetings
+        self.skip = holiday_ordinals(data)
+        self.cancelled = exception_ordinals(data)
+        return changed
+
+    def _build(self):
+        # Satır: (ordinal, başlangıç dk, bitiş dk, anahtar, kopya no); toplantı sorguda çözülür
+        rows = []
+        by_person = {}
+        for key, ordinals in self.series.items():
+            group = self.meetings.get(key, ())
+            if not group:
+                continue
+            rule = compile_meeting(group[0])
+            for copy_no in range(len(group)):
+                series_rows = [(o, rule.start_min, rule.end_min, key, copy_no) for o in ordinals]
+                rows.extend(series_rows)
+                for person in group[0].get('attendees', []):
+                    by_person.setdefault(person, []).extend(series_rows)
+
+        rows.sort()
+        self._by_date = ([r[0] for r in rows], rows)
+        self._by_person = {}
+        for person, person_rows in by_person.items():
+            person_rows.sort()
+            self._by_person[person] = ([r[0] for r in person_rows], person_rows)
+
+    def covers(self, start, end):
+        return self.window[0] <= start.toordinal() and end.toordinal() <= self.window[1]
+
+    def query(self, start, end, person=None, skip_holidays=True):
+        """start ve end (dahil) arasındaki tekrarları Occurrence listesi olarak döndürür."""
+        with self._lock:
+            if self._by_date is None:
+                self._build()
+            if person:
+                ordinals, rows = self._by_person.get(person, ([], []))
+            else:
+                ordinals, rows = self._by_date
+            skip = self.skip if skip_holidays else ()
+            cancelled = self.cancelled
+            meetings = self.meetings
+
+        lo = bisect_left(ordinals, start.toordinal())
+        hi = bisect_right(ordinals, end.toordinal())
+        result = [Occurrence(datetime.date.fromordinal(r[0]), r[1], r[2], meetings[r[3]][r[4]])
+                  for r in rows[lo:hi] if r[0] not in skip]
+        if cancelled:
+            result = [o for o in result if o.date.toordinal() not in cancelled.get(o.meeting.get('id'), ())]
+        return result
+
+    def to_dict(self):
+        with self._lock:
+            return {"version": INDEX_VERSION, "window": list(self.window), "series": dict(self.series)}
+
+    @classmethod
+    def from_dict(cls, raw):
+        if raw.get('version') != INDEX_VERSION or tuple(raw.get('window', ())) != _default_window():
+            return cls()
+        return cls(window=raw['window'], series=raw.get('series', {}))
+
+
+def load_index(path):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return OccurrenceIndex.from_dict(json.load(f))
+        except (ValueError, OSError):
+            pass
+    return OccurrenceIndex()
+
+
+def save_index(index, path):
+    # Geçici dosya + os.replace: eşzamanlı yazarlar yarım dosya bırakmaz
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index.to_dict(), f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# Süreç içi önbellek (Streamlit yeniden çalıştırmaları arasında korunur)
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+@diagnostics.timed("index_sync")
+def sync_index(data, json_file):
+    """
+    json_file için indeksi yükler/eşitler ve değiştiyse diske yazar.
+    save_data sonrasında ve her yüklemede çağrılır.
+    """
+    path = index_path(json_file)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None or index.window != _default_window():
+            index = load_index(path)
+            _INDEXES[path] = index
+    if index.sync(data) or not os.path.exists(path):
+        save_index(index, path)
+    return index
+
+
+def query_occurrences(index, data, start, end, person=None):
+    """İndeks aralığı kapsıyorsa dilim okuması yapar, kapsamıyorsa doğrudan genişletir."""
+    if index is not None and index.covers(start, end):
+        with diagnostics.span("index_query"):
+            result = index.query(start, end, person=person)
+        diagnostics.count("occurrences", len(result))
+        return result
+    return expand(data, start, end, user_filter=person)
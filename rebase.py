@@ -0,0 +1,170 @@
+"""
+Eşzamanlı düzenlemelerin üç yollu birleştirilmesi.
+
+Bir oturum belgeyi base sürümünde yükleyip değiştirdiğinde (mine) ve bu arada
+başka bir oturum daha yeni bir sürüm kaydettiğinde (theirs), mine'ın base'e
+göre yaptığı değişiklikler theirs'ın üzerine yeniden uygulanır. Toplantılar
+kimlikleriyle (id), kişiler kısa adlarıyla (name) eşlenir; diğer kayıt
+listeleri (istisnalar vb.) içerikle eşlenir. Düzenlenen kayıt theirs'ta
+bulunup değiştirilir, silinen kayıt çıkarılır, eklenen kayıt mine'daki
+komşusunun yanına yerleştirilir. İki tarafın aynı kaydı (veya aynı alanı)
+farklı değiştirmesi ConcurrentEditError'dır.
+"""
+import json
+import difflib
+
+# Sürüm alanları birleştirilmez, her zaman en güncel belgeden alınır
+VERSION_FIELDS = ("doc_version", "schema_version", "journal_seq")
+
+# Kimlik alanıyla eşlenen listeler: alan adı -> kayıt anahtarı
+LIST_KEYS = {"meetings": "id", "people": "name"}
+
+
+class ConcurrentEditError(Exception):
+    """Değişiklik, başka bir oturumun aynı kayıttaki değişikliğiyle çakışıyor."""
+
+
+def _key(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _find(items, key):
+    for i, (item_key, _) in enumerate(items):
+        if item_key == key:
+            return i
+    return None
+
+
+def _keyed(items, field):
+    """{anahtar: kayıt} ve sıra; her kayıt benzersiz anahtarlı sözlük değilse None."""
+    records = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get(field) in (None, "") or item[field] in records:
+            return None
+        records[item[field]] = item
+    return records
+
+
+def _merge_keyed(base, mine, theirs, field, path):
+    """Kayıtları anahtarlarıyla eşleyerek birleştirir (ekle/sil/düzenle)."""
+    result = list(theirs.values())
+
+    def position(key):
+        for i, item in enumerate(result):
+            if item[field] == key:
+                return i
+        return None
+
+    for key, b in base.items():
+        m, t = mine.get(key), theirs.get(key)
+        if m is None:
+            # Silinen kayıt: diğer tarafta değiştirildiyse silme kaybı olur
+            if t is not None:
+                if t != b:
+                    raise ConcurrentEditError(f"{path}[{key}]: silinen kayıt başka bir oturumda değiştirilmiş.")
+                del result[position(key)]
+        elif m != b:
+            if t is None:
+                raise ConcurrentEditError(f"{path}[{key}]: düzenlenen kayıt başka bir oturumda silinmiş.")
+            if t == b:
+                result[position(key)] = m
+            elif t != m:
+                raise ConcurrentEditError(f"{path}[{key}]: kayıt iki oturumda farklı değiştirilmiş.")
+
+    # Eklenen kayıtlar: mine'daki bir önceki kaydın arkasına, o yoksa başa
+    anchor = None
+    for key, m in mine.items():
+        if key not in base:
+            t = theirs.get(key)
+            if t is not None:
+                if t != m:
+                    raise ConcurrentEditError(f"{path}[{key}]: iki oturum aynı kaydı farklı ekledi.")
+            else:
+                pos = -1 if anchor is None else position(anchor)
+                result.insert(len(result) if pos is None else pos + 1, m)
+        if position(key) is not None:
+            anchor = key
+    return result
+
+
+def _merge_list(base, mine, theirs, path):
+    field = LIST_KEYS.get(path.rsplit(".", 1)[-1])
+    if field:
+        keyed = [_keyed(items, field) for items in (base, mine, theirs)]
+        if None not in keyed:
+            return _merge_keyed(*keyed, field, path)
+
+    base_keys = [_key(v) for v in base]
+    mine_keys = [_key(v) for v in mine]
+    result = [(_key(v), v) for v in theirs]
+
+    matcher = difflib.SequenceMatcher(None, base_keys, mine_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        common = min(i2 - i1, j2 - j1)
+
+        # Düzenlenen kayıtlar: base'deki hali theirs'ta aranır ve değiştirilir
+        for k in range(common):
+            pos = _find(result, base_keys[i1 + k])
+            if pos is None:
+                if mine_keys[j1 + k] in (item_key for item_key, _ in result):
+                    continue  # Aynı değişiklik diğer tarafta da yapılmış
+                raise ConcurrentEditError(f"{path}: düzenlenen kayıt başka bir oturumda değiştirilmiş veya silinmiş.")
+            result[pos] = (mine_keys[j1 + k], mine[j1 + k])
+
+        # Silinen kayıtlar (zaten silinmişse bir şey yapılmaz)
+        for i in range(i1 + common, i2):
+            pos = _find(result, base_keys[i])
+            if pos is not None:
+                del result[pos]
+
+        # Eklenen kayıtlar: mine'daki bir önceki kaydın arkasına, o yoksa sona
+        for k in range(common, j2 - j1):
+            j = j1 + k
+            if j == 0:
+                pos = 0
+            else:
+                anchor = _find(result, mine_keys[j - 1])
+                pos = len(result) if anchor is None else anchor + 1
+            result.insert(pos, (mine_keys[j], mine[j]))
+
+    return [v for _, v in result]
+
+
+def merge(base, mine, theirs, path="belge"):
+    """mine'ın base'e göre değişikliklerini theirs üzerine uygular."""
+    if mine == base:
+        return theirs
+    if theirs == base or mine == theirs:
+        return mine
+
+    if isinstance(base, dict) and isinstance(mine, dict) and isinstance(theirs, dict):
+        result = dict(theirs)
+        for key in base.keys() | mine.keys():
+            if key in VERSION_FIELDS:
+                continue
+            missing = object()
+            b, m = base.get(key, missing), mine.get(key, missing)
+            if m is b or m == b:
+                continue
+            t = theirs.get(key, missing)
+            if m is missing:
+                if t is not missing and t != b:
+                    raise ConcurrentEditError(f"{path}.{key}: silinen alan başka bir oturumda değiştirilmiş.")
+                result.pop(key, None)
+            elif b is missing or t is missing:
+                if t is not missing and t != m:
+                    if isinstance(t, dict) and isinstance(m, dict):
+                        result[key] = merge({}, m, t, f"{path}.{key}")
+                        continue
+                    raise ConcurrentEditError(f"{path}.{key}: iki oturum aynı alanı farklı ekledi.")
+                result[key] = m
+            else:
+                result[key] = merge(b, m, t, f"{path}.{key}")
+        return result
+
+    if isinstance(base, list) and isinstance(mine, list) and isinstance(theirs, list):
+        return _merge_list(base, mine, theirs, path)
+
+    raise ConcurrentEditError(f"{path}: iki oturum aynı değeri farklı değiştirdi.")
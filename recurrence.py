@@ -0,0 +1,252 @@
+"""
+Tekrarlama (recurrence) motoru.
+
+Her toplantı bir kez derlenir (MeetingRule) ve istenen tarih aralığındaki
+tekrarları gün gün kontrol etmeden bir sonrakine doğrudan atlayarak üretir.
+Haftalık çizim, aylık görünüm, ICS dışa aktarımı ve web takvimi aynı kuralı
+kullanır.
+"""
+import datetime
+import calendar
+from collections import namedtuple
+from functools import lru_cache
+
+import diagnostics
+
+# Türkçe gün ve ay isimleri (0 = Pazartesi)
+TR_DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+TR_MONTHS = ["", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", 
+             "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+# Sıklık seçenekleri
+FREQUENCIES = ["Tek Seferlik", "Her Hafta", "İki Haftada Bir", "Aylık", "Aylık (Son Pazartesi)"]
+
+# Tarih alanı olmayan toplantılar için varsayılanlar
+DEFAULT_START_DATE = "2026-02-02"
+DEFAULT_END_DATE = "2026-12-31"
+
+# Kural tipleri
+KIND_NONE = "none"                 # Hiç gösterilmez (bilinmeyen gün/sıklık, hatalı saat)
+KIND_WEEKLY = "weekly"             # Her hafta / iki haftada bir (period)
+KIND_ONCE = "once"                 # Tek seferlik
+KIND_MONTHLY_LAST = "monthly_last" # Ayın son pazartesisi
+KIND_MONTHLY_FIRST = "monthly_first" # Ayın ilk <gün>ü
+
+_MIN_ORDINAL = 1  # 0001-01-01 bir Pazartesidir
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+# Tek bir tekrar: tarih, başlangıç/bitiş dakikası ve kaynak toplantı
+Occurrence = namedtuple('Occurrence', ['date', 'start_min', 'end_min', 'meeting'])
+
+
+def time_to_min(t):
+    h, m = map(int, t.split(':'))
+    return h * 60 + m
+
+
+def get_last_monday(year, month):
+    """Verilen yıl ve ayın son pazartesi gününün tarihini döndürür."""
+    last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+    return last_day - datetime.timedelta(days=last_day.weekday())
+
+
+def _last_weekday_ordinal(year, month, weekday):
+    last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+    return last_day.toordinal() - (last_day.weekday() - weekday) % 7
+
+
+def _first_weekday_ordinal(year, month, weekday):
+    first_day = datetime.date(year, month, 1)
+    return first_day.toordinal() + (weekday - first_day.weekday()) % 7
+
+
+def _iter_months(lo, hi):
+    """lo ve hi ordinalleri arasındaki (yıl, ay) çiftlerini üretir."""
+    d = datetime.date.fromordinal(lo)
+    end = datetime.date.fromordinal(hi)
+    year, month = d.year, d.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+
+class MeetingRule:
+    """
+    Derlenmiş toplantı kuralı.
+    Tarihler ordinal (int) olarak tutulur; sıklık metni yalnızca derlemede okunur.
+    """
+    __slots__ = ('kind', 'weekday', 'period', 'anchor', 'start_ord', 'end_ord', 'start_min', 'end_min')
+
+    def __init__(self, kind, weekday=None, period=1, anchor=None, start_ord=_MIN_ORDINAL,
+                 end_ord=_MAX_ORDINAL, start_min=None, end_min=None):
+        self.kind = kind
+        self.weekday = weekday
+        self.period = period
+        self.anchor = anchor        # İlk haftadaki toplantı gününün ordinali
+        self.start_ord = start_ord
+        self.end_ord = end_ord
+        self.start_min = start_min
+        self.end_min = end_min
+
+    def ordinals(self, lo, hi):
+        """[lo, hi] aralığındaki tekrarların ordinallerini artan sırada üretir."""
+        lo = max(lo, self.start_ord)
+        hi = min(hi, self.end_ord)
+        if lo > hi:
+            return
+
+        if self.kind == KIND_WEEKLY:
+            step = 7 * self.period
+            current = self.anchor
+            if current < lo:
+                current += -(-(lo - current) // step) * step
+            while current <= hi:
+                yield current
+                current += step
+
+        elif self.kind == KIND_ONCE:
+            if lo <= self.anchor <= hi:
+                yield self.anchor
+
+        elif self.kind in (KIND_MONTHLY_LAST, KIND_MONTHLY_FIRST):
+            pick = _last_weekday_ordinal if self.kind == KIND_MONTHLY_LAST else _first_weekday_ordinal
+            for year, month in _iter_months(lo, hi):
+                ordinal = pick(year, month, self.weekday)
+                if lo <= ordinal <= hi:
+                    yield ordinal
+
+    def occurrences(self, start, end):
+        """start ve end (dahil) arasındaki tekrar tarihlerini üretir."""
+        for ordinal in self.ordinals(start.toordinal(), end.toordinal()):
+            yield datetime.date.fromordinal(ordinal)
+
+    def has_occurrence(self, start, end):
+        return next(self.ordinals(start.toordinal(), end.toordinal()), None) is not None
+
+
+@lru_cache(maxsize=4096)
+def _compile(day, freq, start_date_str, end_date_str, start_time, end_time):
+    try:
+        start_min = time_to_min(start_time)
+        end_min = time_to_min(end_time)
+    except (ValueError, AttributeError):
+        return MeetingRule(KIND_NONE)
+
+    try:
+        start_date = datetime.datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        end_date = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        # Hata durumunda her hafta göster
+        if day not in TR_DAYS:
+            return MeetingRule(KIND_NONE)
+        return MeetingRule(KIND_WEEKLY, weekday=TR_DAYS.index(day), anchor=_MIN_ORDINAL + TR_DAYS.index(day),
+                           start_min=start_min, end_min=end_min)
+
+    # Toplantı başlangıç tarihinin olduğu haftanın pazartesisi
+    start_week = start_date.toordinal() - start_date.weekday()
+    bounds = dict(start_ord=start_date.toordinal(), end_ord=end_date.toordinal(),
+                  start_min=start_min, end_min=end_min)
+
+    if "Aylık" in freq and "Son Pazartesi" in freq:
+        return MeetingRule(KIND_MONTHLY_LAST, weekday=0, **bounds)
+
+    if day not in TR_DAYS:
+        return MeetingRule(KIND_NONE)
+    weekday = TR_DAYS.index(day)
+    anchor = start_week + weekday
+
+    if freq == "Her Hafta":
+        return MeetingRule(KIND_WEEKLY, weekday=weekday, period=1, anchor=anchor, **bounds)
+    if freq == "İki Haftada Bir":
+        return MeetingRule(KIND_WEEKLY, weekday=weekday, period=2, anchor=anchor, **bounds)
+    if freq == "Tek Seferlik":
+        return MeetingRule(KIND_ONCE, weekday=weekday, anchor=anchor, **bounds)
+    if "Aylık" in freq:
+        # Standart aylık: her ayın ilk <gün>ü
+        return MeetingRule(KIND_MONTHLY_FIRST, weekday=weekday, **bounds)
+    return MeetingRule(KIND_NONE)
+
+
+def compile_meeting(meeting):
+    """Toplantıyı derlenmiş kurala çevirir (aynı alanlar için önbellekten döner)."""
+    return _compile(
+        meeting.get('day', '').strip(),
+        meeting.get('frequency', 'Her Hafta'),
+        meeting.get('start_date', DEFAULT_START_DATE),
+        meeting.get('end_date', DEFAULT_END_DATE),
+        meeting.get('start_time'),
+        meeting.get('end_time'),
+    )
+
+
+def get_holidays(data):
+    """Tatilleri {YYYY-MM-DD: İsim} sözlüğü olarak döndürür (eski liste formatı dahil)."""
+    holidays = data.get('holidays', {})
+    if isinstance(holidays, list):
+        holidays = {h: "RESMİ TATİL" for h in holidays}
+    return holidays
+
+
+def holiday_ordinals(data):
+    ordinals = set()
+    for d_str in get_holidays(data):
+        try:
+            ordinals.add(datetime.date.fromisoformat(d_str).toordinal())
+        except (ValueError, TypeError):
+            continue
+    return ordinals
+
+
+def exception_ordinals(data):
+    """
+    İptal edilen tekrarlar (data['exceptions']; ICS EXDATE ve iptal edilen
+    örnekler): {toplantı kimliği: {ordinal}}. Toplantı kimliği olmayan
+    kayıtlar hiçbir toplantıyla eşleştirilmez.
+    """
+    cancelled = {}
+    for exception in data.get('exceptions', []):
+        if not isinstance(exception, dict) or not exception.get('meeting_id'):
+            continue
+        try:
+            ordinal = datetime.date.fromisoformat(exception['date']).toordinal()
+        except (KeyError, ValueError, TypeError):
+            continue
+        cancelled.setdefault(exception['meeting_id'], set()).add(ordinal)
+    return cancelled
+
+
+def meeting_skip(meeting, skip, cancelled):
+    """Toplantının atlanacak günleri: tatiller (skip) ve kendi iptal edilen tekrarları."""
+    dropped = cancelled.get(meeting.get('id')) if cancelled else None
+    return dropped.union(skip) if dropped else skip
+
+
+@diagnostics.timed("expand")
+def expand(data, start, end, user_filter=None, skip_holidays=True):
+    """
+    start ve end (dahil) arasındaki tüm toplantı tekrarlarını
+    (tarih, başlangıç) sırasına göre Occurrence listesi olarak döndürür.
+    İptal edilen tekrarlar (data['exceptions']) her zaman atlanır.
+    """
+    lo, hi = start.toordinal(), end.toordinal()
+    skip = holiday_ordinals(data) if skip_holidays else ()
+    cancelled = exception_ordinals(data)
+
+    result = []
+    meetings = data.get('meetings', [])
+    for meeting in meetings:
+        if user_filter and user_filter not in meeting.get('attendees', []):
+            continue
+        rule = compile_meeting(meeting)
+        skip_days = meeting_skip(meeting, skip, cancelled)
+        for ordinal in rule.ordinals(lo, hi):
+            if ordinal in skip_days:
+                continue
+            result.append(Occurrence(datetime.date.fromordinal(ordinal), rule.start_min, rule.end_min, meeting))
+
+    result.sort(key=lambda o: (o.date, o.start_min))
+    diagnostics.count("meetings_scanned", len(meetings))
+    diagnostics.count("occurrences", len(result))
+    return result
@@ -0,0 +1,128 @@
+"""
+İçerik adresli çizim önbelleği.
+
+Haftalık figürün PNG/SVG baytları, çizimi etkileyen her şeyin (haftanın
+tekrarları, kişi filtresi, ayarlar/renkler, haftadaki tatiller) özetiyle
+saklanır. Bellekte boyut sınırlı bir LRU, isteğe bağlı olarak diskte ikinci
+bir katman bulunur. Değişmeyen bir haftanın tekrar gösterimi yalnızca bir
+özet hesabı ve sözlük okumasıdır.
+"""
+import os
+import json
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+
+# Çizim kodu görünümü değiştirirse artırılır (eski önbellek geçersiz olur)
+RENDER_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Disk katmanı için dizin (boşsa yalnızca bellek)
+CACHE_DIR_ENV = "TAKVIM_RENDER_CACHE_DIR"
+
+
+class RenderCache:
+    """Bayt değerli, giriş sayısı ve toplam boyutla sınırlı LRU önbellek."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.bin")
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    value = f.read()
+            except OSError:
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.disk_dir:
+            tmp_path = f"{self._disk_path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(value)
+            os.replace(tmp_path, self._disk_path(key))
+
+    def _remember(self, key, value):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def weekly_render_key(data, week_start_date, occurrences, user_filter=None, fmt='png', **options):
+    """Haftalık çizimin içerik özetini (sha256) üretir."""
+    week_days = [(week_start_date + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    holidays = data.get('holidays', {})
+    if isinstance(holidays, list):
+        holidays = {h: "RESMİ TATİL" for h in holidays}
+
+    payload = {
+        "v": RENDER_VERSION,
+        "week": week_days[0],
+        "filter": user_filter,
+        "fmt": fmt,
+        "options": options,
+        "settings": data.get('settings', {}),
+        "holidays": {d: holidays[d] for d in week_days if d in holidays},
+        "occurrences": [
+            [occ.date.toordinal(), occ.start_min, occ.end_min,
+             occ.meeting.get('title'), occ.meeting.get('attendees', [])]
+            for occ in occurrences
+        ],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Süreç genelindeki önbellek (disk katmanı TAKVIM_RENDER_CACHE_DIR ile açılır)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RenderCache(disk_dir=os.environ.get(CACHE_DIR_ENV) or None)
+    return _default_cache
@@ -0,0 +1,427 @@
+"""
+SQLite depolama motoru (standart kütüphane sqlite3).
+
+Takvim belgesi tablolara bölünür: meetings, attendees, people, holidays,
+exceptions ve ayarlar için meta. Kaydetme, veritabanındaki satırlarla yeni
+belgeyi karşılaştırıp yalnızca değişen satırları yazar (bir toplantı düzenlemek
+bir silme + bir ekleme). Hafta/kişi sorguları tarih aralığı, gün ve katılımcı
+indeksleriyle SQL'de daraltılır; kalan adaylar recurrence motoruyla genişletilir.
+"""
+import json
+import sqlite3
+import datetime
+import threading
+from contextlib import contextmanager
+from collections import defaultdict, deque
+
+from recurrence import KIND_NONE, compile_meeting, expand
+from occurrence_index import meeting_key
+from storage import VERSION_KEY
+
+# Başka bir sürecin yazma kilidi için en fazla beklenecek süre (saniye)
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS people (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    fullname TEXT,
+    email TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    position REAL NOT NULL,
+    title TEXT,
+    day TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    frequency TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    kind TEXT NOT NULL,
+    weekday INTEGER,
+    start_ord INTEGER,
+    end_ord INTEGER,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS attendees (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    person TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, position)
+);
+CREATE TABLE IF NOT EXISTS holidays (
+    date TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exceptions (
+    id INTEGER PRIMARY KEY,
+    date TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_weekday ON meetings(weekday);
+CREATE INDEX IF NOT EXISTS idx_meetings_range ON meetings(start_ord, end_ord);
+CREATE INDEX IF NOT EXISTS idx_meetings_key ON meetings(key);
+CREATE INDEX IF NOT EXISTS idx_attendees_person ON attendees(person);
+CREATE INDEX IF NOT EXISTS idx_exceptions_date ON exceptions(date);
+"""
+
+# Sütunlarda tutulan toplantı alanları (sırası JSON çıktısındaki sıradır)
+MEETING_FIELDS = ("title", "day", "start_time", "end_time", "frequency", "start_date", "end_date")
+# meetings tablosunda kural derlemesinden gelen sütunlar dahil yazılan tüm sütunlar
+MEETING_COLUMNS = MEETING_FIELDS + ("kind", "weekday", "start_ord", "end_ord", "extra")
+PERSON_FIELDS = ("fullname", "email")
+
+# Belgenin tablolara dağıtılmayan üst düzey anahtarları meta'da saklanır
+DOCUMENT_TABLES = ("settings", "people", "meetings", "holidays", "exceptions")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _split_fields(record, fields):
+    """Sütun değerleri ve sütuna sığmayan alanlar (extra JSON)."""
+    columns = []
+    for field in fields:
+        value = record.get(field)
+        columns.append(value if isinstance(value, str) else None)
+    extra = {k: v for k, v in record.items() if k not in fields or not isinstance(v, str)}
+    return columns, extra
+
+
+def _meeting_row(meeting):
+    rule = compile_meeting(meeting)
+    columns, extra = _split_fields(meeting, MEETING_FIELDS)
+    attendees = extra.pop('attendees', [])
+    if not all(isinstance(p, str) for p in attendees):
+        extra['attendees'] = attendees
+        attendees = []
+    bounded = rule.kind != KIND_NONE
+    return (columns + [rule.kind, rule.weekday if bounded else None,
+                       rule.start_ord if bounded else None, rule.end_ord if bounded else None,
+                       _dumps(extra) if extra else None], attendees)
+
+
+def _meeting_from_row(row, attendees):
+    meeting = {}
+    for field, value in zip(MEETING_FIELDS[:4], row[:4]):
+        if value is not None:
+            meeting[field] = value
+    meeting['attendees'] = attendees
+    for field, value in zip(MEETING_FIELDS[4:], row[4:7]):
+        if value is not None:
+            meeting[field] = value
+    if row[7]:
+        extra = json.loads(row[7])
+        meeting['attendees'] = extra.pop('attendees', attendees)
+        meeting.update(extra)
+    return meeting
+
+
+class SqliteStore:
+    """Tek bir SQLite dosyası üzerinde takvim belgesi okuma/yazma."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        # Streamlit betikleri farklı iş parçacıklarında çalışır; erişim kilitle sıralanır.
+        # Başka bir süreç yazarken hata vermek yerine kilidin bırakılması beklenir.
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT NOT EXISTS (SELECT 1 FROM meta WHERE key = 'settings')").fetchone()[0]
+
+    # --- Okuma ---
+
+    def _attendees(self, meeting_ids=None):
+        result = defaultdict(list)
+        if meeting_ids is None:
+            rows = self._conn.execute("SELECT meeting_id, person FROM attendees ORDER BY meeting_id, position")
+        else:
+            ids = list(meeting_ids)
+            rows = []
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows += self._conn.execute(
+                    f"SELECT meeting_id, person FROM attendees WHERE meeting_id IN ({','.join('?' * len(chunk))}) "
+                    "ORDER BY meeting_id, position", chunk).fetchall()
+        for meeting_id, person in rows:
+            result[meeting_id].append(person)
+        return result
+
+    def load(self):
+        """Tüm belgeyi JSON şemasıyla aynı sözlük olarak döndürür."""
+        with self._lock, self._snapshot():
+            data = {}
+            meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+            data['settings'] = json.loads(meta.pop('settings', '{}'))
+
+            people = []
+            for name, fullname, email, extra in self._conn.execute(
+                    "SELECT name, fullname, email, extra FROM people ORDER BY position"):
+                person = {"name": name}
+                if fullname is not None:
+                    person['fullname'] = fullname
+                if email is not None:
+                    person['email'] = email
+                if extra:
+                    person.update(json.loads(extra))
+                people.append(person)
+            data['people'] = people
+
+            attendees = self._attendees()
+            data['meetings'] = [
+                _meeting_from_row(row[1:], attendees.get(row[0], []))
+                for row in self._conn.execute(
+                    f"SELECT id, {', '.join(MEETING_FIELDS)}, extra FROM meetings ORDER BY position")
+            ]
+            data['holidays'] = dict(self._conn.execute("SELECT date, name FROM holidays ORDER BY date"))
+            data['exceptions'] = [json.loads(body) for (body,) in
+                                  self._conn.execute("SELECT body FROM exceptions ORDER BY id")]
+
+            for key, value in meta.items():
+                if key.startswith('doc:'):
+                    data[key[4:]] = json.loads(value)
+            return data
+
+    def covers(self, start, end):
+        """occurrence_index.query_occurrences ile uyumluluk: her aralık SQL'den sorgulanır."""
+        return True
+
+    def query(self, start, end, person=None, skip_holidays=True):
+        """
+        start-end (dahil) aralığındaki tekrarlar. Aday toplantılar SQL'de tarih
+        aralığı, (kısa aralıklarda) gün ve katılımcıya göre daraltılır.
+        """
+        lo, hi = start.toordinal(), end.toordinal()
+        sql = (f"SELECT id, {', '.join(MEETING_FIELDS)}, extra FROM meetings "
+               "WHERE kind != ? AND start_ord <= ? AND end_ord >= ?")
+        params = [KIND_NONE, hi, lo]
+        if hi - lo < 6:
+            weekdays = sorted({datetime.date.fromordinal(o).weekday() for o in range(lo, hi + 1)})
+            sql += f" AND weekday IN ({','.join('?' * len(weekdays))})"
+            params += weekdays
+        if person:
+            sql += " AND id IN (SELECT meeting_id FROM attendees WHERE person = ?)"
+            params.append(person)
+        sql += " ORDER BY position"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            attendees = self._attendees(row[0] for row in rows)
+            holidays = dict(self._conn.execute("SELECT date, name FROM holidays WHERE date BETWEEN ? AND ?",
+                                               (start.isoformat(), end.isoformat())))
+            exceptions = [json.loads(body) for (body,) in
+                          self._conn.execute("SELECT body FROM exceptions WHERE date BETWEEN ? AND ?",
+                                             (start.isoformat(), end.isoformat()))]
+        meetings = [_meeting_from_row(row[1:], attendees.get(row[0], [])) for row in rows]
+        return expand({"meetings": meetings, "holidays": holidays, "exceptions": exceptions}, start, end,
+                      user_filter=person, skip_holidays=skip_holidays)
+
+    # --- Yazma ---
+
+    def version(self):
+        """Kayıtlı belgenin sürümü (doc_version)."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (f'doc:{VERSION_KEY}',)).fetchone()
+        return json.loads(row[0]) if row else 0
+
+    @contextmanager
+    def _snapshot(self):
+        """Birden çok SELECT'in aynı işlenmiş sürümü görmesi için okuma işlemi."""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self._conn.execute("COMMIT")
+
+    def save(self, data, expected_version=None):
+        """
+        Belgeyi veritabanıyla karşılaştırıp yalnızca farkları tek işlemde yazar.
+        expected_version verilirse ve kayıtlı sürüm farklıysa yazmaz, False döner.
+        """
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                if expected_version is not None and self.version() != expected_version:
+                    cur.execute("ROLLBACK")
+                    return False
+                self._sync_meta(cur, data)
+                self._sync_people(cur, data.get('people', []))
+                self._sync_meetings(cur, data.get('meetings', []))
+                self._sync_holidays(cur, data.get('holidays', {}))
+                self._sync_exceptions(cur, data.get('exceptions', []))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            return True
+
+    def _sync_meta(self, cur, data):
+        current = dict(cur.execute("SELECT key, value FROM meta"))
+        wanted = {'settings': _dumps(data.get('settings', {}))}
+        for key, value in data.items():
+            if key not in DOCUMENT_TABLES:
+                wanted[f'doc:{key}'] = _dumps(value)
+        for key in current.keys() - wanted.keys():
+            if key == 'settings' or key.startswith('doc:'):
+                cur.execute("DELETE FROM meta WHERE key = ?", (key,))
+        for key, value in wanted.items():
+            if current.get(key) != value:
+                cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _sync_people(self, cur, people):
+        current = {row[0]: row for row in cur.execute("SELECT name, position, fullname, email, extra FROM people")}
+        wanted = {}
+        for position, person in enumerate(people):
+            if isinstance(person, str):
+                person = {"name": person}
+            columns, extra = _split_fields(person, PERSON_FIELDS)
+            extra.pop('name', None)
+            wanted[person['name']] = (person['name'], position, *columns, _dumps(extra) if extra else None)
+        for name in current.keys() - wanted.keys():
+            cur.execute("DELETE FROM people WHERE name = ?", (name,))
+        for name, row in wanted.items():
+            if current.get(name) != row:
+                cur.execute("INSERT OR REPLACE INTO people (name, position, fullname, email, extra) VALUES (?, ?, ?, ?, ?)", row)
+
+    def _sync_meetings(self, cur, meetings):
+        # Aynı içerikli satırlar eşlenir. Eşlenmeyen yeni bir toplantı, aynı
+        # aralıkta kalan eski satırı günceller (düzenleme = tek UPDATE);
+        # artakalan eski satırlar silinir, diğer yeniler araya eklenir.
+        available = defaultdict(deque)
+        for row_id, key, position in cur.execute("SELECT id, key, position FROM meetings ORDER BY position"):
+            available[key].append((row_id, position))
+
+        keys = [meeting_key(m) for m in meetings]
+        matched = [available[key].popleft() if available.get(key) else None for key in keys]
+        stale = sorted((row for rows in available.values() for row in rows), key=lambda row: row[1])
+        reused = set()
+
+        known = [m[1] for m in matched if m is not None]
+        if all(a < b for a, b in zip(known, known[1:])):
+            upper = [None] * len(matched)
+            next_pos = None
+            for i in range(len(matched) - 1, -1, -1):
+                upper[i] = next_pos
+                if matched[i] is not None:
+                    next_pos = matched[i][1]
+            lower, k = None, 0
+            for i, match in enumerate(matched):
+                if match is not None:
+                    lower = match[1]
+                    continue
+                while k < len(stale) and lower is not None and stale[k][1] <= lower:
+                    k += 1
+                if k < len(stale) and (upper[i] is None or stale[k][1] < upper[i]):
+                    matched[i] = stale[k]
+                    reused.add(stale[k][0])
+                    lower = stale[k][1]
+                    k += 1
+
+        cur.executemany("DELETE FROM meetings WHERE id = ?",
+                        [(row_id,) for row_id, _ in stale if row_id not in reused])
+
+        positions = _place(matched)
+        for match, position in zip(matched, positions):
+            if match is not None and match[1] != position:
+                cur.execute("UPDATE meetings SET position = ? WHERE id = ?", (position, match[0]))
+
+        for meeting, key, match, position in zip(meetings, keys, matched, positions):
+            if match is not None and match[0] not in reused:
+                continue
+            columns, attendees = _meeting_row(meeting)
+            if match is None:
+                cur.execute(f"INSERT INTO meetings (key, position, {', '.join(MEETING_COLUMNS)}) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [key, position] + columns)
+                meeting_id = cur.lastrowid
+            else:
+                meeting_id = match[0]
+                assignments = ', '.join(f"{c} = ?" for c in ('key',) + MEETING_COLUMNS)
+                cur.execute(f"UPDATE meetings SET {assignments} WHERE id = ?", [key] + columns + [meeting_id])
+                current = [p for (p,) in cur.execute(
+                    "SELECT person FROM attendees WHERE meeting_id = ? ORDER BY position", (meeting_id,))]
+                if current == attendees:
+                    continue
+                cur.execute("DELETE FROM attendees WHERE meeting_id = ?", (meeting_id,))
+            cur.executemany("INSERT INTO attendees (meeting_id, position, person) VALUES (?, ?, ?)",
+                            [(meeting_id, i, person) for i, person in enumerate(attendees)])
+
+    def _sync_holidays(self, cur, holidays):
+        if isinstance(holidays, list):
+            holidays = {h: "Resmi Tatil" for h in holidays}
+        current = dict(cur.execute("SELECT date, name FROM holidays"))
+        for date in current.keys() - holidays.keys():
+            cur.execute("DELETE FROM holidays WHERE date = ?", (date,))
+        for date, name in holidays.items():
+            if current.get(date) != name:
+                cur.execute("INSERT OR REPLACE INTO holidays (date, name) VALUES (?, ?)", (date, name))
+
+    def _sync_exceptions(self, cur, exceptions):
+        available = defaultdict(deque)
+        for row_id, body in cur.execute("SELECT id, body FROM exceptions ORDER BY id"):
+            available[body].append(row_id)
+        new_rows = []
+        for exception in exceptions:
+            body = _dumps(exception)
+            if available.get(body):
+                available[body].popleft()
+            else:
+                date = exception.get('date') if isinstance(exception, dict) else None
+                new_rows.append((date, body))
+        cur.executemany("DELETE FROM exceptions WHERE id = ?", [(i,) for ids in available.values() for i in ids])
+        cur.executemany("INSERT INTO exceptions (date, body) VALUES (?, ?)", new_rows)
+
+
+def _place(matched):
+    """
+    Eşlenen satırların mevcut konumlarını korur, yeni satırlara komşuları
+    arasında kesirli konum verir. Sıra bozulduysa veya aralık tükendiyse
+    hepsi 0..n-1 olarak yeniden numaralanır.
+    """
+    known = [m[1] for m in matched if m is not None]
+    if any(a >= b for a, b in zip(known, known[1:])):
+        return [float(i) for i in range(len(matched))]
+
+    positions = [m[1] if m is not None else None for m in matched]
+    i = 0
+    while i < len(positions):
+        if positions[i] is not None:
+            i += 1
+            continue
+        j = i
+        while j < len(positions) and positions[j] is None:
+            j += 1
+        lower = positions[i - 1] if i > 0 else None
+        upper = positions[j] if j < len(positions) else None
+        count = j - i
+        if lower is None and upper is None:
+            lower, step = -1.0, 1.0
+        elif upper is None:
+            step = 1.0
+        elif lower is None:
+            lower, step = upper - count - 1, 1.0
+        else:
+            step = (upper - lower) / (count + 1)
+            if step < 1e-6:
+                return [float(k) for k in range(len(matched))]
+        for k in range(count):
+            positions[i + k] = lower + step * (k + 1)
+        i = j
+    return positions
@@ -0,0 +1,487 @@
+"""
+Takvim verisinin yüklenmesi, şema göçü ve kaydedilmesi.
+
+Üç depolama motoru vardır:
+  - json   (varsayılan): calendar_data.json tek dosya olarak okunur/yazılır,
+                         her kayıtta backups/ altına yedek alınır.
+  - journal: kayıtlar yalnızca farkı günlüğe ekler, calendar_data.json her N
+             işlemde bir anlık görüntü olarak yazılır; geçmişin her noktasına
+             dönülebilir (journal.py). backups/ kullanılmaz.
+  - sqlite: calendar_data.db; satır bazlı yazma ve SQL'de daraltılan sorgular
+            (sqlite_store.py). İlk açılışta mevcut JSON dosyasından bir kez aktarılır.
+Motor TAKVIM_STORAGE ortam değişkeniyle seçilir (json | journal | sqlite).
+
+Bu modül streamlit içe aktarmaz; pano dışındaki araçlar da kullanabilir.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import shutil
+import datetime
+import threading
+
+import diagnostics
+from rebase import merge, ConcurrentEditError
+
+STORAGE_ENV = "TAKVIM_STORAGE"
+STORAGE_BACKENDS = ("json", "journal", "sqlite")
+
+JSON_FILE = 'calendar_data.json'
+BACKUP_DIR = 'backups'
+BACKUP_KEEP = 10
+
+# Şema sürümü: göç bir kez yapılır ve dosyaya geri yazılır; güncel sürümdeki
+# belgeler yüklenirken göç adımları atlanır.
+SCHEMA_KEY = "schema_version"
+SCHEMA_VERSION = 2  # 2: toplantı kimlikleri (id)
+
+# Belge sürümü: her başarılı kayıtta bir artar (iyimser eşzamanlılık)
+VERSION_KEY = "doc_version"
+# Yoğun eşzamanlı yazmada bir kaydın yeniden denenebileceği en uzun süre (saniye)
+SAVE_TIMEOUT = 30.0
+
+# Sürüm talep dosyası bu kadar saniyedir duruyorsa sahibi çökmüş sayılır
+CLAIM_TIMEOUT = 10.0
+
+
+def storage_backend():
+    backend = os.environ.get(STORAGE_ENV, "json").strip().lower() or "json"
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Bilinmeyen depolama motoru: {backend} (seçenekler: {', '.join(STORAGE_BACKENDS)})")
+    return backend
+
+
+def empty_data():
+    return {"settings": {}, "people": [], "meetings": [], "holidays": {}, "exceptions": [], SCHEMA_KEY: SCHEMA_VERSION}
+
+
+def new_meeting_id():
+    """Toplantı için kalıcı, benzersiz kimlik."""
+    return uuid.uuid4().hex[:12]
+
+
+def assign_meeting_ids(data):
+    """
+    Kimliği olmayan veya başka bir toplantıyla aynı kimliği taşıyan (kopyalanmış)
+    toplantılara yeni kimlik verir. Toplantı kayıtları paylaşılabildiği için
+    yerinde değiştirilmez, listede kimlikli kopyasıyla değiştirilir.
+    """
+    seen = set()
+    meetings = data.get('meetings', [])
+    for i, m in enumerate(meetings):
+        meeting_id = m.get('id')
+        if not meeting_id or meeting_id in seen:
+            meeting_id = new_meeting_id()
+            meetings[i] = dict(m, id=meeting_id)
+        seen.add(meeting_id)
+    return data
+
+
+def meeting_index(data):
+    """Toplantı kimliği -> listedeki sıra (kimlikle O(1) erişim için)."""
+    return {m['id']: i for i, m in enumerate(data.get('meetings', [])) if 'id' in m}
+
+
+def needs_migration(data):
+    return data.get(SCHEMA_KEY, 0) < SCHEMA_VERSION
+
+
+def migrate_data(data):
+    """Eski şemaları günceller (yerinde) ve veriyi döndürür."""
+    if not needs_migration(data):
+        return data
+
+    # Eksik alanları tamamla (Şema Göçü)
+    if 'holidays' not in data:
+        data['holidays'] = {} # YYYY-MM-DD: İsim formatında
+    elif isinstance(data['holidays'], list):
+        # Eski liste formatını sözlüğe çevir
+        data['holidays'] = {h: "Resmi Tatil" for h in data['holidays']}
+
+    if 'exceptions' not in data:
+        data['exceptions'] = [] # {"date": "YYYY-MM-DD", "meeting_title": "..."}
+
+    # People Schema Migration (String -> Object)
+    if 'people' in data and len(data['people']) > 0 and isinstance(data['people'][0], str):
+        new_people = []
+        for p in data['people']:
+            new_people.append({
+                "name": p,
+                "fullname": p,
+                "email": ""
+            })
+        data['people'] = new_people
+
+    # Meetings Schema Migration (Add missing dates)
+    if 'meetings' in data:
+        for m in data['meetings']:
+            if 'start_date' not in m:
+                m['start_date'] = "2026-01-01"
+            if 'end_date' not in m:
+                m['end_date'] = "2026-12-31"
+
+    # Toplantı kimlikleri (Şema 2): düzenleme/silme, ICS UID ve takvim olayları
+    # toplantıya listedeki sırasıyla değil kimliğiyle erişir
+    assign_meeting_ids(data)
+
+    data[SCHEMA_KEY] = SCHEMA_VERSION
+    return data
+
+
+def copy_model(data):
+    """
+    Belgenin yapısal kopyası: üst düzey sözlük, koleksiyonlar, kişi kayıtları ve
+    ayar sözlükleri kopyalanır; toplantı/istisna kayıtları paylaşılır. Pano
+    toplantıları yerinde değiştirmez, listede yenisiyle değiştirir.
+    """
+    model = dict(data)
+    for key in ('meetings', 'exceptions'):
+        if isinstance(model.get(key), list):
+            model[key] = list(model[key])
+    if isinstance(model.get('people'), list):
+        model['people'] = [dict(p) if isinstance(p, dict) else p for p in model['people']]
+    if isinstance(model.get('holidays'), dict):
+        model['holidays'] = dict(model['holidays'])
+    if isinstance(model.get('settings'), dict):
+        model['settings'] = {k: dict(v) if isinstance(v, dict) else v for k, v in model['settings'].items()}
+    return model
+
+
+# --- JSON ---
+
+# Yükleme önbelleği: mutlak yol -> ((inode, mtime_ns, boyut), göç edilmiş belge).
+# Önbellekteki belge dışarı verilmez, her yüklemede yapısal kopyası döner.
+_LOAD_CACHE = {}
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    # Atomik yazma (os.replace) her seferinde yeni bir dosya (inode) koyar; aynı
+    # boyutta ve saat çözünürlüğü içinde yapılan iki yazma da böylece ayrışır.
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _read_json(json_file, write_back=True):
+    """
+    Önbellekteki (paylaşılan, değiştirilmemesi gereken) belgeyi döndürür.
+    write_back=False ise eski şemalı dosya yalnızca bellekte göç ettirilir.
+    """
+    deadline = time.monotonic() + SAVE_TIMEOUT
+    attempt = 0
+    while True:
+        try:
+            key = _file_key(json_file)
+        except FileNotFoundError:
+            return empty_data()
+
+        path = os.path.abspath(json_file)
+        cached = _LOAD_CACHE.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not needs_migration(data):
+            _LOAD_CACHE[path] = (key, data)
+            return data
+
+        # Göç bir kez yapılır ve yeni sürüm olarak yazılır (başka oturum önce
+        # yazdıysa onun sonucu okunur)
+        version = data.get(VERSION_KEY, 0)
+        migrated = migrate_data(data)
+        if not write_back or time.monotonic() > deadline:
+            # Salt okunur yükleme ya da göçü yazan oturum bitmedi: belge yalnızca
+            # bellekte göç ettirilir, sürümü değişmez (ilk kayıt göçü de yazar)
+            return migrated
+        migrated[VERSION_KEY] = version + 1
+        if _commit_json(migrated, version, json_file, BACKUP_DIR):
+            return _LOAD_CACHE[path][1]
+        _retry_pause(attempt)
+        attempt += 1
+
+
+def _file_version(json_file):
+    """Dosyadaki belgenin sürümü (göç yapmadan; önbellek güncelse ayrıştırmadan)."""
+    try:
+        key = _file_key(json_file)
+    except FileNotFoundError:
+        return 0
+    cached = _LOAD_CACHE.get(os.path.abspath(json_file))
+    if cached is not None and cached[0] == key:
+        return cached[1].get(VERSION_KEY, 0)
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get(VERSION_KEY, 0)
+
+
+def load_json(json_file=JSON_FILE):
+    """
+    JSON belgesini yükler. Dosya değişmediyse (mtime, boyut) ayrıştırma ve göç
+    yapılmaz, önbellekteki belgenin kopyası döner. Eski şemalı dosya bir kez
+    göç ettirilip geri yazılır.
+    """
+    return copy_model(_read_json(json_file))
+
+
+@diagnostics.timed("backup")
+def _backup(json_file, backup_dir):
+    if not os.path.exists(backup_dir):
+        os.makedirs(backup_dir)
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = os.path.join(backup_dir, f"calendar_data_{timestamp}.json")
+
+    # Mevcut dosyayı yedekle
+    if os.path.exists(json_file):
+        shutil.copy2(json_file, backup_path)
+
+    # Eski yedekleri temizle (Son 10)
+    backups = sorted([os.path.join(backup_dir, f) for f in os.listdir(backup_dir) if f.endswith('.json')])
+    while len(backups) > BACKUP_KEEP:
+        try:
+            os.remove(backups.pop(0))
+        except FileNotFoundError:
+            pass  # Eşzamanlı bir kayıt zaten silmiş
+
+
+@diagnostics.timed("write")
+def write_json_atomic(data, json_file):
+    """
+    Geçici dosyaya yazıp fsync eder ve tek adımda (os.replace) yerine koyar.
+    Yazılan dosyanın önbellek anahtarını döndürür (yeniden adlandırma inode ve
+    mtime'ı korur; yerine koyduktan sonra bakmak başka bir yazarı görebilir).
+    """
+    tmp_path = f"{json_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        key = _file_key(tmp_path)
+        os.replace(tmp_path, json_file)
+        return key
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_json(data, json_file=JSON_FILE, backup_dir=BACKUP_DIR):
+    """Sürüm denetimi olmadan yedekleyip atomik yazar (tek yazarlı araçlar için)."""
+    _backup(json_file, backup_dir)
+    write_json_atomic(data, json_file)
+
+
+def _retry_pause(attempt):
+    """
+    Aynı sürüm geçişini başka bir oturum yazıyor: rastgele kısa bekleme
+    (yarışan oturumlar aynı anda tekrar denemesin).
+    """
+    time.sleep(random.uniform(0, min(0.05, 0.002 * (2 ** attempt))))
+
+
+def _claim_path(json_file, version):
+    return f"{json_file}.v{version}.claim"
+
+
+def _commit_json(data, expected_version, json_file, backup_dir):
+    """
+    Dosya hâlâ expected_version sürümündeyse data'yı (expected_version + 1)
+    yazar. Her sürüm geçişi O_EXCL ile oluşturulan bir talep dosyasıyla tek
+    yazara verilir; global kilit yoktur, farklı geçişler birbirini beklemez.
+    Başarısızsa False döner.
+    """
+    claim = _claim_path(json_file, expected_version + 1)
+    try:
+        os.close(os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        # Yazarken çöken bir oturumun talebi süresi dolunca kaldırılır
+        try:
+            if time.time() - os.path.getmtime(claim) > CLAIM_TIMEOUT:
+                os.remove(claim)
+        except FileNotFoundError:
+            pass
+        return False
+
+    try:
+        if _file_version(json_file) != expected_version:
+            return False
+        _backup(json_file, backup_dir)
+        key = write_json_atomic(data, json_file)
+        # Yazanın kendi yeniden çalıştırması dosyayı tekrar ayrıştırmasın
+        _LOAD_CACHE[os.path.abspath(json_file)] = (key, copy_model(data))
+        return True
+    finally:
+        try:
+            os.remove(claim)
+        except FileNotFoundError:
+            pass
+
+
+# --- SQLite ---
+
+def db_path(json_file=JSON_FILE):
+    return os.path.splitext(json_file)[0] + '.db'
+
+
+# Süreç içi bağlantılar (Streamlit yeniden çalıştırmaları arasında korunur)
+_STORES = {}
+
+
+def open_store(json_file=JSON_FILE):
+    """
+    json_file'a karşılık gelen SQLite deposunu açar. Veritabanı boşsa ve JSON
+    dosyası varsa (göç uygulanarak) bir kez içe aktarılır.
+    """
+    from sqlite_store import SqliteStore
+    path = db_path(json_file)
+    store = _STORES.get(path)
+    if store is None:
+        store = SqliteStore(path)
+        if store.is_empty() and os.path.exists(json_file):
+            # Aynı anda açan başka bir süreç aktarıp kaydettiyse üzerine yazılmaz
+            store.save(load_json(json_file), expected_version=0)
+        _STORES[path] = store
+    return store
+
+
+# --- Ortak Arayüz ---
+
+# Yakın zamanda yüklenen sürümler (yeniden temellendirmede taban belge olarak).
+# Bir oturum yüklediği sürümden bu yana VERSIONS_KEEP'ten fazla kayıt yapıldıysa
+# değişiklikleri birleştirilemez.
+_VERSIONS = {}
+_VERSIONS_LOCK = threading.Lock()
+VERSIONS_KEEP = 128
+
+
+def _remember(json_file, doc):
+    with _VERSIONS_LOCK:
+        versions = _VERSIONS.setdefault(os.path.abspath(json_file), {})
+        versions[doc.get(VERSION_KEY, 0)] = doc
+        while len(versions) > VERSIONS_KEEP:
+            del versions[min(versions)]
+
+
+def _remembered(json_file, version):
+    with _VERSIONS_LOCK:
+        return _VERSIONS.get(os.path.abspath(json_file), {}).get(version)
+
+
+def _load_document(backend, json_file, write_back=True):
+    if backend == "json":
+        return _read_json(json_file, write_back)
+    deadline = time.monotonic() + SAVE_TIMEOUT
+    attempt = 0
+    while True:
+        if backend == "sqlite":
+            doc = open_store(json_file).load()
+        else:
+            from journal import open_journal
+            doc = open_journal(json_file).load()
+        if not needs_migration(doc):
+            return doc
+
+        # JSON motorundaki gibi göç bir kez yapılır ve yeni sürüm olarak kaydedilir
+        # (kimlikler her yüklemede yeniden üretilmesin)
+        version = doc.get(VERSION_KEY, 0)
+        doc = migrate_data(doc)
+        if not write_back or time.monotonic() > deadline:
+            return doc
+        doc[VERSION_KEY] = version + 1
+        if _commit(backend, doc, version, json_file, BACKUP_DIR):
+            return doc
+        _retry_pause(attempt)
+        attempt += 1
+
+
+def _current_version(backend, json_file):
+    if backend == "sqlite":
+        return open_store(json_file).version()
+    if backend == "journal":
+        from journal import open_journal
+        return open_journal(json_file).version()
+    return _read_json(json_file).get(VERSION_KEY, 0)
+
+
+def _commit(backend, doc, expected_version, json_file, backup_dir):
+    if backend == "sqlite":
+        return open_store(json_file).save(doc, expected_version=expected_version)
+    if backend == "journal":
+        from journal import open_journal
+        return open_journal(json_file).save(doc, expected_version=expected_version) is not None
+    return _commit_json(doc, expected_version, json_file, backup_dir)
+
+
+@diagnostics.timed("load_data")
+def load_data(json_file=JSON_FILE, read_only=False):
+    """
+    Güncel belgenin (doc_version dahil) değiştirilebilir kopyası.
+    read_only: Kaydetmeyen araçlar için; eski şemalı belge geri yazılmaz
+    (yedek de alınmaz), yalnızca bellekte göç ettirilir.
+    """
+    doc = _load_document(storage_backend(), json_file, write_back=not read_only)
+    if not read_only:
+        _remember(json_file, doc)
+    return copy_model(doc)
+
+
+@diagnostics.timed("save_data")
+def save_data(data, json_file=JSON_FILE, backup_dir=BACKUP_DIR):
+    """
+    Karşılaştır-ve-değiştir ile kaydeder ve yeni sürüm numarasını döndürür.
+    data yüklendiği sürümden (doc_version) bu yana başka bir oturum kaydettiyse,
+    data'nın o sürüme göre değişiklikleri en güncel belgeye yeniden uygulanır
+    (rebase.merge) ve tekrar denenir. Aynı kayıt iki tarafta farklı
+    değiştirildiyse ConcurrentEditError yükselir.
+    """
+    backend = storage_backend()
+    base_version = data.get(VERSION_KEY, 0)
+    # Yeni (veya kopyalanarak oluşturulmuş) toplantılar kimliğini kayıttan önce alır
+    data = assign_meeting_ids(copy_model(data))
+
+    # Süreç içi kilit yoktur: aynı süreçteki oturumlar da süreçler gibi sürüm
+    # geçişinin talebi (O_EXCL) için yarışır, kaybeden birleştirip yeniden dener
+    deadline = time.monotonic() + SAVE_TIMEOUT
+    attempt = 0
+    while True:
+        current_version = _current_version(backend, json_file)
+        if current_version != base_version:
+            base = _remembered(json_file, base_version)
+            if base is None:
+                raise ConcurrentEditError("Belge siz düzenlerken değişti ve değişiklikleriniz birleştirilemedi.")
+            latest = _load_document(backend, json_file)
+            _remember(json_file, latest)
+            data = merge(base, data, latest)
+            base_version = latest.get(VERSION_KEY, 0)
+
+        doc = copy_model(data)
+        doc[VERSION_KEY] = base_version + 1
+        if _commit(backend, doc, base_version, json_file, backup_dir):
+            break
+
+        if time.monotonic() > deadline:
+            raise ConcurrentEditError("Belge çok sık değişiyor; kayıt tamamlanamadı, lütfen tekrar deneyin.")
+        _retry_pause(attempt)
+        attempt += 1
+
+    _remember(json_file, doc)
+    if backend != "sqlite":
+        # Tekrar indeksini güncelle (sadece değişen toplantılar yeniden hesaplanır)
+        from occurrence_index import sync_index
+        sync_index(doc, json_file)
+    # ICS abonelik akışları arka planda yeniden üretilir (feed_server)
+    from feed_server import schedule_publish
+    schedule_publish(doc, json_file)
+    return doc[VERSION_KEY]
+
+
+def open_index(data, json_file=JSON_FILE):
+    """
+    Tekrar sorguları için indeks: JSON/journal motorunda occurrence_index (diskte önbellek),
+    SQLite motorunda sorguları SQL'de daraltan depo. İkisi de
+    occurrence_index.query_occurrences ile kullanılır.
+    """
+    if storage_backend() == "sqlite":
+        return open_store(json_file)
+    from occurrence_index import sync_index
+    return sync_index(data, json_file)
@@ -0,0 +1,382 @@
+"""
+Takvim komut satırı aracı (Streamlit olmadan; zamanlanmış rapor üretimi için).
+
+    python -m takvim render  Haftalık/aylık takvim sayfaları, yıl/çeyrek özeti (PDF, PNG, SVG)
+    python -m takvim export  Takvim verisi dışa aktarımı (ICS, XLSX)
+    python -m takvim check   Veri doğrulama ve çakışma raporu
+
+Ortak seçenekler:
+    --start YYYY-AA-GG       Başlangıç (varsayılan bugün; haftalık görünüm Pazartesiye yuvarlanır)
+    --end YYYY-AA-GG | --weeks N | --months N
+                             Aralığın sonu (varsayılan 4 hafta)
+    --people all | Tümü | Ad1,Ad2
+                             Hedefler: "all" ortak takvim + herkes (varsayılan: Tümü)
+    --data calendar_data.json
+
+Örnekler:
+    python -m takvim render --people all --weeks 4 --format pdf --outdir rapor --jobs 4
+    python -m takvim render --view month --months 3 --format png
+    python -m takvim render --view year --start 2026-01-01 --people all
+    python -m takvim export --format ics --people Özden --months 12
+    python -m takvim check --weeks 8 --fail-on-conflict
+
+Çıkış kodu: 0 başarılı, 1 doğrulama hatası (veya --fail-on-conflict ile çakışma), 2 hatalı kullanım.
+"""
+import os
+import sys
+import argparse
+import calendar
+import datetime
+from functools import partial
+
+from storage import JSON_FILE, load_data
+
+TEAM = "Tümü"
+ALL_TARGETS = "all"
+
+RENDER_FORMATS = ("pdf", "png", "svg")
+EXPORT_FORMATS = ("ics", "xlsx")
+VIEWS = ("week", "month", "quarter", "year")
+# Özet görünümleri (mini aylar; her zaman vektör çizim, PNG yok)
+OVERVIEW_VIEWS = ("quarter", "year")
+DEFAULT_WEEKS = 4
+
+# Dosya adlarında kullanılamayan karakterler
+_UNSAFE = str.maketrans({c: "_" for c in '<>:"/\\|?* '})
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tarih YYYY-AA-GG biçiminde olmalı: {value}")
+
+
+def _positive(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("1 veya daha büyük olmalı")
+    return number
+
+
+def resolve_range(start=None, end=None, weeks=None, months=None, view="week", align=True):
+    """
+    (ilk gün, son gün). --months tam ayları kapsar. align ise haftalık
+    görünümde aralık Pazartesiden başlayan tam haftalara, aylıkta tam aylara,
+    özetlerde tam çeyrek/yıllara genişletilir (sayfa çizimi); değilse başlangıç
+    olduğu gibi kalır.
+    """
+    start = start or datetime.date.today()
+    if months:
+        first = start.replace(day=1)
+        year, month = divmod(first.year * 12 + first.month - 1 + months - 1, 12)
+        return first, datetime.date(year, month + 1, calendar.monthrange(year, month + 1)[1])
+    if align and view == "year":
+        end = end or start
+        return datetime.date(start.year, 1, 1), datetime.date(end.year, 12, 31)
+    if align and view == "quarter":
+        end = end or start
+        last = (end.month - 1) // 3 * 3 + 3
+        return (datetime.date(start.year, (start.month - 1) // 3 * 3 + 1, 1),
+                datetime.date(end.year, last, calendar.monthrange(end.year, last)[1]))
+    if align and view == "month":
+        start = start.replace(day=1)
+        end = end or start
+        return start, end.replace(day=calendar.monthrange(end.year, end.month)[1])
+    if align:
+        start = start - datetime.timedelta(days=start.weekday())
+        if end is not None:
+            weeks = max(1, -(-((end - start).days + 1) // 7))
+    if end is None:
+        end = start + datetime.timedelta(days=7 * (weeks or DEFAULT_WEEKS) - 1)
+    return start, end
+
+
+def resolve_targets(data, people):
+    """--people değerinden hedef listesi; tanımsız kişi varsa ValueError."""
+    names = [p['name'] if isinstance(p, dict) else p for p in data.get('people', [])]
+    if not people:
+        return [TEAM]
+    if people.strip().lower() == ALL_TARGETS:
+        return [TEAM] + names
+    targets = [p.strip() for p in people.split(",") if p.strip()]
+    unknown = [p for p in targets if p != TEAM and p not in names]
+    if unknown:
+        raise ValueError(f"Tanımsız kişi: {', '.join(unknown)} (kişiler: {', '.join(names)})")
+    return targets
+
+
+def _person(target):
+    return None if target == TEAM else target
+
+
+def _output(outdir, target, suffix, fmt):
+    os.makedirs(outdir, exist_ok=True)
+    return os.path.join(outdir, f"takvim_{target.translate(_UNSAFE)}_{suffix}.{fmt}")
+
+
+def _write(path, body):
+    with open(path, 'wb') as f:
+        f.write(body)
+    print(path)
+
+
+def _months(start, end):
+    month = start.year * 12 + start.month - 1
+    while month <= end.year * 12 + end.month - 1:
+        yield month // 12, month % 12 + 1
+        month += 1
+
+
+def _periods(start, end, view):
+    """Aralığı kapsayan özet dönemleri: [(yıl, çeyrek)] (yıllık özette çeyrek None)."""
+    if view == "year":
+        return [(year, None) for year in range(start.year, end.year + 1)]
+    first = start.year * 4 + (start.month - 1) // 3
+    last = end.year * 4 + (end.month - 1) // 3
+    return [(q // 4, q % 4 + 1) for q in range(first, last + 1)]
+
+
+def _period_name(period):
+    year, quarter = period
+    return f"{year}" if quarter is None else f"{year}-Q{quarter}"
+
+
+def _month_page(data, year, month, person, fmt):
+    """Süreç havuzuna gönderilebilen (modül düzeyi) aylık sayfa çizimi."""
+    from generate_calendar_image import render_month_page
+    return render_month_page(data, year, month, fmt=fmt, user_filter=person)
+
+
+def _map(func, *iterables, jobs=1):
+    """jobs > 1 ise süreç havuzunda, değilse sırayla; sonuç sırası korunur."""
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(func, *iterables)
+    else:
+        yield from map(func, *iterables)
+
+
+# --- Komutlar ---
+
+def cmd_render(data, args, start, end, targets):
+    import generate_calendar_image as gci
+
+    jobs = args.jobs or 1
+    if args.view in OVERVIEW_VIEWS:
+        return _render_overview(data, args, start, end, targets)
+    if args.view == "month":
+        months = list(_months(start, end))
+        tasks = [(target, year, month) for target in targets for year, month in months]
+        pages = _map(partial(_month_page, fmt=args.format), [data] * len(tasks), [y for _, y, _ in tasks],
+                     [m for _, _, m in tasks], [_person(t) for t, _, _ in tasks], jobs=min(jobs, len(tasks)))
+        if args.format == "pdf":
+            for target in targets:
+                target_pages = [next(pages) for _ in months]
+                path = _output(args.outdir, target, f"{start:%Y-%m}_{end:%Y-%m}", "pdf")
+                if len(target_pages) == 1:
+                    _write(path, target_pages[0])
+                else:
+                    gci.merge_pdf_pages(target_pages, path)
+                    print(path)
+        else:
+            for (target, year, month), page in zip(tasks, pages):
+                _write(_output(args.outdir, target, f"{year}-{month:02d}", args.format), page)
+        return 0
+
+    week_starts = gci._week_starts(start, (end - start).days // 7 + 1)
+    if args.format == "pdf":
+        for target, pdf in gci.iter_team_pdfs(data, week_starts, targets, jobs=jobs, backend=args.backend):
+            _write(_output(args.outdir, target, f"{week_starts[0]:%Y%m%d}_{end:%Y%m%d}", "pdf"), pdf)
+        return 0
+
+    # PNG/SVG: kişi x hafta başına bir görüntü
+    if args.format == "png" and args.backend == "vector":
+        raise ValueError("Vektör çizim motoru PNG üretmez; --backend matplotlib kullanın.")
+    by_person = gci.split_by_person(gci.expand(data, start, end), targets)
+    tasks = [(target, ws, occ) for target in targets
+             for ws, occ in zip(week_starts, gci._split_weeks(by_person[target], week_starts))]
+    render = partial(gci.get_weekly_calendar_image, fmt=args.format, backend=args.backend)
+    workers = min(jobs, len(tasks)) if args.backend == "matplotlib" else 1
+    images = _map(render, [data] * len(tasks), [t[1] for t in tasks], [None] * len(tasks), [t[2] for t in tasks],
+                  jobs=workers)
+    for (target, ws, _), image in zip(tasks, images):
+        _write(_output(args.outdir, target, f"{ws:%Y%m%d}", args.format), image)
+    return 0
+
+
+def _render_overview(data, args, start, end, targets):
+    """Yıl/çeyrek özeti: PDF'te hedef başına dönem başı bir sayfa, SVG'de dönem başı bir dosya."""
+    from vector_render import render_overview_pdf, render_overview_svg
+
+    if args.format == "png":
+        raise ValueError("Yıl/çeyrek özeti PNG üretmez; --format pdf veya svg kullanın.")
+    periods = _periods(start, end, args.view)
+    for target in targets:
+        if args.format == "pdf":
+            suffix = _period_name(periods[0])
+            if len(periods) > 1:
+                suffix += f"_{_period_name(periods[-1])}"
+            path = _output(args.outdir, target, suffix, "pdf")
+            render_overview_pdf(data, periods, path, user_filter=_person(target))
+            print(path)
+        else:
+            for year, quarter in periods:
+                svg = render_overview_svg(data, year, quarter=quarter, user_filter=_person(target))
+                _write(_output(args.outdir, target, _period_name((year, quarter)), "svg"), svg.encode('utf-8'))
+    return 0
+
+
+def _xlsx(data, start, end, targets, path):
+    from openpyxl import Workbook
+    from batch_expand import expand_frame, filter_person, meetings_to_columns
+    from recurrence import TR_DAYS
+
+    # Uzun (çok yıllık) aralıklar Python döngüsü olmadan tek tabloda genişletilir
+    columns = meetings_to_columns(data)
+    frame = expand_frame(data, start, end, columns=columns)
+    meetings = data.get('meetings', [])
+    workbook = Workbook(write_only=True)
+    for target in targets:
+        sheet = workbook.create_sheet(title="".join(c for c in target if c not in '[]:*?/\\')[:31] or "Sayfa")
+        sheet.append(["Tarih", "Gün", "Başlangıç", "Bitiş", "Toplantı", "Katılımcılar", "Sıklık"])
+        rows = frame if _person(target) is None else filter_person(frame, columns, target)
+        for idx, ordinal in zip(rows['meeting_idx'].tolist(), rows['ordinal'].tolist()):
+            m = meetings[idx]
+            date = datetime.date.fromordinal(ordinal)
+            sheet.append([date, TR_DAYS[date.weekday()], m.get('start_time'), m.get('end_time'),
+                          m.get('title'), ", ".join(m.get('attendees', [])), m.get('frequency')])
+    workbook.save(path)
+    print(path)
+
+
+def cmd_export(data, args, start, end, targets):
+    suffix = f"{start:%Y%m%d}_{end:%Y%m%d}"
+    if args.format == "xlsx":
+        name = TEAM if targets == [TEAM] else ("ekip" if len(targets) > 1 else targets[0])
+        _xlsx(data, start, end, targets, _output(args.outdir, name, suffix, "xlsx"))
+        return 0
+
+    from ics_export import write_ics
+    for target in targets:
+        path = _output(args.outdir, target, suffix, "ics")
+        with open(path, 'wb') as f:
+            write_ics(f, data, start, end, person=_person(target))
+        print(path)
+    return 0
+
+
+def check_data(data):
+    """Doğrulama hataları ve uyarıları: (hatalar, uyarılar) metin listeleri."""
+    from recurrence import compile_meeting, KIND_NONE
+    from meeting_table import _valid_time
+
+    errors, warnings = [], []
+    if 'settings' not in data:
+        errors.append("'settings' anahtarı eksik")
+    names = {p['name'] if isinstance(p, dict) else p for p in data.get('people', [])}
+    seen_ids = set()
+    for pos, m in enumerate(data.get('meetings', []), 1):
+        label = f"#{pos} {m.get('title', '(başlıksız)')} ({m.get('day', '?')} {m.get('start_time', '?')})"
+        if not m.get('id'):
+            errors.append(f"{label}: kimlik (id) yok")
+        elif m['id'] in seen_ids:
+            errors.append(f"{label}: kimlik tekrar ediyor ({m['id']})")
+        seen_ids.add(m.get('id'))
+        if not (_valid_time(m.get('start_time')) and _valid_time(m.get('end_time'))):
+            errors.append(f"{label}: saat biçimi hatalı")
+        elif m['end_time'] <= m['start_time']:
+            errors.append(f"{label}: bitiş saati başlangıçtan önce")
+        elif compile_meeting(m).kind == KIND_NONE:
+            errors.append(f"{label}: gün veya sıklık tanınmıyor, takvimde gösterilmez")
+        if m.get('start_date', '') > m.get('end_date', '9999'):
+            errors.append(f"{label}: bitiş tarihi başlangıçtan önce")
+        unknown = [p for p in m.get('attendees', []) if p not in names]
+        if unknown:
+            warnings.append(f"{label}: tanımsız katılımcı {', '.join(unknown)}")
+    for date_str in data.get('holidays', {}):
+        try:
+            datetime.date.fromisoformat(date_str)
+        except (TypeError, ValueError):
+            errors.append(f"Tatil tarihi hatalı: {date_str}")
+    return errors, warnings
+
+
+def cmd_check(data, args, start, end, targets):
+    from conflicts import find_conflicts
+
+    errors, warnings = check_data(data)
+    for line in errors:
+        print(f"HATA: {line}")
+    for line in warnings:
+        print(f"UYARI: {line}")
+
+    people = None if TEAM in targets else targets
+    conflicts = find_conflicts(data, start, end, people=people)
+    for c in conflicts:
+        print(f"ÇAKIŞMA: {c.date.isoformat()} {c.first.meeting['title']} / {c.second.meeting['title']} "
+              f"({c.overlap_min} dk; {', '.join(c.people)})")
+    print(f"{len(data.get('meetings', []))} toplantı, {start.isoformat()} - {end.isoformat()}: "
+          f"{len(errors)} hata, {len(warnings)} uyarı, {len(conflicts)} çakışma")
+    return 1 if errors or (args.fail_on_conflict and conflicts) else 0
+
+
+COMMANDS = {"render": cmd_render, "export": cmd_export, "check": cmd_check}
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data", default=JSON_FILE, help="Takvim veri dosyası (depolama motoru TAKVIM_STORAGE)")
+    common.add_argument("--start", type=_date, help="Başlangıç tarihi (varsayılan bugün)")
+    span = common.add_mutually_exclusive_group()
+    span.add_argument("--end", type=_date, help="Bitiş tarihi (dahil)")
+    span.add_argument("--weeks", type=_positive, help=f"Hafta sayısı (varsayılan {DEFAULT_WEEKS})")
+    span.add_argument("--months", type=_positive, help="Ay sayısı (başlangıç ayından itibaren)")
+    common.add_argument("--people", help='"all", "Tümü" veya virgülle ayrılmış kısa adlar')
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--outdir", default=".", help="Çıktı klasörü")
+
+    parser = argparse.ArgumentParser(prog="takvim", description="Toplantı takvimi komut satırı aracı.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser("render", parents=[common, output], help="Takvim sayfaları üret")
+    render.add_argument("--format", choices=RENDER_FORMATS, default="pdf")
+    render.add_argument("--view", choices=VIEWS, default="week",
+                        help="week/month sayfaları veya quarter/year özeti (12 mini ay, vektör)")
+    render.add_argument("--backend", choices=("matplotlib", "vector"), default="matplotlib",
+                        help="Çizim motoru (vector: PDF/SVG, çok daha hızlı)")
+    render.add_argument("--jobs", type=_positive, default=None, help="Paralel işçi süreç sayısı (varsayılan CPU sayısı)")
+
+    export = sub.add_parser("export", parents=[common, output], help="ICS veya Excel dışa aktar")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="ics")
+
+    check = sub.add_parser("check", parents=[common], help="Veriyi doğrula, çakışmaları listele")
+    check.add_argument("--fail-on-conflict", action="store_true", help="Çakışma varsa çıkış kodu 1")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "render" and args.jobs is None:
+        args.jobs = os.cpu_count() or 1
+
+    # Sayfa çizimi tam hafta/ay ister; dışa aktarma ve kontrol verilen aralığı kullanır
+    start, end = resolve_range(args.start, args.end, args.weeks, args.months, view=getattr(args, "view", "week"),
+                               align=args.command == "render")
+    if end < start:
+        parser.error("Bitiş tarihi başlangıçtan önce olamaz")
+    # Komutların hiçbiri kaydetmez: eski şemalı dosya geri yazılmaz, yedek alınmaz
+    data = load_data(args.data, read_only=True)
+    try:
+        targets = resolve_targets(data, args.people)
+        return COMMANDS[args.command](data, args, start, end, targets)
+    except ValueError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+import sys
+import datetime
+
+import pytest
+
+from batch_expand import expand_frame, expand_years, filter_person, meetings_to_columns
+from recurrence import expand
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+from synthetic import generate_calendar  # noqa: E402
+
+
+def meeting(id, title, day, frequency, start="09:00", end="10:00", attendees=("Ayşe",),
+            start_date="2026-01-01", end_date="2026-12-31"):
+    return {"id": id, "title": title, "day": day, "start_time": start, "end_time": end, "frequency": frequency,
+            "attendees": list(attendees), "start_date": start_date, "end_date": end_date}
+
+
+def sample():
+    return {
+        "settings": {},
+        "people": [{"name": "Ayşe"}, {"name": "Ali"}],
+        "meetings": [
+            meeting("w", "Haftalık", "Salı", "Her Hafta", attendees=("Ayşe", "Ali")),
+            meeting("b", "İki haftada bir", "Çarşamba", "İki Haftada Bir", start_date="2026-01-14"),
+            meeting("l", "Son pazartesi", "Pazartesi", "Aylık (Son Pazartesi)", attendees=("Ali",)),
+            meeting("f", "İlk cuma", "Cuma", "Aylık", start="14:00", end="15:00"),
+            meeting("o", "Tek", "Perşembe", "Tek Seferlik", start_date="2026-03-05", end_date="2026-03-05"),
+            # Aynı gün ve saatte iki toplantı: sıra expand ile aynı kalmalı
+            meeting("s", "Aynı saat", "Salı", "Her Hafta", attendees=("Ali",)),
+        ],
+        "holidays": {"2026-01-06": "Tatil", "2026-03-30": "Tatil"},
+        "exceptions": [{"date": "2026-02-10", "meeting_title": "Haftalık", "meeting_id": "w"},
+                       {"date": "2026-02-11", "meeting_title": "İki haftada bir", "meeting_id": "b"}],
+    }
+
+
+def rows(frame, data):
+    meetings = data["meetings"]
+    return [(datetime.date.fromordinal(o), meetings[i]["id"])
+            for i, o in zip(frame["meeting_idx"].tolist(), frame["ordinal"].tolist())]
+
+
+def expected(data, start, end, person=None):
+    return [(o.date, o.meeting["id"]) for o in expand(data, start, end, user_filter=person)]
+
+
+@pytest.mark.parametrize("start,end", [
+    (datetime.date(2026, 1, 1), datetime.date(2026, 12, 31)),
+    (datetime.date(2026, 2, 9), datetime.date(2026, 2, 15)),
+    (datetime.date(2025, 6, 1), datetime.date(2027, 6, 30)),
+])
+def test_rows_match_expand(start, end):
+    data = sample()
+    assert rows(expand_frame(data, start, end), data) == expected(data, start, end)
+
+
+def test_holidays_exceptions_and_rules_are_applied():
+    data = sample()
+    got = rows(expand_frame(data, datetime.date(2026, 1, 1), datetime.date(2026, 3, 31)), data)
+    assert (datetime.date(2026, 1, 6), "w") not in got          # tatil
+    assert (datetime.date(2026, 2, 10), "w") not in got         # istisna
+    assert (datetime.date(2026, 2, 17), "w") in got
+    assert [d for d, i in got if i == "b"] == [datetime.date(2026, 1, 14), datetime.date(2026, 1, 28),
+                                              datetime.date(2026, 2, 25), datetime.date(2026, 3, 11),
+                                              datetime.date(2026, 3, 25)]
+    assert [d for d, i in got if i == "l"] == [datetime.date(2026, 1, 26), datetime.date(2026, 2, 23)]
+
+
+def test_person_filter_matches_expand():
+    data = sample()
+    columns = meetings_to_columns(data)
+    start, end = datetime.date(2026, 1, 1), datetime.date(2026, 12, 31)
+    frame = expand_frame(data, start, end, columns=columns)
+    assert rows(filter_person(frame, columns, "Ali"), data) == expected(data, start, end, person="Ali")
+    assert rows(filter_person(frame, columns, "Yok"), data) == []
+
+
+def test_synthetic_years_match_expand():
+    data = generate_calendar(20, 300, seed=7, year=2026)
+    meetings = data["meetings"]
+    data["exceptions"] = [{"date": "2026-05-04", "meeting_title": m["title"], "meeting_id": m["id"]}
+                          for m in meetings[::5]]
+    start = datetime.date(2026, 1, 1)
+    frame = expand_years(data, start, 2)
+    assert rows(frame, data) == expected(data, start, datetime.date(2027, 12, 31))
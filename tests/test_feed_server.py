@@ -0,0 +1,89 @@
+import os
+import threading
+import http.client
+
+import pytest
+
+import feed_server
+from feed_server import _etag_matches, _manifests, feed_dir, make_server, publish_feeds, schedule_publish
+
+MEETING = {"id": "m1", "title": "Durum", "day": "Pazartesi", "start_time": "09:00", "end_time": "10:00",
+           "frequency": "Her Hafta", "attendees": ["Özden"], "start_date": "2026-01-01", "end_date": "2026-12-31"}
+
+
+def doc(version, meetings=(MEETING,)):
+    return {"settings": {}, "people": [{"name": "Özden"}], "meetings": list(meetings), "holidays": {},
+            "exceptions": [], "doc_version": version}
+
+
+def test_publisher_survives_a_failing_document(tmp_path, monkeypatch):
+    json_file = str(tmp_path / "calendar_data.json")
+    monkeypatch.setattr(feed_server, "PUBLISH_DELAY", 0.01)
+
+    # Başlıksız toplantı publish_feeds'te KeyError verir
+    broken = dict(MEETING)
+    del broken["title"]
+    schedule_publish(doc(1, [broken]), json_file)
+    feed_server.wait_for_publish(5)
+    assert os.path.abspath(json_file) not in feed_server._PUBLISHERS
+
+    schedule_publish(doc(2), json_file)
+    feed_server.wait_for_publish(5)
+    assert [version for version, _ in _manifests(feed_dir(json_file))] == [2]
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ("*", True),
+    ('"abd"', False),
+    ("abc", False),
+])
+def test_etag_matches(header, expected):
+    assert _etag_matches(header, '"abc"') is expected
+
+
+@pytest.fixture
+def server(tmp_path):
+    json_file = str(tmp_path / "calendar_data.json")
+    publish_feeds(doc(1), json_file)
+    httpd = make_server(json_file, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(port, method, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request(method, path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_handler_serves_feed_with_etag_and_304(server):
+    response, body = request(server, "GET", "/feeds/all.ics")
+    assert response.status == 200
+    assert body.startswith(b"BEGIN:VCALENDAR")
+    etag = response.getheader("ETag")
+    assert etag and etag.startswith('"')
+
+    response, body = request(server, "GET", "/feeds/all.ics", {"If-None-Match": etag})
+    assert response.status == 304 and body == b""
+    assert response.getheader("ETag") == etag
+
+    response, body = request(server, "HEAD", "/feeds/all.ics")
+    assert response.status == 200 and body == b""
+    assert response.getheader("ETag") == etag
+
+
+def test_handler_person_feed_and_unknown(server):
+    response, body = request(server, "GET", "/feeds/%C3%96zden.ics")
+    assert response.status == 200 and b"SUMMARY:Durum" in body
+    response, body = request(server, "GET", "/feeds/yok.ics")
+    assert response.status == 404 and "/feeds/all.ics".encode() in body
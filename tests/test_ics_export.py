@@ -0,0 +1,109 @@
+import io
+import datetime
+
+from ics_export import _fold, ics_bytes
+from ics_import import import_ics, UID_FIELD
+from recurrence import expand
+
+LONG_TITLE = "Çarşamba Öğleden Sonra Görüşme — Ürün Geliştirme, Müşteri İlişkileri ve Güvenlik Değerlendirmesi"
+
+
+def meeting(id, title, day, frequency, start="09:00", end="10:00", attendees=("Özden",),
+            start_date="2026-01-05", end_date="2026-12-31"):
+    return {"id": id, "title": title, "day": day, "start_time": start, "end_time": end, "frequency": frequency,
+            "attendees": list(attendees), "start_date": start_date, "end_date": end_date}
+
+
+def calendar(meetings=None):
+    return {
+        "settings": {},
+        "people": [{"name": "Özden", "fullname": "Özden Şahin", "email": "ozden@example.com"},
+                   {"name": "Gül", "fullname": "Gül Işık", "email": "gul@example.com"}],
+        "meetings": meetings if meetings is not None else [
+            meeting("w1", LONG_TITLE, "Çarşamba", "Her Hafta", attendees=("Özden", "Gül")),
+            # Seri 12 Ocak'ta başlar: 2 Mart tekrar değil, aralıktaki ilk tekrar 9 Mart'tır
+            meeting("b1", "İki haftalık", "Pazartesi", "İki Haftada Bir", start="11:00", end="11:30",
+                    start_date="2026-01-12"),
+            meeting("l1", "Ay sonu", "Pazartesi", "Aylık (Son Pazartesi)", start="15:00", end="16:00",
+                    attendees=("Gül",)),
+            meeting("f1", "İlk cuma", "Cuma", "Aylık", start="13:00", end="14:00"),
+        ],
+        "holidays": {"2026-03-18": "Tatil"},
+        "exceptions": [{"date": "2026-04-08", "meeting_title": LONG_TITLE, "meeting_id": "w1"}],
+    }
+
+
+START, END = datetime.date(2026, 3, 2), datetime.date(2026, 6, 30)
+
+
+def unfolded(ics):
+    return ics.replace("\r\n ", "").split("\r\n")
+
+
+def event(ics, uid):
+    lines = unfolded(ics)
+    begin = lines.index(f"UID:{uid}@takvim") - 1
+    return lines[begin:lines.index("END:VEVENT", begin)]
+
+
+def test_fold_keeps_multibyte_characters_whole():
+    line = "SUMMARY:" + "ğüşıöçĞÜŞİÖÇ" * 20
+    folded = _fold(line)
+    physical = folded.encode("utf-8").split(b"\r\n")[:-1]
+    assert all(len(p) <= 75 for p in physical)
+    assert all(p.startswith(b" ") for p in physical[1:])
+    [p.decode("utf-8") for p in physical]  # Çok baytlı karakter bölünmez
+    assert folded.replace("\r\n ", "") == line + "\r\n"
+    assert _fold("SUMMARY:kısa") == "SUMMARY:kısa\r\n"
+
+
+def test_every_line_is_folded_to_75_octets():
+    ics = ics_bytes(calendar(), START, END)
+    assert all(len(line) <= 75 for line in ics.split(b"\r\n"))
+    assert "SUMMARY:" + LONG_TITLE.replace(",", "\\,") in unfolded(ics.decode("utf-8"))
+
+
+def test_rrule_interval_byday_and_exdates():
+    ics = ics_bytes(calendar(), START, END, conflicts=False).decode("utf-8")
+
+    biweekly = event(ics, "b1")
+    assert "DTSTART;TZID=Europe/Istanbul:20260309T110000" in biweekly
+    assert any(line.startswith("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO;") for line in biweekly)
+
+    assert any(line.startswith("RRULE:FREQ=MONTHLY;BYDAY=-1MO;") for line in event(ics, "l1"))
+    assert any(line.startswith("RRULE:FREQ=MONTHLY;BYDAY=1FR;") for line in event(ics, "f1"))
+    # Tatil (18 Mart) ve istisna (8 Nisan)
+    assert "EXDATE;TZID=Europe/Istanbul:20260318T090000,20260408T090000" in event(ics, "w1")
+
+
+def test_uids_are_stable():
+    data = calendar()
+    first = ics_bytes(data, START, END, dtstamp=datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc))
+    data["meetings"][0] = dict(data["meetings"][0], title="Yeni başlık")
+    second = ics_bytes(data, START, END, dtstamp=datetime.datetime(2026, 2, 1, tzinfo=datetime.timezone.utc))
+
+    def uids(ics):
+        return [line for line in unfolded(ics.decode("utf-8")) if line.startswith("UID:")]
+    assert uids(first) == uids(second)
+    assert "UID:w1@takvim" in uids(first)
+
+
+def occurrences(data):
+    return [(o.date, o.start_min, o.end_min, o.meeting["title"], tuple(o.meeting["attendees"]))
+            for o in expand(data, START, END)]
+
+
+def test_round_trip_through_import():
+    original = calendar()
+    ics = ics_bytes(original, START, END)
+
+    imported = calendar(meetings=[])
+    result = import_ics(imported, [("takvim.ics", io.BytesIO(ics))])
+    assert not result.errors
+    assert occurrences(imported) == occurrences(original)
+    assert {m[UID_FIELD] for m in imported["meetings"]} == {f"{i}@takvim" for i in ("w1", "b1", "l1", "f1")}
+
+    # Aynı dosya tekrar içe aktarılınca kayıtlar çoğalmaz
+    again = import_ics(imported, [("takvim.ics", io.BytesIO(ics))])
+    assert (again.added, again.updated) == (0, 0)
+    assert occurrences(imported) == occurrences(original)
@@ -0,0 +1,12 @@
+from journal import Journal
+
+
+def test_history_is_newest_first_across_segments(tmp_path):
+    journal = Journal(str(tmp_path / "calendar_data.json"), snapshot_every=7)
+    doc = journal.load()
+    for i in range(30):
+        doc = dict(doc, meetings=doc.get("meetings", []) + [{"id": str(i), "title": f"T{i}"}], doc_version=i + 1)
+        journal.save(doc)
+
+    assert [seq for seq, _, _ in journal.history(10)] == list(range(30, 20, -1))
+    assert [seq for seq, _, _ in journal.history(100)] == list(range(30, 0, -1))
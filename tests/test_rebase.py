@@ -0,0 +1,41 @@
+import pytest
+
+from rebase import merge, ConcurrentEditError
+
+A = {"id": "a", "title": "A", "start_time": "09:00"}
+B = {"id": "b", "title": "B", "start_time": "10:00"}
+C = {"id": "c", "title": "C", "start_time": "11:00"}
+
+
+def doc(*meetings):
+    return {"meetings": list(meetings), "doc_version": 1}
+
+
+def test_delete_plus_edit_against_concurrent_edit_of_same_meeting_conflicts():
+    # mine: B silinir, C'nin başlığı değişir; theirs: C'nin saati değişir
+    base = doc(A, B, C)
+    mine = doc(A, dict(C, title="C2"))
+    theirs = doc(A, B, dict(C, start_time="12:00"))
+    with pytest.raises(ConcurrentEditError):
+        merge(base, mine, theirs)
+
+
+def test_delete_plus_edit_against_unrelated_edit_matches_by_id():
+    base = doc(A, B, C)
+    mine = doc(A, dict(C, title="C2"))
+    theirs = doc(dict(A, title="A2"), B, C)
+    merged = merge(base, mine, theirs)["meetings"]
+    assert merged == [dict(A, title="A2"), dict(C, title="C2")]
+    assert len({m["id"] for m in merged}) == len(merged)
+
+
+def test_added_meeting_follows_its_neighbour():
+    base = doc(A, B)
+    new = {"id": "n", "title": "N", "start_time": "08:00"}
+    merged = merge(base, doc(A, new, B), doc(A, B, C))["meetings"]
+    assert [m["id"] for m in merged] == ["a", "n", "b", "c"]
+
+
+def test_deleted_meeting_edited_elsewhere_conflicts():
+    with pytest.raises(ConcurrentEditError):
+        merge(doc(A, B), doc(A), doc(A, dict(B, title="B2")))
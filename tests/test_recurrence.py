@@ -0,0 +1,49 @@
+import io
+import datetime
+
+from ics_export import ics_bytes
+from ics_import import import_ics
+from month_model import count_by_day
+from occurrence_index import OccurrenceIndex
+from recurrence import expand
+
+ICS = b"""BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:haftalik-1
+SUMMARY:Durum
+DTSTART:20260302T090000
+DTEND:20260302T100000
+RRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=4
+EXDATE:20260309T090000
+END:VEVENT
+END:VCALENDAR
+"""
+
+START, END = datetime.date(2026, 3, 1), datetime.date(2026, 3, 31)
+MONDAYS = [datetime.date(2026, 3, d) for d in (2, 16, 23)]
+
+
+def imported():
+    data = {"settings": {}, "people": [], "meetings": [], "holidays": {}, "exceptions": []}
+    import_ics(data, [("takvim.ics", io.BytesIO(ICS))])
+    return data
+
+
+def test_exdate_disappears_from_expand():
+    data = imported()
+    assert data["exceptions"][0]["date"] == "2026-03-09"
+    assert [o.date for o in expand(data, START, END)] == MONDAYS
+
+
+def test_exdate_is_skipped_by_index_and_month_counts():
+    data = imported()
+    index = OccurrenceIndex()
+    index.sync(data)
+    assert [o.date for o in index.query(START, END)] == MONDAYS
+    assert sorted(count_by_day(data, START, END).total) == [d.toordinal() for d in MONDAYS]
+
+
+def test_exdate_is_exported():
+    ics = ics_bytes(imported(), START, END, conflicts=False).decode("utf-8")
+    assert "EXDATE;TZID=Europe/Istanbul:20260309T090000" in ics
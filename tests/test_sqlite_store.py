@@ -0,0 +1,101 @@
+import os
+import sys
+import random
+import datetime
+
+import pytest
+
+from recurrence import expand
+from sqlite_store import SqliteStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+from synthetic import generate_calendar  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteStore(str(tmp_path / "calendar_data.db"))
+    yield store
+    store.close()
+
+
+def saved(store, data):
+    assert store.save(data)
+    return store.load()
+
+
+def mutate(rng, meetings, pool):
+    """Rastgele tek düzenleme: ekle, sil, düzenle, yer değiştir, taşı, çoğalt."""
+    op = rng.choice(("insert", "delete", "edit", "swap", "move", "duplicate"))
+    if op == "insert" or not meetings:
+        meetings.insert(rng.randint(0, len(meetings)), dict(rng.choice(pool), id=f"n{rng.getrandbits(32):08x}"))
+    elif op == "delete":
+        del meetings[rng.randrange(len(meetings))]
+    elif op == "edit":
+        i = rng.randrange(len(meetings))
+        meetings[i] = dict(meetings[i], start_time=rng.choice(("08:00", "09:30", "11:00")))
+    elif op == "swap":
+        i, j = rng.randrange(len(meetings)), rng.randrange(len(meetings))
+        meetings[i], meetings[j] = meetings[j], meetings[i]
+    elif op == "move":
+        meetings.insert(rng.randint(0, len(meetings) - 1), meetings.pop(rng.randrange(len(meetings))))
+    else:
+        i = rng.randrange(len(meetings))
+        meetings.insert(rng.randint(0, len(meetings)), dict(meetings[i]))
+
+
+def test_round_trip_after_random_edits(store):
+    data = generate_calendar(6, 30, seed=1)
+    data["exceptions"] = [{"date": "2026-03-02", "meeting_title": "x", "meeting_id": data["meetings"][0]["id"]}]
+    pool = list(data["meetings"])
+    assert saved(store, data) == data
+
+    rng = random.Random(3)
+    for step in range(150):
+        meetings = list(data["meetings"])
+        for _ in range(rng.randint(1, 4)):
+            mutate(rng, meetings, pool)
+        data = dict(data, meetings=meetings, doc_version=data["doc_version"] + 1)
+        assert saved(store, data) == data, f"adım {step}"
+
+
+def test_round_trip_reorders_and_duplicates(store):
+    data = generate_calendar(4, 8, seed=2)
+    meetings = data["meetings"]
+    saved(store, data)
+
+    reversed_doc = dict(data, meetings=meetings[::-1])
+    assert saved(store, reversed_doc) == reversed_doc
+
+    # Aynı içerikli kopyalar (kimlik dahil) ayrı satırlar olarak korunur
+    duplicated = dict(data, meetings=[meetings[0], meetings[0]] + meetings[1:] + [meetings[0]])
+    assert saved(store, duplicated) == duplicated
+    fewer = dict(data, meetings=[meetings[0]] + meetings[1:])
+    assert saved(store, fewer) == fewer
+
+
+def test_expected_version_mismatch_does_not_write(store):
+    data = generate_calendar(3, 5, seed=4)
+    saved(store, data)
+    assert store.save(dict(data, meetings=[]), expected_version=data["doc_version"] + 1) is False
+    assert store.load() == data
+
+
+@pytest.mark.parametrize("start,end,person", [
+    (datetime.date(2026, 3, 2), datetime.date(2026, 3, 8), None),
+    (datetime.date(2026, 3, 4), datetime.date(2026, 3, 4), None),
+    (datetime.date(2026, 1, 1), datetime.date(2026, 12, 31), None),
+    (datetime.date(2026, 1, 1), datetime.date(2026, 12, 31), "Ayşe"),
+    (datetime.date(2026, 3, 2), datetime.date(2026, 3, 8), "Mehmet"),
+])
+def test_query_matches_expand(store, start, end, person):
+    data = generate_calendar(8, 200, seed=5)
+    data["exceptions"] = [{"date": "2026-03-04", "meeting_title": m["title"], "meeting_id": m["id"]}
+                          for m in data["meetings"][::3]]
+    store.save(data)
+
+    def key(o):
+        return o.date, o.start_min, o.meeting["id"]
+    got = store.query(start, end, person=person)
+    want = expand(data, start, end, user_filter=person)
+    assert got and list(map(key, got)) == list(map(key, want))
@@ -0,0 +1,44 @@
+import json
+
+import storage
+
+OLD_DOC = {"people": ["Ayşe"], "meetings": [{"title": "Planlama", "attendees": ["Ayşe"], "day": "Pazartesi",
+                                            "start_time": "09:00", "end_time": "10:00", "frequency": "Her Hafta"}],
+           "doc_version": 3}
+
+
+def write_old(tmp_path):
+    json_file = tmp_path / "calendar_data.json"
+    json_file.write_text(json.dumps(OLD_DOC), encoding="utf-8")
+    return str(json_file)
+
+
+def test_migration_claimed_elsewhere_returns_in_memory_doc(tmp_path, monkeypatch):
+    # Göçü (3 -> 4) yazan başka bir oturum bitmiyor: yükleme sonsuza dek yeniden denemez
+    json_file = write_old(tmp_path)
+    open(storage._claim_path(json_file, 4), "w").close()
+    monkeypatch.setattr(storage, "SAVE_TIMEOUT", 0.05)
+    monkeypatch.setenv(storage.STORAGE_ENV, "json")
+    monkeypatch.chdir(tmp_path)
+
+    doc = storage.load_data(json_file)
+    assert doc[storage.SCHEMA_KEY] == storage.SCHEMA_VERSION
+    assert doc[storage.VERSION_KEY] == 3
+    assert doc["meetings"][0]["id"]
+    assert json.loads(open(json_file, encoding="utf-8").read()) == OLD_DOC
+
+
+def test_read_only_load_does_not_write_back(tmp_path, monkeypatch):
+    json_file = write_old(tmp_path)
+    monkeypatch.setenv(storage.STORAGE_ENV, "json")
+    monkeypatch.chdir(tmp_path)
+
+    doc = storage.load_data(json_file, read_only=True)
+    assert doc[storage.SCHEMA_KEY] == storage.SCHEMA_VERSION
+    assert doc[storage.VERSION_KEY] == 3
+    assert json.loads(open(json_file, encoding="utf-8").read()) == OLD_DOC
+    assert not (tmp_path / storage.BACKUP_DIR).exists()
+
+    # Normal yükleme göçü bir kez yazar
+    assert storage.load_data(json_file)[storage.VERSION_KEY] == 4
+    assert json.loads(open(json_file, encoding="utf-8").read())[storage.SCHEMA_KEY] == storage.SCHEMA_VERSION
@@ -0,0 +1,471 @@
+"""
+matplotlib kullanmayan hafif vektör çizici (SVG ve PDF).
+
+Haftalık görünüm yalnızca dikdörtgen, çizgi ve metinden oluşur. Bu modül
+week_model.build_weekly_model çıktısını doğrudan SVG metnine veya az sayıda PDF
+operatörüyle yazılmış çok sayfalı bir PDF'e çevirir. Sayfa düzeni matplotlib
+çıktısıyla (16x10 inç, aynı kenar boşlukları ve yazı boyutları) eşleşir.
+Yıl/çeyrek özeti (month_model.build_overview_model) de aynı tuvallere çizilir.
+"""
+import io
+import zlib
+import unicodedata
+from xml.sax.saxutils import escape
+
+from week_model import build_weekly_model
+from month_model import build_overview_model, heat_level, heat_legend, HEAT_COLORS, HOLIDAY_COLOR, WEEKEND_COLOR
+
+# Sayfa birimi: 100 dpi'da 16x10 inçlik figürün pikselleri
+PAGE_WIDTH = 1600
+PAGE_HEIGHT = 1000
+
+# Çizim alanı (subplots_adjust(top=0.85, bottom=0.15, left=0.05, right=0.95))
+PLOT_LEFT = 80
+PLOT_RIGHT = 1520
+PLOT_TOP = 150
+PLOT_BOTTOM = 850
+
+# Punto -> sayfa birimi (100 dpi)
+PT = 100 / 72
+
+# PDF sayfası (punto) / sayfa birimi
+PDF_SCALE = 0.72
+
+LINE_HEIGHT = 1.2
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip('#')
+    if len(color) != 6:
+        return 0.0, 0.0, 0.0
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+# --- Helvetica metrikleri (AFM, 1000 birim/em; ASCII 32-126) ---
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_BOLD_FACTOR = 1.07
+
+
+def text_width(text, size, bold=False):
+    """Helvetica ile yazılmış tek satırın yaklaşık genişliği (size biriminde)."""
+    total = 0
+    for ch in text:
+        if ch == 'ı':
+            ch = 'i'
+        code = ord(unicodedata.normalize('NFD', ch)[0])
+        total += _HELVETICA_WIDTHS[code - 32] if 32 <= code <= 126 else 556
+    width = total * size / 1000
+    return width * _BOLD_FACTOR if bold else width
+
+
+class SvgCanvas:
+    """Çizim komutlarını SVG öğelerine çevirir."""
+
+    def __init__(self, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.parts = []
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, lw=0, opacity=1.0, round_join=False):
+        attrs = f'x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}" fill="{fill or "none"}"'
+        if stroke and lw:
+            attrs += f' stroke="{stroke}" stroke-width="{lw:.2f}"'
+            if round_join:
+                attrs += ' stroke-linejoin="round"'
+        if opacity < 1:
+            attrs += f' opacity="{opacity}"'
+        self.parts.append(f'<rect {attrs}/>')
+
+    def line(self, x1, y1, x2, y2, color, lw, dash=None, opacity=1.0):
+        attrs = f'x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" stroke="{color}" stroke-width="{lw:.2f}"'
+        if dash:
+            attrs += f' stroke-dasharray="{" ".join(f"{d:.2f}" for d in dash)}"'
+        if opacity < 1:
+            attrs += f' opacity="{opacity}"'
+        self.parts.append(f'<line {attrs}/>')
+
+    def text(self, x, y, text, size, color='#333333', bold=False, italic=False, anchor='middle', rotate=0):
+        """Çok satırlı metni (x, y) noktasına dikey ortalı yazar."""
+        lines = text.split('\n')
+        line_h = size * LINE_HEIGHT
+        first = -(len(lines) * line_h) / 2 + size * 0.8
+        style = f'font-size="{size:.2f}" fill="{color}" text-anchor="{anchor}"'
+        if bold:
+            style += ' font-weight="bold"'
+        if italic:
+            style += ' font-style="italic"'
+        if rotate:
+            style += f' transform="rotate({-rotate} {x:.2f} {y:.2f})"'
+        spans = ''.join(f'<tspan x="{x:.2f}" y="{y + first + i * line_h:.2f}">{escape(line)}</tspan>'
+                        for i, line in enumerate(lines))
+        self.parts.append(f'<text {style}>{spans}</text>')
+
+    def to_string(self):
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                f'viewBox="0 0 {self.width} {self.height}" font-family="Helvetica, Arial, DejaVu Sans, sans-serif">'
+                + ''.join(self.parts) + '</svg>')
+
+
+# --- Minimal PDF yazıcı ---
+
+# WinAnsi dışındaki Türkçe harfler için kodlama farkları (Differences)
+_TR_CODES = {'Ğ': 128, 'ğ': 129, 'İ': 130, 'ı': 131, 'Ş': 132, 'ş': 133}
+_TR_GLYPHS = "/Gbreve /gbreve /Idotaccent /dotlessi /Scedilla /scedilla"
+
+_FONTS = {
+    (False, False): ('F1', 'Helvetica'),
+    (True, False): ('F2', 'Helvetica-Bold'),
+    (False, True): ('F3', 'Helvetica-Oblique'),
+    (True, True): ('F4', 'Helvetica-BoldOblique'),
+}
+
+
+def _pdf_string(text):
+    out = bytearray()
+    for ch in text:
+        if ch in _TR_CODES:
+            out.append(_TR_CODES[ch])
+            continue
+        try:
+            encoded = ch.encode('cp1252')
+        except UnicodeEncodeError:
+            encoded = b'?'
+        for b in encoded:
+            if b in (0x28, 0x29, 0x5C):  # ( ) \
+                out.append(0x5C)
+            out.append(b)
+    return b'(' + bytes(out) + b')'
+
+
+class PdfCanvas:
+    """Tek bir PDF sayfasının içerik akışı (sayfa birimleri punto'ya ölçeklenir)."""
+
+    def __init__(self, document, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.document = document
+        self.page_height = height * PDF_SCALE
+        self.ops = []
+
+    def _x(self, x):
+        return x * PDF_SCALE
+
+    def _y(self, y):
+        return self.page_height - y * PDF_SCALE
+
+    def _alpha(self, opacity):
+        return f"/{self.document.alpha_state(opacity)} gs" if opacity < 1 else None
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, lw=0, opacity=1.0, round_join=False):
+        ops = ['q']
+        alpha = self._alpha(opacity)
+        if alpha:
+            ops.append(alpha)
+        ops.append(f"{self._x(x):.2f} {self._y(y + h):.2f} {w * PDF_SCALE:.2f} {h * PDF_SCALE:.2f} re")
+        if fill:
+            ops.insert(-1, "%.3f %.3f %.3f rg" % _hex_to_rgb(fill))
+        if stroke and lw:
+            ops.insert(-1, "%.3f %.3f %.3f RG %.2f w" % (*_hex_to_rgb(stroke), lw * PDF_SCALE))
+            if round_join:
+                ops.insert(-1, "1 j")
+        ops.append('B' if fill and stroke and lw else ('f' if fill else 'S'))
+        ops.append('Q')
+        self.ops.append(' '.join(ops))
+
+    def line(self, x1, y1, x2, y2, color, lw, dash=None, opacity=1.0):
+        ops = ['q']
+        alpha = self._alpha(opacity)
+        if alpha:
+            ops.append(alpha)
+        ops.append("%.3f %.3f %.3f RG %.2f w" % (*_hex_to_rgb(color), lw * PDF_SCALE))
+        if dash:
+            ops.append(f"[{' '.join(f'{d * PDF_SCALE:.2f}' for d in dash)}] 0 d")
+        ops.append(f"{self._x(x1):.2f} {self._y(y1):.2f} m {self._x(x2):.2f} {self._y(y2):.2f} l S Q")
+        self.ops.append(' '.join(ops))
+
+    def text(self, x, y, text, size, color='#333333', bold=False, italic=False, anchor='middle', rotate=0):
+        font, _ = _FONTS[(bold, italic)]
+        lines = text.split('\n')
+        line_h = size * LINE_HEIGHT
+        first = -(len(lines) * line_h) / 2 + size * 0.8
+        r, g, b = _hex_to_rgb(color)
+        pt = size * PDF_SCALE
+        for i, line in enumerate(lines):
+            width = text_width(line, size, bold)
+            shift = {'middle': width / 2, 'end': width}.get(anchor, 0)
+            offset = first + i * line_h
+            if rotate == 90:
+                # Aşağıdan yukarı: metin ekseni sayfa y'si, satırlar x ekseninde ilerler
+                tx, ty = self._x(x + offset), self._y(y + shift)
+                matrix = f"0 1 -1 0 {tx:.2f} {ty:.2f}"
+            else:
+                tx, ty = self._x(x - shift), self._y(y + offset)
+                matrix = f"1 0 0 1 {tx:.2f} {ty:.2f}"
+            self.ops.append(f"BT /{font} {pt:.2f} Tf {r:.3f} {g:.3f} {b:.3f} rg {matrix} Tm "
+                            + _pdf_string(line).decode('latin-1') + " Tj ET")
+
+    def content(self):
+        return '\n'.join(self.ops).encode('latin-1')
+
+
+class PdfDocument:
+    """Helvetica standart fontlarıyla çok sayfalı, sıkıştırılmış vektör PDF."""
+
+    def __init__(self, width=PAGE_WIDTH, height=PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self.pages = []
+        self._alphas = {}
+
+    def alpha_state(self, opacity):
+        key = round(opacity, 3)
+        if key not in self._alphas:
+            self._alphas[key] = f"GS{len(self._alphas)}"
+        return self._alphas[key]
+
+    def new_page(self):
+        canvas = PdfCanvas(self, self.width, self.height)
+        self.pages.append(canvas)
+        return canvas
+
+    def write(self, output):
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        encoding = add(f"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [128 {_TR_GLYPHS}] >>".encode())
+        font_refs = ' '.join(
+            f"/{name} {add(f'<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding {encoding} 0 R >>'.encode())} 0 R"
+            for name, base in _FONTS.values())
+        gs = ' '.join(f"/{name} << /Type /ExtGState /ca {alpha} /CA {alpha} >>" for alpha, name in self._alphas.items())
+        resources = f"<< /Font << {font_refs} >> /ExtGState << {gs} >> >>"
+
+        pages_ref = len(objects) + 2 * len(self.pages) + 1
+        media = f"[0 0 {self.width * PDF_SCALE:.2f} {self.height * PDF_SCALE:.2f}]"
+        kids = []
+        for canvas in self.pages:
+            stream = zlib.compress(canvas.content())
+            content = add(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream")
+            kids.append(add(f"<< /Type /Page /Parent {pages_ref} 0 R /MediaBox {media} "
+                            f"/Resources {resources} /Contents {content} 0 R >>".encode()))
+        add(f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode())
+        catalog = add(f"<< /Type /Catalog /Pages {pages_ref} 0 R >>".encode())
+
+        buf = io.BytesIO()
+        buf.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(buf.tell())
+            buf.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref = buf.tell()
+        buf.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            buf.write(f"{offset:010d} 00000 n \n".encode())
+        buf.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+        if isinstance(output, (str, bytes)) or hasattr(output, '__fspath__'):
+            with open(output, 'wb') as f:
+                f.write(buf.getvalue())
+        else:
+            output.write(buf.getvalue())
+
+
+# --- Haftalık görünüm ---
+
+def draw_weekly_vector(canvas, model):
+    """Haftalık modeli SvgCanvas/PdfCanvas üzerine çizer."""
+    n_days = model['n_days']
+    ws, we = model['work_start'], model['work_end']
+    day_w = (PLOT_RIGHT - PLOT_LEFT) / n_days
+    min_h = (PLOT_BOTTOM - PLOT_TOP) / (we - ws)
+
+    def X(xd):
+        return PLOT_LEFT + xd * day_w
+
+    def Y(minute):
+        return PLOT_TOP + (minute - ws) * min_h
+
+    canvas.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, fill='#FFFFFF')
+
+    # Öğle Arası
+    lunch_start, lunch_end = model['lunch']
+    canvas.rect(X(0), Y(lunch_start), X(n_days) - X(0), Y(lunch_end) - Y(lunch_start), fill='#F2F2F2', opacity=0.5)
+
+    # Izgara
+    for current_time in model['half_hours']:
+        canvas.line(X(0), Y(current_time), X(n_days), Y(current_time), '#E0E0E0', 0.5 * PT, dash=(3.7 * PT, 1.6 * PT), opacity=0.5)
+    for i in range(n_days + 1):
+        canvas.line(X(i), PLOT_TOP, X(i), PLOT_BOTTOM, '#E0E0E0', 1 * PT)
+
+    canvas.text(X(n_days / 2), Y((lunch_start + lunch_end) / 2), "ÖĞLE ARASI", 10 * PT, color='#999999', italic=True)
+
+    # Başlık, Gün Başlıkları ve Saatler
+    canvas.text(X(n_days / 2), Y(ws - 80), model['header'], 20 * PT, bold=True)
+    for i, day_label in enumerate(model['day_labels']):
+        canvas.text(X(i + 0.5), Y(ws - 30), day_label, 14 * PT, bold=True)
+    for t, label in model['hour_ticks']:
+        canvas.text(PLOT_LEFT - 10, Y(t), label, 12 * PT, color='#000000', anchor='end')
+
+    # Toplantı Kutuları
+    for box in model['boxes']:
+        canvas.rect(X(box.x), Y(box.y), box.width * day_w, box.height * min_h,
+                    fill=box.bg, stroke=box.border, lw=box.linewidth * PT, round_join=True)
+    for box in model['boxes']:
+        canvas.text(X(box.x + box.width / 2), Y(box.y + box.height / 2), box.label, box.font_size * PT)
+
+    # Resmi Tatiller
+    for i, holiday_name in model['holidays']:
+        canvas.rect(X(i), PLOT_TOP, day_w, PLOT_BOTTOM - PLOT_TOP, fill='#FFEBEE', opacity=0.85)
+        canvas.text(X(i + 0.5), Y((ws + we) / 2), holiday_name, 16 * PT, color='#D32F2F', bold=True, rotate=90)
+
+    # Lejant (eksenin %12 altında, en fazla 5 sütun)
+    legend = model['legend']
+    if legend:
+        ncol = max(1, min(len(legend), 5))
+        font = 12 * PT
+        handle_w, handle_h, pad, spacing = 2 * font, 0.7 * font, 0.5 * font, 2 * font
+        top = PLOT_BOTTOM + 0.12 * (PLOT_BOTTOM - PLOT_TOP)
+        for row_start in range(0, len(legend), ncol):
+            row = legend[row_start:row_start + ncol]
+            widths = [handle_w + pad + text_width(label, font) for _, _, label in row]
+            x = (PAGE_WIDTH - sum(widths) - spacing * (len(row) - 1)) / 2
+            y = top + (row_start // ncol) * font * 1.6 + font * 0.6
+            for (bg, border, label), width in zip(row, widths):
+                canvas.rect(x, y - handle_h / 2, handle_w, handle_h, fill=bg, stroke=border, lw=1 * PT)
+                canvas.text(x + handle_w + pad, y, label, font, color='#000000', anchor='start')
+                x += width + spacing
+
+
+def render_weekly_svg(data, week_start_date, occurrences=None, model=None):
+    """Haftalık görünümü SVG metni olarak döndürür."""
+    if model is None:
+        model = build_weekly_model(data, week_start_date, occurrences=occurrences)
+    canvas = SvgCanvas()
+    draw_weekly_vector(canvas, model)
+    return canvas.to_string()
+
+
+def render_weekly_pdf(data, week_starts, output, week_occurrences=None):
+    """Her hafta bir sayfa olacak şekilde vektör PDF yazar (output: yol veya dosya nesnesi)."""
+    if week_occurrences is None:
+        week_occurrences = [None] * len(week_starts)
+    document = PdfDocument()
+    for week_start_date, occurrences in zip(week_starts, week_occurrences):
+        draw_weekly_vector(document.new_page(), build_weekly_model(data, week_start_date, occurrences=occurrences))
+    document.write(output)
+    return output
+
+
+# --- Yıl / çeyrek özeti ---
+
+OVERVIEW_DAYS = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
+OVERVIEW_LEFT = 60
+OVERVIEW_RIGHT = 1540
+OVERVIEW_TOP = 110
+OVERVIEW_BOTTOM = 880
+# Izgara 6 hafta satırı (her ay aynı yükseklikte)
+OVERVIEW_WEEKS = 6
+# Alt bilgide listelenen en yoğun kişi sayısı
+OVERVIEW_PEOPLE = 8
+
+
+def _draw_mini_month(canvas, month, x0, y0, width, height, max_count):
+    header_h = min(height * 0.14, 45)
+    days_h = min(height * 0.10, 32)
+    cell_w = width / 7
+    cell_h = (height - header_h - days_h) / OVERVIEW_WEEKS
+    unit = min(cell_w, cell_h)
+
+    canvas.text(x0, y0 + header_h / 2, month['name'], min(header_h * 0.6, 16 * PT), bold=True, anchor='start')
+    canvas.text(x0 + width, y0 + header_h / 2, f"{month['total']} toplantı", min(header_h * 0.45, 11 * PT),
+                color='#666666', anchor='end')
+    canvas.rect(x0, y0 + header_h, 5 * cell_w, days_h, fill='#4F81BD')
+    for i, label in enumerate(OVERVIEW_DAYS):
+        canvas.text(x0 + (i + 0.5) * cell_w, y0 + header_h + days_h / 2, label, min(days_h * 0.55, 11 * PT),
+                    color='#FFFFFF' if i < 5 else '#333333', bold=True)
+
+    top = y0 + header_h + days_h
+    for row, week in enumerate(month['weeks']):
+        for col, cell in enumerate(week):
+            if cell is None:
+                continue
+            x, y = x0 + col * cell_w, top + row * cell_h
+            level = heat_level(cell.count, max_count)
+            if cell.holiday:
+                fill = HOLIDAY_COLOR
+            elif cell.weekend and not cell.count:
+                fill = WEEKEND_COLOR
+            else:
+                fill = HEAT_COLORS[level]
+            canvas.rect(x, y, cell_w, cell_h, fill=fill, stroke='#E0E0E0', lw=0.5 * PT)
+            text_color = '#FFFFFF' if level >= 4 else '#333333'
+            canvas.text(x + unit * 0.12, y + unit * 0.22, str(cell.day), unit * 0.3,
+                        color='#D32F2F' if cell.holiday else text_color, anchor='start')
+            if cell.count:
+                canvas.text(x + cell_w / 2, y + cell_h * 0.6, str(cell.count), unit * 0.36, color=text_color, bold=True)
+
+
+def draw_overview_vector(canvas, model):
+    """Yıl (4x3) veya çeyrek (3x1) özet modelini SvgCanvas/PdfCanvas üzerine çizer."""
+    months = model['months']
+    cols, rows = (4, 3) if len(months) > 3 else (len(months), 1)
+    gap_x, gap_y = 40, 30
+    width = (OVERVIEW_RIGHT - OVERVIEW_LEFT - gap_x * (cols - 1)) / cols
+    height = (OVERVIEW_BOTTOM - OVERVIEW_TOP - gap_y * (rows - 1)) / rows
+    top = OVERVIEW_TOP
+    if rows == 1:
+        # Çeyrekte ay kutuları kare olmaktan çok uzamasın; sayfada dikey ortalanır
+        height = min(height, width * 1.1)
+        top += (OVERVIEW_BOTTOM - OVERVIEW_TOP - height) / 2
+
+    canvas.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, fill='#FFFFFF')
+    canvas.text(PAGE_WIDTH / 2, 55, f"{model['title']} ({model['total']} toplantı)", 20 * PT, bold=True)
+
+    for i, month in enumerate(months):
+        row, col = divmod(i, cols)
+        _draw_mini_month(canvas, month, OVERVIEW_LEFT + col * (width + gap_x), top + row * (height + gap_y),
+                         width, height, model['max_count'])
+
+    # Lejant: yoğunluk seviyeleri ve tatil
+    font = 11 * PT
+    swatch = 1.6 * font
+    items = heat_legend(model['max_count']) + [(HOLIDAY_COLOR, "Resmi Tatil")]
+    widths = [swatch + 0.5 * font + text_width(label, font) for _, label in items]
+    x = (PAGE_WIDTH - sum(widths) - font * 1.5 * (len(items) - 1)) / 2
+    y = OVERVIEW_BOTTOM + 40
+    for (color, label), item_w in zip(items, widths):
+        canvas.rect(x, y - swatch / 3, swatch, swatch * 2 / 3, fill=color, stroke='#999999', lw=0.5 * PT)
+        canvas.text(x + swatch + 0.5 * font, y, label, font, color='#000000', anchor='start')
+        x += item_w + font * 1.5
+
+    people = model['person_totals'][:OVERVIEW_PEOPLE]
+    if people:
+        canvas.text(PAGE_WIDTH / 2, y + 2.2 * font, "Kişi başına: " + " · ".join(f"{name} {n}" for name, n in people),
+                    font, color='#666666')
+
+
+def render_overview_svg(data, year, quarter=None, user_filter=None):
+    """Yıl veya çeyrek özetini SVG metni olarak döndürür."""
+    canvas = SvgCanvas()
+    draw_overview_vector(canvas, build_overview_model(data, year, quarter=quarter, user_filter=user_filter))
+    return canvas.to_string()
+
+
+def render_overview_pdf(data, periods, output, user_filter=None):
+    """
+    Her dönem bir sayfa olacak şekilde özet PDF'i yazar.
+    periods: [(yıl, çeyrek)] (çeyrek None ise tüm yıl)
+    """
+    document = PdfDocument()
+    for year, quarter in periods:
+        draw_overview_vector(document.new_page(),
+                             build_overview_model(data, year, quarter=quarter, user_filter=user_filter))
+    document.write(output)
+    return output
@@ -0,0 +1,195 @@
+"""
+Haftalık görünümün çizim kütüphanesinden bağımsız modeli.
+
+build_weekly_model() başlık, gün başlıkları, ızgara, öğle arası, tatiller,
+toplantı kutuları (yerleşim, renk, çakışma kenarlığı, etiket) ve lejantı veri
+koordinatlarında (x: gün, y: dakika) hesaplar. matplotlib (draw_weekly_view)
+ve vektör (vector_render) çizicileri aynı modeli çizer.
+"""
+import datetime
+import textwrap
+from collections import namedtuple
+
+import diagnostics
+from recurrence import TR_DAYS, TR_MONTHS, time_to_min, expand, get_holidays
+from conflicts import find_conflicts, conflicting_occurrence_ids
+from layout import layout_day
+
+# x/width gün biriminde, y/height dakika biriminde
+MeetingBox = namedtuple('MeetingBox', ['x', 'y', 'width', 'height', 'bg', 'border', 'linewidth',
+                                       'label', 'font_size', 'occurrence'])
+
+# Sabit "Tüm Ekip" kadrosu (bu üçlü için All Team rengi kullanılır)
+ALL_TEAM = {"Özden", "Burak", "Doğukan"}
+
+
+def get_mixed_color(attendees, colors):
+    """Katılımcıların renklerinin ortalamasını alarak dinamik renk üretir."""
+    if not attendees:
+        return colors.get("Mixed", {"bg": "#E0E0E0", "border": "#666666"})
+
+    bg_r, bg_g, bg_b = 0, 0, 0
+    border_r, border_g, border_b = 0, 0, 0
+    count = 0
+
+    found_any = False
+
+    for person in attendees:
+        if person in colors:
+            found_any = True
+            c = colors[person]
+            # BG hex to int
+            bg = c.get('bg', '#CCCCCC').lstrip('#')
+            if len(bg) == 6:
+                bg_r += int(bg[0:2], 16)
+                bg_g += int(bg[2:4], 16)
+                bg_b += int(bg[4:6], 16)
+
+            # Border hex to int
+            border = c.get('border', '#666666').lstrip('#')
+            if len(border) == 6:
+                border_r += int(border[0:2], 16)
+                border_g += int(border[2:4], 16)
+                border_b += int(border[4:6], 16)
+            count += 1
+
+    if found_any and count > 0:
+        new_bg = f"#{int(bg_r/count):02x}{int(bg_g/count):02x}{int(bg_b/count):02x}"
+        new_border = f"#{int(border_r/count):02x}{int(border_g/count):02x}{int(border_b/count):02x}"
+        return {"bg": new_bg, "border": new_border}
+
+    return colors.get("Mixed", {"bg": "#E0E0E0", "border": "#666666"})
+
+
+def meeting_colors(attendees, colors):
+    """Toplantı kutusunun (arka plan, kenarlık) renkleri."""
+    if set(attendees) == ALL_TEAM:
+        c = colors.get("All Team", {})
+        return c.get("bg", "#FFCCCC"), c.get("border", "#FF0000")
+    if len(attendees) == 1:
+        c = colors.get(attendees[0], {})
+    else:
+        # Dinamik Karışık Renk
+        c = get_mixed_color(attendees, colors)
+    return c.get("bg", "#E0E0E0"), c.get("border", "#666666")
+
+
+def _meeting_label(title, attendees, final_width):
+    # Metin kaydırma (width'e göre): base_col_width=0.9 -> ~30 karakter
+    char_limit = int(30 * (final_width / 0.9))
+    if char_limit < 8: char_limit = 8
+
+    label = textwrap.fill(title, width=char_limit)
+    if attendees:
+        label += f"\n({textwrap.fill(', '.join(attendees), width=char_limit)})"
+    return label
+
+
+@diagnostics.timed("weekly_model")
+def build_weekly_model(data, week_start_date, occurrences=None):
+    """
+    Haftalık görünüm modelini döndürür.
+    occurrences: O haftanın hazır tekrar listesi (verilmezse veriden genişletilir)
+    """
+    settings = data['settings']
+    days = settings['days']
+    colors = settings.get('colors', {})
+
+    work_start_min = time_to_min(settings['work_start'])
+    work_end_min = time_to_min(settings['work_end'])
+
+    # Başlık
+    week_end_date = week_start_date + datetime.timedelta(days=4)
+    header = f"{week_start_date.day} {TR_MONTHS[week_start_date.month]} - {week_end_date.day} {TR_MONTHS[week_end_date.month]} {week_start_date.year}"
+
+    # Gün Başlıkları
+    day_labels = []
+    for i, day in enumerate(days):
+        current_day = week_start_date + datetime.timedelta(days=i)
+        day_labels.append(f"{day}\n{current_day.day} {TR_MONTHS[current_day.month]}")
+
+    # Izgara (yarım saat) ve Y eksen etiketleri (saat başı)
+    half_hours = list(range(work_start_min, work_end_min + 1, 30))
+    hour_ticks = [(t, f"{t // 60:02d}:{t % 60:02d}") for t in range(work_start_min, work_end_min + 1, 60)]
+
+    # Öğle Arası
+    lunch = (time_to_min(settings['lunch_break']['start']), time_to_min(settings['lunch_break']['end']))
+
+    # Resmi Tatiller
+    holidays = get_holidays(data)
+    holiday_cols = []
+    for i in range(len(days)):
+        current_day_str = (week_start_date + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+        if current_day_str in holidays:
+            holiday_cols.append((i, holidays[current_day_str]))
+
+    # Toplantıları Filtrele ve Hazırla (Tatil günleri motor tarafından atlanır)
+    if occurrences is None:
+        occurrences = expand(data, week_start_date, week_start_date + datetime.timedelta(days=6))
+
+    meetings_by_day = {day: [] for day in days}
+    for occ in occurrences:
+        day_str = TR_DAYS[occ.date.weekday()]
+        if day_str in meetings_by_day:
+            meetings_by_day[day_str].append(occ)
+
+    # Kişi Bazlı Çakışma Kontrolü (Conflict Detection)
+    week_occurrences = [occ for day_str in days for occ in meetings_by_day[day_str]]
+    conflicts = find_conflicts(data, week_start_date, week_start_date + datetime.timedelta(days=6),
+                               occurrences=week_occurrences)
+    conflicting_ids = conflicting_occurrence_ids(conflicts)
+
+    # Toplantı Kutuları
+    boxes = []
+    for day_idx, day_str in enumerate(days):
+        day_meetings = sorted(meetings_by_day[day_str], key=lambda x: x.start_min)
+        if not day_meetings: continue
+
+        # Yerleşim: Gruplama, Sütun Atama ve Genişleme (layout.py)
+        placements = layout_day([(m.start_min, m.end_min) for m in day_meetings])
+
+        for occ, placement in zip(day_meetings, placements):
+            base_col_width = 0.9 / placement.total_cols
+            attendees = occ.meeting.get('attendees', [])
+            bg_color, border_color = meeting_colors(attendees, colors)
+
+            linewidth = 2
+            # Çakışma Vurgusu
+            if id(occ) in conflicting_ids:
+                border_color = "#FF0000"
+                linewidth = 5
+
+            # Genişlik hesaplama (span ile)
+            final_width = (base_col_width * placement.span) - 0.02
+            x_pos = day_idx + 0.05 + (placement.column * base_col_width)
+
+            # Yazı boyutu: Tam genişlikte büyük, dar alanda küçük
+            if placement.span == placement.total_cols:
+                font_size = 14
+            elif final_width > 0.4:
+                font_size = 12
+            else:
+                font_size = 10
+
+            boxes.append(MeetingBox(x_pos, occ.start_min, final_width, occ.end_min - occ.start_min,
+                                    bg_color, border_color, linewidth,
+                                    _meeting_label(occ.meeting['title'], attendees, final_width),
+                                    font_size, occ))
+
+    # Lejant
+    legend = [(val['bg'], val['border'], val['label']) for key, val in colors.items() if key != "Mixed"]
+
+    return {
+        "n_days": len(days),
+        "header": header,
+        "day_labels": day_labels,
+        "work_start": work_start_min,
+        "work_end": work_end_min,
+        "half_hours": half_hours,
+        "hour_ticks": hour_ticks,
+        "lunch": lunch,
+        "holidays": holiday_cols,
+        "boxes": boxes,
+        "legend": legend,
+        "conflicts": conflicts,
+    }